@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+
+from IR import Opcode
+
+# Instructions that end a basic block
+JUMPS = (Opcode.JUMP, Opcode.BRANCH_FALSE, Opcode.ON_EXCEPTION, Opcode.RETURN)
+
+# Instructions closing the code of a method or class
+ENDS = (Opcode.END_FUNC, Opcode.END_CLASS)
+
+class BasicBlock(object):
+    """
+    A run of instructions that is only entered at its first instruction and
+    only left after its last one. 'preds' and 'succs' are the indexes of the
+    blocks control can come from and go to.
+    """
+    __slots__ = ('index', 'instrs', 'preds', 'succs')
+
+    def __init__(self, index, instrs):
+        self.index = index
+        self.instrs = instrs
+        self.preds = []
+        self.succs = []
+
+    def __repr__(self):
+        return "BasicBlock({})".format(self.index)
+
+
+class Loop(object):
+    """
+    A natural loop: the 'header' block, which dominates the whole loop, the
+    'latches' jumping back to the header, and the innermost loop containing
+    this one, if any, as 'parent'. 'own' lists the blocks for which this is
+    the innermost loop (header included), and 'children' the loops directly
+    inside this one.
+
+    'blocks', the set of the indexes of all the blocks in the loop, is only
+    built when asked for, as nested loops would otherwise take space
+    quadratic in their depth.
+    """
+    __slots__ = ('header', 'latches', 'parent', 'own', 'children', '_blocks')
+
+    def __init__(self, header, latches):
+        self.header = header
+        self.latches = latches
+        self.parent = None
+        self.own = [header]
+        self.children = []
+        self._blocks = None
+
+    @property
+    def blocks(self):
+        if self._blocks is None:
+            blocks = set()
+            stack = [self]
+            while stack:
+                loop = stack.pop()
+                blocks.update(loop.own)
+                stack.extend(loop.children)
+            self._blocks = blocks
+        return self._blocks
+
+    def contains(self, loop):
+        """
+        Whether the Loop 'loop' (or None, out of any loop) is this loop or
+        one inside it
+        """
+        while loop is not None:
+            if loop is self:
+                return True
+            loop = loop.parent
+        return False
+
+    def __repr__(self):
+        return "Loop(header={}, blocks={})".format(self.header, sorted(self.blocks))
+
+
+class CFG(object):
+    """
+    Control-flow graph of the instructions of one method (or of the field
+    initializers of one class).
+
+    Block 0 is the entry, and the last block the exit, which only holds the
+    closing EndFunc or EndClass, if any: the end of the code and every
+    'ret := ...' lead there. Inside a try block every instruction may raise,
+    so each one gets a block of its own with an edge to the catch block.
+
+    Dominators and loops are computed on first use and kept until the graph
+    changes (see remove_unreachable).
+    """
+
+    def __init__(self, name, instrs):
+        self.name = name
+        self.blocks = []
+        self.build(instrs)
+        self._idom = None
+        self._loops = None
+
+    @property
+    def entry(self):
+        return self.blocks[0]
+
+    @property
+    def exit(self):
+        return self.blocks[-1]
+
+    def build(self, instrs):
+        closing = []
+        if instrs and instrs[-1].opcode in ENDS:
+            instrs, closing = instrs[:-1], instrs[-1:]
+
+        # Catch label of the innermost try block around each instruction
+        handlers = [None] * len(instrs)
+        tries = []
+        for i, instr in enumerate(instrs):
+            if instr.opcode is Opcode.BEGIN_TRY:
+                tries.append(i)
+            elif instr.opcode is Opcode.ON_EXCEPTION:
+                # Inner try blocks end first and keep their own handler
+                for j in range(tries.pop() + 1, i):
+                    if handlers[j] is None:
+                        handlers[j] = instr.label
+
+        # Split before labels and try block instructions, and after jumps
+        # and try block instructions
+        starts = []
+        split = True
+        for i, instr in enumerate(instrs):
+            if split or instr.opcode is Opcode.LABEL or handlers[i] is not None:
+                starts.append(i)
+            split = instr.opcode in JUMPS or handlers[i] is not None
+        starts.append(len(instrs))
+
+        blocks = self.blocks
+        labels = {}
+        for k in range(len(starts) - 1):
+            block = BasicBlock(k, instrs[starts[k]:starts[k + 1]])
+            first = block.instrs[0]
+            if first.opcode is Opcode.LABEL:
+                labels[first.label] = k
+            blocks.append(block)
+        exit_index = len(blocks)
+        blocks.append(BasicBlock(exit_index, closing))
+
+        for k in range(exit_index):
+            block = blocks[k]
+            last = block.instrs[-1]
+            opcode = last.opcode
+            if opcode is Opcode.JUMP:
+                self.add_edge(k, labels[last.label])
+            elif opcode is Opcode.RETURN:
+                self.add_edge(k, exit_index)
+            else:
+                if opcode is Opcode.BRANCH_FALSE or opcode is Opcode.ON_EXCEPTION:
+                    self.add_edge(k, labels[last.label])
+                self.add_edge(k, k + 1)
+            handler = handlers[starts[k]]
+            if handler is not None:
+                self.add_edge(k, labels[handler])
+
+    def add_edge(self, source, target):
+        if target not in self.blocks[source].succs:
+            self.blocks[source].succs.append(target)
+            self.blocks[target].preds.append(source)
+
+    def instructions(self):
+        """
+        Return the instructions of all the blocks, in order
+        """
+        return [instr for block in self.blocks for instr in block.instrs]
+
+    def reverse_postorder(self):
+        """
+        Return the indexes of the blocks reachable from the entry, in
+        reverse postorder
+        """
+        blocks = self.blocks
+        seen = [False] * len(blocks)
+        seen[0] = True
+        order = []
+        stack = [(0, iter(blocks[0].succs))]
+        while stack:
+            index, succs = stack[-1]
+            for succ in succs:
+                if not seen[succ]:
+                    seen[succ] = True
+                    stack.append((succ, iter(blocks[succ].succs)))
+                    break
+            else:
+                stack.pop()
+                order.append(index)
+        order.reverse()
+        return order
+
+    def remove_unreachable(self):
+        """
+        Drop the blocks that cannot be reached from the entry, such as code
+        after a return, and number the remaining ones again. The exit block
+        is always kept. Returns the number of blocks removed.
+        """
+        reachable = set(self.reverse_postorder())
+        exit_index = len(self.blocks) - 1
+        reachable.add(exit_index)
+        if len(reachable) == len(self.blocks):
+            return 0
+        kept = [block for block in self.blocks if block.index in reachable]
+        renumber = {block.index: k for k, block in enumerate(kept)}
+        for k, block in enumerate(kept):
+            block.index = k
+            block.preds = [renumber[p] for p in block.preds if p in renumber]
+            block.succs = [renumber[s] for s in block.succs]
+        removed = len(self.blocks) - len(kept)
+        self.blocks = kept
+        self._idom = None
+        self._loops = None
+        return removed
+
+    ################################
+    ## Dominators
+    ################################
+
+    def immediate_dominators(self):
+        """
+        Return the list of the immediate dominator of each block: None for
+        unreachable blocks, and the entry for the entry itself
+
+        Uses the iterative algorithm of Cooper, Harvey and Kennedy over the
+        reverse postorder, which converges in a couple of passes on the
+        graphs structured code produces.
+        """
+        if self._idom is not None:
+            return self._idom
+        blocks = self.blocks
+        order = self.reverse_postorder()
+        position = [None] * len(blocks)
+        for i, index in enumerate(order):
+            position[index] = i
+        idom = [None] * len(blocks)
+        idom[0] = 0
+        changed = True
+        while changed:
+            changed = False
+            for index in order[1:]:
+                new_idom = None
+                for pred in blocks[index].preds:
+                    if idom[pred] is None:
+                        continue
+                    if new_idom is None:
+                        new_idom = pred
+                        continue
+                    # Walk both up the dominator tree to their common ancestor
+                    a, b = pred, new_idom
+                    while a != b:
+                        while position[a] > position[b]:
+                            a = idom[a]
+                        while position[b] > position[a]:
+                            b = idom[b]
+                    new_idom = a
+                if idom[index] != new_idom:
+                    idom[index] = new_idom
+                    changed = True
+
+        # Preorder and postorder numbers in the dominator tree, so that
+        # 'dominates' takes constant time
+        children = [[] for _ in blocks]
+        for index in order[1:]:
+            children[idom[index]].append(index)
+        self._pre = pre = [None] * len(blocks)
+        self._post = post = [None] * len(blocks)
+        counter = 0
+        stack = [(0, False)]
+        while stack:
+            index, done = stack.pop()
+            if done:
+                post[index] = counter
+            else:
+                pre[index] = counter
+                stack.append((index, True))
+                stack.extend((child, False) for child in children[index])
+            counter += 1
+        self._idom = idom
+        return idom
+
+    def dominates(self, a, b):
+        """
+        Whether every path from the entry to block 'b' goes through block
+        'a'
+        """
+        self.immediate_dominators()
+        pre = self._pre
+        if pre[a] is None or pre[b] is None:
+            return False
+        return pre[a] <= pre[b] and self._post[b] <= self._post[a]
+
+    def dominators(self, index):
+        """
+        Return the indexes of the blocks dominating block 'index', from the
+        block itself up to the entry
+        """
+        idom = self.immediate_dominators()
+        if idom[index] is None:
+            return []
+        result = [index]
+        while index != 0:
+            index = idom[index]
+            result.append(index)
+        return result
+
+    ################################
+    ## Loops
+    ################################
+
+    def loops(self):
+        """
+        Return the natural loops, innermost first. Back edges to the same
+        header make up a single loop.
+
+        Headers are taken from the deepest in the dominator tree up, and the
+        body of each loop is found walking back from its latches. A block
+        already in an inner loop stands for that whole loop (through a
+        union-find of the loops found so far), so that each block is only
+        walked once per loop directly containing it.
+        """
+        if self._loops is not None:
+            return self._loops
+        blocks = self.blocks
+        latches = {}
+        for block in blocks:
+            for succ in block.succs:
+                if self.dominates(succ, block.index):
+                    latches.setdefault(succ, []).append(block.index)
+
+        # Header of the outermost loop found so far containing each block,
+        # and the loop each header starts
+        leader = list(range(len(blocks)))
+        started = {}
+        innermost = [None] * len(blocks)
+
+        def find(index):
+            root = index
+            while leader[root] != root:
+                root = leader[root]
+            while leader[index] != root:
+                leader[index], index = root, leader[index]
+            return root
+
+        loops = []
+        pre = self._pre
+        for header in sorted(latches, key=lambda index: pre[index], reverse=True):
+            loop = started[header] = Loop(header, latches[header])
+            innermost[header] = loop
+            seen = {header}
+            stack = [find(tail) for tail in latches[header]]
+            while stack:
+                index = stack.pop()
+                if index in seen:
+                    continue
+                seen.add(index)
+                inner = started.get(index)
+                if inner is not None and inner.parent is None and innermost[index] is not loop:
+                    inner.parent = loop
+                    loop.children.append(inner)
+                else:
+                    innermost[index] = loop
+                    loop.own.append(index)
+                leader[index] = header
+                for pred in blocks[index].preds:
+                    pred = find(pred)
+                    if pred not in seen:
+                        stack.append(pred)
+            loops.append(loop)
+        self._innermost = innermost
+        self._loops = loops
+        return loops
+
+    def loop_of(self, index):
+        """
+        Return the innermost loop containing block 'index', or None
+        """
+        self.loops()
+        return self._innermost[index]
+
+    def __str__(self):
+        lines = []
+        for block in self.blocks:
+            lines.append("B{} (preds {}, succs {})".format(
+                block.index,
+                ", ".join("B%d" % p for p in block.preds) or "-",
+                ", ".join("B%d" % s for s in block.succs) or "-"))
+            for instr in block.instrs:
+                lines.append("    " + str(instr))
+        return "\n".join(lines)
+
+
+def build_cfgs(instrs):
+    """
+    Split the IRGen output 'instrs' into the code of each method and of the
+    field initializers of each class, and return their CFGs, in order. A
+    method CFG is named 'Class.method', a class one after the class.
+    """
+    cfgs = []
+    class_name = None
+    class_code = []
+    method = None
+    for i, instr in enumerate(instrs):
+        opcode = instr.opcode
+        if method is not None:
+            method.append(instr)
+            if opcode is Opcode.END_FUNC:
+                cfgs.append(CFG("{}.{}".format(class_name, method_name), method))
+                method = None
+        elif opcode is Opcode.LABEL and instr.a is not None and i + 1 < len(instrs) and \
+                instrs[i + 1].opcode is Opcode.BEGIN_FUNC:
+            method_name = instr.a
+            method = [instr]
+        elif opcode is Opcode.LABEL and instr.a is not None:
+            class_name = instr.a
+            class_code = [instr]
+        elif opcode is Opcode.END_CLASS:
+            class_code.append(instr)
+            cfgs.append(CFG(class_name, class_code))
+        else:
+            class_code.append(instr)
+    return cfgs
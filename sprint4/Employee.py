@@ -10,70 +10,39 @@ class Employee:
     #  this is an example comment
     def foo(a: int, b: int) -> int:
         #  this is an example comment
-        a = 4
-        return a
+        return 4
     test2 = foo(3, 4)
     def foo2(a1: int, b1: int) -> int:
-        c1 = 4
         #  this is an example comment
-        return c1
+        return 4
     def foo4(a2: int, b2: int) -> int:
-        c2 = 4
-        return c2
+        return 4
     test4 = foo4(3, 4)
     a5 = 5
-    b5 = 4
-    c5 = 1
     #  this is an example comment
-    if (a5 == b5):
-        #  this is an example comment
-        c5 = a5 + b5
-        while (a5 < 10):
-            a5 = a5 + 1
-        while (a5 < 10):
-            a5 = b5 + 1
-    else:
-        c5 = a5 * b5
-        while (a5 < 10):
-            a5 = a5 + 1
-        while (a5 < 10):
-            a5 = b5 + 1
-    a6 = 5
-    b6 = 4
+    a5 = max(a5, 10)
+    while (a5 < 10):
+        a5 = 5
     #  this is an example comment
     i = 0
     for i in range(0, 5, 1):
+        a5 = max(a5, 10)
         while (a5 < 10):
-            a5 = a5 + 1
-        while (a5 < 10):
-            a5 = b5 + 1
+            a5 = 5
+    i = max(i, 5)
     t2 = 2
-    t4 = 6
-    t3 = 8
     #  this is an example comment
-    t2 = 2
-    t8 = 3
-    while (t2 < t4):
-        t3 = t3 + 1
-        t2 = t2 + 1
-        t8 = t8 + 1
-    t5 = 8
+    t2 = max(t2, 6)
     try:
         t5 = 4
         t5 = 5
-        while (t5 < 10):
-            t5 = t5 + 1
     except f:
         t5 = 9
         t5 = 5
-        while (t5 < 10):
-            t5 = t5 + 1
-            t2 = t3 + 2
     finally:
         t5 = 20
         t5 = 5
-        while (t5 < 10):
-            t5 = t5 + 1
+        t5 = max(t5, 10)
     #  this is an example comment
     def __init__(self, empName: String) -> None:
         self.name = empName
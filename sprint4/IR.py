@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+from enum import IntEnum
+
+class Opcode(IntEnum):
+    """
+    Operations of the three-address code built by IRGen. The comment of
+    each opcode gives its text form, in terms of the fields of Instr.
+    """
+    LABEL = 0          # _L<label>:   (or _L<name>: for methods and classes)
+    COPY = 1           # dst := a
+    BINARY = 2         # dst := a op b
+    UNARY = 3          # dst := op a
+    SET_FIELD = 4      # this.dst := a
+    NEW = 5            # dst := new a
+    JUMP = 6           # goto _L<label>
+    BRANCH_FALSE = 7   # if !(a) goto _L<label>
+    PUSH_PARAM = 8     # PushParam a
+    CALL = 9           # FuncCall a            (a method of the current class)
+    METHOD_CALL = 10   # FuncCall a.b          (method 'b' of the object 'a', or the
+                       #                        method held in 'a' if 'b' is None)
+    POP_PARAMS = 11    # PopParams a
+    GET_RETURN = 12    # dst := ret
+    RETURN = 13        # ret := a
+    GET_PARAM = 14     # GetParam dst
+    PRINT = 15         # Print a
+    BEGIN_CLASS = 16   # BeginClass
+    END_CLASS = 17     # EndClass
+    BEGIN_FUNC = 18    # BeginFunc
+    END_FUNC = 19      # EndFunc
+    BEGIN_LOOP = 20    # Begin <a> Loop
+    BEGIN_TRY = 21     # BeginTryCatch
+    ON_EXCEPTION = 22  # if an exception happened in try, goto _L<label>
+    CATCH = 23         # Exception := dst
+    END_TRY = 24       # FinishTryCatch
+    GET_ATTR = 25      # dst := a.b
+
+
+class Const(object):
+    """
+    A constant operand: 'value' as written in the source ('"text"', 'true',
+    'null', 3, 1.5) and the name of its type
+    """
+    __slots__ = ('value', 'type')
+
+    def __init__(self, value, type):
+        self.value = value
+        self.type = type
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        return "Const({!r})".format(self.value)
+
+
+class Instr(object):
+    """
+    A single three-address instruction.
+
+    'dst' is the variable or temporary written, 'a' and 'b' the operands
+    read: a variable or temporary is its name (a str), a constant is a
+    Const. 'op' is the operator of BINARY and UNARY, and 'label' the integer
+    label a LABEL marks or a jump goes to. LABELs of methods and classes
+    keep the name of the method or class in 'a'. Unused fields are None.
+
+    'origin' is the AST node the instruction was generated for: the
+    statement, or the method or class for the instructions that open and
+    close them.
+    """
+    __slots__ = ('opcode', 'dst', 'a', 'b', 'op', 'label', 'origin')
+
+    def __init__(self, opcode, dst=None, a=None, b=None, op=None, label=None, origin=None):
+        self.opcode = opcode
+        self.dst = dst
+        self.a = a
+        self.b = b
+        self.op = op
+        self.label = label
+        self.origin = origin
+
+    def __str__(self):
+        return FORMATS[self.opcode](self)
+
+    def __repr__(self):
+        return "Instr({}: {})".format(self.opcode.name, self)
+
+
+def label_name(instr):
+    """
+    Text of the label marked by the LABEL 'instr'
+    """
+    if instr.a is not None:
+        return "_L{}".format(instr.a)
+    return "_L{}".format(instr.label)
+
+
+# Text form of each opcode
+FORMATS = {
+    Opcode.LABEL: lambda i: "{}:".format(label_name(i)),
+    Opcode.COPY: lambda i: "{} := {}".format(i.dst, i.a),
+    Opcode.BINARY: lambda i: "{} := {} {} {}".format(i.dst, i.a, i.op, i.b),
+    Opcode.UNARY: lambda i: "{} := {}{}".format(i.dst, i.op, i.a),
+    Opcode.SET_FIELD: lambda i: "this.{} := {}".format(i.dst, i.a),
+    Opcode.NEW: lambda i: "{} := new {}".format(i.dst, i.a),
+    Opcode.JUMP: lambda i: "goto _L{}".format(i.label),
+    Opcode.BRANCH_FALSE: lambda i: "if !({}) goto _L{}".format(i.a, i.label),
+    Opcode.PUSH_PARAM: lambda i: "PushParam {}".format(i.a),
+    Opcode.CALL: lambda i: "FuncCall {}".format(i.a),
+    Opcode.METHOD_CALL: lambda i: "FuncCall {}".format(i.a if i.b is None else "{}.{}".format(i.a, i.b)),
+    Opcode.POP_PARAMS: lambda i: "PopParams {}".format(i.a),
+    Opcode.GET_RETURN: lambda i: "{} := ret".format(i.dst),
+    Opcode.RETURN: lambda i: "ret := {}".format(i.a),
+    Opcode.GET_PARAM: lambda i: "GetParam {}".format(i.dst),
+    Opcode.PRINT: lambda i: "Print {}".format(i.a),
+    Opcode.BEGIN_CLASS: lambda i: "BeginClass",
+    Opcode.END_CLASS: lambda i: "EndClass",
+    Opcode.BEGIN_FUNC: lambda i: "BeginFunc",
+    Opcode.END_FUNC: lambda i: "EndFunc",
+    Opcode.BEGIN_LOOP: lambda i: "Begin {} Loop".format(i.a),
+    Opcode.BEGIN_TRY: lambda i: "BeginTryCatch",
+    Opcode.ON_EXCEPTION: lambda i: "if an exception happened in try, goto _L{}".format(i.label),
+    Opcode.CATCH: lambda i: "Exception := {}".format(i.dst),
+    Opcode.END_TRY: lambda i: "FinishTryCatch",
+    Opcode.GET_ATTR: lambda i: "{} := {}.{}".format(i.dst, i.a, i.b),
+}
+
+
+def format_ir(instrs):
+    """
+    Return the text form of the instructions 'instrs', one per line, with
+    everything but labels indented
+    """
+    lines = []
+    for instr in instrs:
+        if instr.opcode is Opcode.LABEL:
+            lines.append(str(instr))
+        else:
+            lines.append("    " + str(instr))
+    return "\n".join(lines)
+
+
+# Names of the temporaries, followed by their number
+TEMPORARY_PREFIX = '_t'
+
+
+def is_temporary(name):
+    """
+    Whether the variable name 'name' is an IRGen temporary
+    """
+    return name.startswith(TEMPORARY_PREFIX) and name[len(TEMPORARY_PREFIX):].isdigit()
+
+
+# Opcodes whose 'dst' is a variable or temporary they write
+DEFINING = frozenset((Opcode.COPY, Opcode.BINARY, Opcode.UNARY, Opcode.NEW, Opcode.GET_RETURN,
+                      Opcode.GET_PARAM, Opcode.CATCH, Opcode.GET_ATTR))
+
+# Opcodes reading the operand 'a', and those reading 'b' as well
+READING_A = frozenset((Opcode.COPY, Opcode.BINARY, Opcode.UNARY, Opcode.SET_FIELD,
+                       Opcode.BRANCH_FALSE, Opcode.PUSH_PARAM, Opcode.METHOD_CALL,
+                       Opcode.RETURN, Opcode.PRINT, Opcode.GET_ATTR))
+READING_B = frozenset((Opcode.BINARY,))
+
+# Calls, which may read and write fields
+CALLS = frozenset((Opcode.CALL, Opcode.METHOD_CALL))
+
+
+def definition(instr):
+    """
+    Return the name of the variable or temporary 'instr' writes, or None
+    """
+    if instr.opcode in DEFINING:
+        return instr.dst
+    return None
+
+
+def uses(instr):
+    """
+    Return the names of the variables and temporaries 'instr' reads
+    """
+    opcode = instr.opcode
+    if opcode not in READING_A:
+        return ()
+    a = instr.a
+    if opcode in READING_B:
+        b = instr.b
+        if a.__class__ is str:
+            if b.__class__ is str:
+                return (a, b)
+            return (a,)
+        if b.__class__ is str:
+            return (b,)
+        return ()
+    if a.__class__ is str:
+        return (a,)
+    return ()
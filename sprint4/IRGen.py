@@ -1,55 +1,62 @@
 #!/usr/bin/env python3
 
-class IRGen(object):
+from visitor import Visitor
+from IR import Opcode, Const, Instr, TEMPORARY_PREFIX, format_ir
+from typeSystem import INT, FLOAT, BOOLEAN
+
+# Initial value of a variable declared without an initializer
+DEFAULT_CONSTANTS = {INT: Const(0, 'int'), FLOAT: Const(0.0, 'float'), BOOLEAN: Const('false', 'boolean')}
+NULL_CONSTANT = Const('null', 'null')
+
+class IRGen(Visitor):
     """
     Uses the same visitor pattern as TypeChecker. It is modified to
-    generate 3AC (Three Address Code) in a simple string.
-
-    Bare in mind that this is for demonstration purpose only! For your
-    actual project, you would want to generate some sort of objects rather
-    than plain string. However, this should help you think about what you
-    might want/need to do to convert your AST to your IR of choice.
-
-    As mentioned in the tutorial, you are free to choose which IR you
-    want to generate. I suggest you look into different optimization,
-    as well as think about how your IR of choice will translate to your
-    target language, since you would need to argue why your IR of choice
-    makes sense for Sprint2.
+    generate 3AC (Three Address Code) as a list of IR.Instr objects, which
+    later passes can analyze and transform, and 'print_ir' prints in text
+    form.
+
+    Expression handlers return the operand holding their value: the name of
+    a variable or temporary, or a Const. Statement handlers return nothing.
+    Temporaries are numbered from 1 again after every statement.
     """
 
     def __init__(self):
         """
-        IR_lst: list of IR code
+        IR_lst: list of IR instructions
         register_count: integer to keep track of which register to use
         label_count: similar to register_count, but with labels
+        statement: the node the instructions being added are generated for
         """
         self.IR_lst = []
         self.register_count = 0
         self.label_count = 0
+        self.statement = None
+
+    prefix = 'gen_'
 
     def generate(self, node):
         """
         Similar to 'typecheck' method from TypeChecker object
         """
-        method = 'gen_' + node.__class__.__name__
-        return getattr(self, method)(node)
+        return self.visit(node)
 
     ################################
     ## Helper functions
     ################################
 
-    def add_code(self, code):
+    def add_code(self, opcode, dst=None, a=None, b=None, op=None, label=None):
         """
-        Add 'code' to the IR_lst with correct spacing
+        Add an instruction to the IR_lst
         """
-        self.IR_lst.append("    " + code)
+        self.IR_lst.append(Instr(opcode, dst, a, b, op, label, self.statement))
 
     def inc_register(self):
         """
-        Increase the register count and return its value for use
+        Increase the register count and return the name of the temporary
+        for use
         """
         self.register_count += 1
-        return self.register_count
+        return '%s%d' % (TEMPORARY_PREFIX, self.register_count)
 
     def reset_register(self):
         """
@@ -64,254 +71,344 @@ class IRGen(object):
         self.label_count += 1
         return self.label_count
 
-    def mark_label(self, label):
+    def mark_label(self, label, name=None):
         """
-        Add label mark to IR_lst
+        Add label mark to IR_lst, 'name' being the name of the method or
+        class the label starts
         """
-        self.IR_lst.append("_L{}:".format(label))
+        self.add_code(Opcode.LABEL, a=name, label=label)
 
     def print_ir(self):
         """
         Loop through the generated IR code and print them out to stdout
         """
-        for ir in self.IR_lst:
-            print(ir)
+        print(format_ir(self.IR_lst))
 
-    def gen_AssignStmt(self, node):
-        expr = self.generate(node.expr)
-        self.add_code("{} := {}".format(node.name, expr))
-        self.register_count = 0
+    def gen_call(self, func_param):
+        """
+        Push the arguments of a call and return how many there are
+        """
+        args = func_param.func_params or []
+        for param in args:
+            expr = (yield param,)
+            self.add_code(Opcode.PUSH_PARAM, a=expr)
+        return len(args)
+
+    def gen_object_call(self, node, *args):
+        """
+        Call the method 'node.obj_func' of the object 'node.name' (ArrayList
+        and HashMap methods) with the expressions 'args'
+        """
+        for arg in args:
+            expr = (yield arg,)
+            self.add_code(Opcode.PUSH_PARAM, a=expr)
+        self.add_code(Opcode.METHOD_CALL, a=node.name, b=node.obj_func)
+        self.add_code(Opcode.POP_PARAMS, a=len(args))
+
+    ################################
+    ## Expressions
+    ################################
 
     def gen_BinOp(self, node):
         # Left operand
-        left = self.generate(node.left)
+        left = (yield node.left,)
         # Right operand
-        right = self.generate(node.right)
+        right = (yield node.right,)
 
         reg = self.inc_register()
-        self.add_code("{} := {} {} {}".format('_t%d' % reg, left, node.op, right))
+        self.add_code(Opcode.BINARY, reg, left, right, node.op)
+        return reg
 
-        return '_t%d' % reg
-    
-    def gen_CompareOp(self, node):
-        # Left operand
-        left = self.generate(node.left)
-        # Right operand
-        right = self.generate(node.right)
+    gen_CompareOp = gen_BinOp
+    gen_LogicOp = gen_BinOp
 
+    def gen_UnaryOp(self, node):
+        expr = (yield node.expr,)
         reg = self.inc_register()
-        self.add_code("{} := {} {} {}".format('_t%d' % reg, left, node.op, right))
+        self.add_code(Opcode.UNARY, reg, expr, op=node.op)
+        return reg
 
-        return '_t%d' % reg
+    def gen_AttributeRef(self, node):
+        reg = self.inc_register()
+        self.add_code(Opcode.GET_ATTR, reg, node.obj_name, node.attr)
+        return reg
 
     def gen_Constant(self, node):
-        return node.value
+        if node.type.name == 'id':
+            return node.value
+        return Const(node.value, node.type.name)
 
-    def gen_DeclStmt(self, node):
-        expr = self.generate(node.expr)
-        self.add_code("{} := {}".format(node.name, expr))
-        self.register_count = 0
+    def gen_ObjInstance(self, node):
+        reg = self.inc_register()
+        self.add_code(Opcode.NEW, reg, node.obj)
+        return reg
 
-    def gen_DeclFuncCall(self, node):
+    def gen_FuncCallParam(self, node):
+        expr = (yield node.expr,)
+        return expr
+
+    ################################
+    ## Statements
+    ################################
+
+    def gen_AssignStmt(self, node):
+        expr = (yield node.expr,)
+        if node.this:
+            self.add_code(Opcode.SET_FIELD, node.name, expr)
+        else:
+            self.add_code(Opcode.COPY, node.name, expr)
 
+    def gen_DeclVarStmt(self, node):
+        if node.expr is not None:
+            expr = (yield node.expr,)
+        else:
+            expr = DEFAULT_CONSTANTS.get(node.resolved_type, NULL_CONSTANT)
+        self.add_code(Opcode.COPY, node.name, expr)
+
+    def gen_DeclArrayList(self, node):
+        self.add_code(Opcode.NEW, node.name, 'ArrayList')
+
+    def gen_DeclHashMap(self, node):
+        self.add_code(Opcode.NEW, node.name, 'HashMap')
+
+    def gen_DeclFuncCall(self, node):
         # Push all of the arguments with "PushParam" function
-        args = node.children()[2][1]
-        for param in args.func_params:
-            expr = self.generate(param)
-            self.add_code("PushParam {}".format(expr) )
+        count = yield from self.gen_call(node.func_param)
+
+        if node.access_type is None:
+            # 'Class name = new Class(...)'
+            self.add_code(Opcode.NEW, node.name, node.func_name)
+            self.add_code(Opcode.POP_PARAMS, a=count)
+            return node.name
 
         # Once all of the parameter has been pushed, actually call the function
-        self.add_code("FuncCall %s" % node.func_name)
+        self.add_code(Opcode.CALL, a=node.func_name)
 
         # After we're done with the function, remove the spaces reserved
         # for the arguments
-        self.add_code("PopParams %d" % len(args.func_params))
+        self.add_code(Opcode.POP_PARAMS, a=count)
 
         reg = self.inc_register()
-        self.add_code("{} := ret".format('_t%d' % reg))
+        self.add_code(Opcode.GET_RETURN, reg)
+        self.add_code(Opcode.COPY, node.name, reg)
+        return reg
 
-        self.add_code("{} := {}".format(node.name, '_t%d' % reg))
-        return '_t%d' % reg
+    def gen_DeclObjCall(self, node):
+        count = yield from self.gen_call(node.func_param)
+        self.add_code(Opcode.METHOD_CALL, a=node.obj_name, b=node.obj_func)
+        self.add_code(Opcode.POP_PARAMS, a=count)
+
+    def gen_DeclObjAddCall(self, node):
+        yield from self.gen_object_call(node, node.expr)
+
+    def gen_DeclObjRemoveCall(self, node):
+        yield from self.gen_object_call(node, node.expr)
+
+    def gen_DeclObjPutCall(self, node):
+        yield from self.gen_object_call(node, node.expr1, node.expr2)
+
+    def gen_DeclObjClearCall(self, node):
+        yield from self.gen_object_call(node)
+
+    def gen_DeclPrintStmt(self, node):
+        expr = (yield node.expr,)
+        self.add_code(Opcode.PRINT, a=expr)
+
+    def gen_DeclRetStmt(self, node):
+        if node.expr:
+            expr = (yield node.expr,)
+            self.add_code(Opcode.RETURN, a=expr)
 
     def gen_DeclIfStmt(self, node):
-        cond = self.generate(node.if_cond)
+        cond = (yield node.if_cond,)
 
         fbranch_label = self.inc_label()
         tbranch_label = self.inc_label()
 
         if not node.elif_cond:
             # Skip to the false_body if the condition is not met
-            self.add_code("if !({}) goto {}".format(cond, '_L%d' % fbranch_label))
-            self.generate(node.if_body)
+            self.add_code(Opcode.BRANCH_FALSE, a=cond, label=fbranch_label)
+            yield node.if_body,
             # Make sure the statements from false_body is skipped
-            self.add_code("goto _L%d" % tbranch_label)
+            self.add_code(Opcode.JUMP, label=tbranch_label)
 
             self.mark_label(fbranch_label)
-            self.generate(node.else_body)
+            yield node.else_body,
             self.mark_label(tbranch_label)
         else:
             elifbranch_label = self.inc_label()
-            elifcond = self.generate(node.elif_cond)
             # not if go to elseif
-            self.add_code("if !({}) goto {}".format(cond, '_L%d' % elifbranch_label))
-            self.generate(node.if_body)
-             # Make sure the statements from false_body is skipped
-            self.add_code("goto _L%d" % tbranch_label)
+            self.add_code(Opcode.BRANCH_FALSE, a=cond, label=elifbranch_label)
+            yield node.if_body,
+            # Make sure the statements from false_body is skipped
+            self.add_code(Opcode.JUMP, label=tbranch_label)
 
-            # process elif situation            
+            # process elif situation
             self.mark_label(elifbranch_label)
-            self.add_code("elif !({}) goto {}".format(elifcond, '_L%d' % fbranch_label))
-            self.generate(node.elif_body)
-            self.add_code("goto _L%d" % tbranch_label)
+            elifcond = (yield node.elif_cond,)
+            self.add_code(Opcode.BRANCH_FALSE, a=elifcond, label=fbranch_label)
+            yield node.elif_body,
+            self.add_code(Opcode.JUMP, label=tbranch_label)
 
             #else situation
             self.mark_label(fbranch_label)
-            self.generate(node.else_body)
+            yield node.else_body,
             #end if statement
             self.mark_label(tbranch_label)
 
     def gen_DeclWhileStmt(self, node):
-        self.add_code("Begin While Loop")
-        cond = self.generate(node.cond)
+        self.add_code(Opcode.BEGIN_LOOP, a='While')
         fbranch_label = self.inc_label()
         tbranch_label = self.inc_label()
 
+        # The condition is evaluated again on every iteration
         self.mark_label(tbranch_label)
+        cond = (yield node.cond,)
         # Skip to the false_body if the condition is not met
-        self.add_code("if !({}) goto {}".format(cond, '_L%d' % fbranch_label))
-        self.generate(node.body)
+        self.add_code(Opcode.BRANCH_FALSE, a=cond, label=fbranch_label)
+        yield node.body,
         # Make sure the statements from false_body is skipped
-        self.add_code("goto _L%d" % tbranch_label)
+        self.add_code(Opcode.JUMP, label=tbranch_label)
+
+        self.mark_label(fbranch_label)
+
+    def gen_DeclForStmt(self, node):
+        self.add_code(Opcode.BEGIN_LOOP, a='For')
+        yield node.var_assign,
+        fbranch_label = self.inc_label()
+        tbranch_label = self.inc_label()
+
+        self.mark_label(tbranch_label)
+        cond = (yield node.cond,)
+        # Skip to the false_body if the condition is not met
+        self.add_code(Opcode.BRANCH_FALSE, a=cond, label=fbranch_label)
+        yield node.body,
+        yield node.cond_update,
+        # Make sure the statements from false_body is skipped
+        self.add_code(Opcode.JUMP, label=tbranch_label)
+
+        self.mark_label(fbranch_label)
+
+    def gen_DeclRangeStmt(self, node):
+        # The counted loop the range stands for: the bound is read again on
+        # every iteration, and the variable ends past the range
+        self.add_code(Opcode.BEGIN_LOOP, a='For')
+        start = (yield node.start,)
+        if start != node.var:
+            self.add_code(Opcode.COPY, node.var, start)
+        fbranch_label = self.inc_label()
+        tbranch_label = self.inc_label()
+
+        self.mark_label(tbranch_label)
+        stop = (yield node.stop,)
+        cond = self.inc_register()
+        self.add_code(Opcode.BINARY, cond, node.var, stop, '<' if node.step > 0 else '>')
+        self.add_code(Opcode.BRANCH_FALSE, a=cond, label=fbranch_label)
+        yield node.body,
+        self.add_code(Opcode.BINARY, node.var, node.var, Const(node.step, 'int'), '+')
+        self.add_code(Opcode.JUMP, label=tbranch_label)
 
         self.mark_label(fbranch_label)
 
     def gen_DeclTryStmt(self, node):
+        self.add_code(Opcode.BEGIN_TRY)
+        fbranch_label = self.inc_label()
+        tbranch_label = self.inc_label()
 
-        # Allocate room for function local variables
-        if not node.finally_stmt_list:
-            self.add_code("BeginTryCatch")
-            cond = self.generate(node.try_stmt_list)
-            fbranch_label = self.inc_label()
-            tbranch_label = self.inc_label()
+        yield node.try_stmt_list,
 
-            # Skip to the false_body if the condition is not met
-            self.add_code("if an execption happen in try, goto {}".format('_L%d' % fbranch_label))
-        
-            # Make sure the statements from false_body is skipped
-            self.add_code("goto _L%d" % tbranch_label)
+        # Skip to the catch block if an exception happened
+        self.add_code(Opcode.ON_EXCEPTION, label=fbranch_label)
+        # Make sure the statements from the catch block are skipped
+        self.add_code(Opcode.JUMP, label=tbranch_label)
 
-            self.mark_label(fbranch_label)
-            exception_id = self.generate(node.catch_id)
-            self.add_code("Exception := {} ".format(exception_id))
-            catchcond = self.generate(node.catch_stmt_list)
-            self.mark_label(tbranch_label)
-            self.add_code("No Finally Statements, FinishTryCatch")
-        else:
-            fin_lable =  self.inc_label()  # finally label, end place
-            self.add_code("BeginTryCatch")  
-            fbranch_label = self.inc_label()
-            tbranch_label = self.inc_label()
-            
-            cond = self.generate(node.try_stmt_list)
+        self.mark_label(fbranch_label)
+        self.add_code(Opcode.CATCH, node.catch_id.name)
+        yield node.catch_stmt_list,
 
-            # Skip to the false_body if the condition is not met
-            self.add_code("if an execption happened in try, goto {}".format('_L%d' % fbranch_label))
-            # Make sure the statements from false_body is skipped
-            self.add_code("goto _L%d" % fin_lable)
+        # The finally block runs either way
+        self.mark_label(tbranch_label)
+        yield node.finally_stmt_list,
+        self.add_code(Opcode.END_TRY)
 
-            self.mark_label(fbranch_label)
-            exception_id = self.generate(node.catch_id)
-            self.add_code("Exception := {} ".format(exception_id))
-            catchcond = self.generate(node.catch_stmt_list)
-            self.mark_label(fin_lable)
-            fincond = self.generate(node.finally_stmt_list)
-            self.add_code("FinishTryCatch")
+    def gen_StmtList(self, node):
+        if not node.stmt_lst:
+            return
+        outer = self.statement
+        for stmt in node.stmt_lst:
+            if isinstance(stmt, list):
+                for s in stmt:
+                    yield s,
+            else:
+                self.statement = stmt
+                yield stmt,
+            self.reset_register()
+        self.statement = outer
+
+    ################################
+    ## Declarations
+    ################################
+
+    def gen_Program(self, node):
+        if node.class_decl is not None:
+            for c in node.class_decl:
+                if isinstance(c, list):
+                    for s in c:
+                        yield s,
+                else:
+                    yield c,
+
+    def gen_DeclClassStmt(self, node):
+        self.statement = node
+        self.mark_label(self.inc_label(), node.name)
+        self.add_code(Opcode.BEGIN_CLASS)
+        if node.stmt_list:
+            for stm in node.stmt_list:
+                if isinstance(stm, list):
+                    for s in stm:
+                        yield s,
+                else:
+                    self.statement = stm
+                    yield stm,
+                self.reset_register()
+        self.statement = node
+        self.add_code(Opcode.END_CLASS)
 
     def gen_DeclMethodStmt(self, node):
         skip_decl = self.inc_label()
         # We want to skip the function code until it is called
-        self.add_code("goto _L%d" % skip_decl)
+        self.add_code(Opcode.JUMP, label=skip_decl)
 
         # Function label
-        self.mark_label(node.name)
+        outer = self.statement
+        self.statement = node
+        self.mark_label(self.inc_label(), node.name)
 
         # Allocate room for function local variables
-        self.add_code("BeginFunc")
+        self.add_code(Opcode.BEGIN_FUNC)
+
+        for params in node.params:
+            yield params,
 
         # Actually generate the main body
-        
-        self.generate(node.body)
-        self.generate(node.ret_stmt)
+        yield node.body,
+        self.statement = node.ret_stmt
+        yield node.ret_stmt,
+        self.statement = node
 
         # Do any cleanup before jumping back
-        self.add_code("EndFunc")
+        self.add_code(Opcode.END_FUNC)
 
+        self.statement = outer
         self.mark_label(skip_decl)
 
-    def gen_Program(self, node):
-        for (child_name, child) in node.children():
-            for c in child:
-                self.generate(c)
-
-    def gen_DeclRetStmt(self, node):
-        if node.expr:
-            expr = self.generate(node.expr)
-            self.add_code("ret := {}".format(expr))
-
-    def gen_StmtList(self, node):
-        for stmt in node.stmt_lst:
-            self.generate(stmt)
-        reg = self.inc_register()
-        return '_t%d' % reg
+    def gen_ParamList(self, node):
+        for param in node.params or []:
+            self.add_code(Opcode.GET_PARAM, param.name)
 
-    def gen_DeclClassStmt(self, node):
-        self.mark_label(node.name)
-        self.add_code("BeginClass")
-        if node.stmt_list:
-            for stm in node.stmt_list:
-                self.generate(stm)
-        self.add_code("EndClass")
-    
-    def gen_DeclVarStmt(self, node):
-        expr = self.generate(node.expr)
-        reg = self.inc_register()
-        self.add_code("{} := {}".format(node.name, expr))
-
-    def gen_FuncCallParamList(self, node):
-        result = 0
-        if node.func_params:
-            for param in node.func_params:
-                expr = self.generate(param)
-                result += expr
-        return result
-    
-    def gen_FuncCallParam(self, node):
-        if node.expr:
-            expr = self.generate(node.expr)
-            return expr
-    
-    def gen_DeclAccessType(self, node):
-        if node.name is None:
-            return ''
-        temp = self.generate(node.name)
-        return temp
-
-    def gen_DeclType(self, node):
-        return node.name
-
-    def gen_DeclForStmt(self, node):
-        self.add_code("Begin For Loop")
-        var_name = self.generate(node.var_assign)
-        cond = self.generate(node.cond)
-        fbranch_label = self.inc_label()
-        tbranch_label = self.inc_label()
-
-        self.mark_label(tbranch_label)
-        # Skip to the false_body if the condition is not met
-        self.add_code("if !({}) goto {}".format(cond, '_L%d' % fbranch_label))
-        self.generate(node.body)
-        update_rule = self.generate(node.cond_update)
-        # Make sure the statements from false_body is skipped
-        self.add_code("goto _L%d" % tbranch_label)
+    def gen_Comments(self, node):
+        return None
 
-        self.mark_label(fbranch_label)
\ No newline at end of file
+    def gen_NoneType(self, node):
+        # Missing else bodies, comments and the like
+        return None
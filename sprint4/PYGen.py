@@ -1,9 +1,63 @@
 #!/usr/bin/env python3
 
+import io
+import os
 from tracemalloc import start
+from visitor import Visitor
+import astJava2Python as ast
+from typeSystem import BOOLEAN, INT, default_value
+
+# Python spelling and binding strength of the miniJava operators, a higher
+# strength binding tighter
+COMPARISON = 4
+OPERATORS = {
+    '||': ('or', 1),
+    '&&': ('and', 2),
+    '==': ('==', COMPARISON),
+    '!=': ('!=', COMPARISON),
+    '<': ('<', COMPARISON),
+    '<=': ('<=', COMPARISON),
+    '>': ('>', COMPARISON),
+    '>=': ('>=', COMPARISON),
+    '+': ('+', 5),
+    '-': ('-', 5),
+    '*': ('*', 6),
+    '/': ('/', 6),
+}
+UNARY_OPERATORS = {
+    '!': ('not ', 3),
+    '-': ('-', 7),
+}
+OPERATOR_NODES = (ast.BinOp, ast.CompareOp, ast.LogicOp)
+
+# Header line of each kind of block body, which gets a 'pass' when the
+# body has no statement
+BODY_HEADERS = {
+    'if_body': 'if_cond',
+    'elif_body': 'elif_cond',
+    'else_body': 'else_cond',
+    'while_body': 'while_cond',
+    'range_body': 'range_stmt',
+    'try_body': 'try_cond',
+    'catch_body': 'catch_cond',
+    'final_body': 'final_cond',
+    'method_body': 'method_stmt',
+}
+
+class ListInit(object):
+    """
+    Line creating the ArrayList 'name', written out once the elements added
+    to the list are known (see gen_DeclObjAddCall)
+    """
+    __slots__ = ('name', 'indent')
+
+    def __init__(self, name, indent):
+        self.name = name
+        self.indent = indent
 
+class PYGen(Visitor):
+    prefix = 'gen_'
 
-class PYGen(object):
     def __init__(self, file_name):
         """
         PY_lst: list of classes, which are in the format of dictionary 
@@ -16,14 +70,12 @@ class PYGen(object):
         self.arraylists = {}
 
         self.class_count = 0
-        self.callable = {}
     
     def generate(self, node, last_indent, print_not=True):
         """
         Similar to 'typecheck' method from TypeChecker object
         """
-        method = 'gen_' + node.__class__.__name__
-        return getattr(self, method)(node, last_indent, print_not)
+        return self.visit(node, last_indent, print_not)
     
     def inc_class_count(self):
         self.class_count += 1
@@ -39,171 +91,161 @@ class PYGen(object):
     
     def print_py(self):
         """
-        Loop through the generated Python code and print them out to stdout
+        Print the generated Python code to stdout
         """
-        file_n = self.file_name[:-5]
-        if file_n in self.has_main:
-            if self.has_main[file_n]:
-                self.add_code('if __name__=="__main__":')
-                self.add_code(self.generate_code('{}.main({})'.format(file_n, []), 1))
-        for c_dict in self.PY_lst:
-            if isinstance(c_dict, dict):
-                self.print_dict(c_dict)
-            else:
-                print(c_dict)
+        print(self.render_py(), end='')
     
     def check_empty(self, body_dict):
-        for key, val in body_dict.items():
-            if isinstance(val, str):
-                if "=" in val:
-                    v = val.split("=")[0].strip()
-                    if v in self.callable:
-                        if self.callable[v] > 0:
-                            return False
-                else:
-                    return False
-            else:
-                if isinstance(val, dict):
-                    for k, v in val.items():
-                        if k[:7] != 'comment':
-                            return False
-        return True
-
-    def print_dict(self, pending_dict):
-        for key, val in pending_dict.items():
+        """
+        Whether the generated block 'body_dict' holds nothing but comments
+        """
+        for val in body_dict.values():
             if isinstance(val, dict):
-                if key == 'if_body' or key == 'elif_body' or key == 'else_body':
-                    bdy_empty = self.check_empty(val)
-                    if bdy_empty:
-                        for k, v2 in val.items():
-                            if isinstance(v2, str):
-                                wsnum = v2.count(" ") // 4
-                                break
-                        print(" "*(wsnum*4) + 'pass')
-                    else:
-                        self.print_dict(val)
-                else:
-                    self.print_dict(val)
-            elif val is None:
-                pass
-            else:
-                if key == 'for_stmt':
-                    bdy_empty = self.check_empty(pending_dict['for_body'])
-                    if not bdy_empty:
-                        print(val)
-                else:
-                    v = val.split("=")[0].strip()
-                    if v in self.callable:
-                        if self.callable[v] > 0:
-                            if v in self.arraylists:
-                                wsnum = val.count(" ") // 4
-                                print(" "*(wsnum*4) + "{} = {}".format(v, self.arraylists[v]))
-                            else:
-                                print(val)
-                    else:
-                        print(val)
+                for k in val:
+                    if k[:7] != 'comment':
+                        return False
+            elif val is not None:
+                return False
+        return True
 
     def read_dict(self, pending_dict, f):
-        for key, val in pending_dict.items():
-            if isinstance(val, dict):
-                if key == 'if_body' or key == 'elif_body' or key == 'else_body':
-                    bdy_empty = self.check_empty(val)
-                    if bdy_empty:
-                        for k, v2 in val.items():
-                            if isinstance(v2, str):
-                                wsnum = v2.count(" ") // 4
-                                break
+        # Nested blocks are nested dictionaries; they are walked with a stack
+        # of (dictionary, items iterator) pairs instead of recursion
+        stack = [(pending_dict, iter(pending_dict.items()))]
+        while stack:
+            pending_dict, items = stack[-1]
+            for key, val in items:
+                if isinstance(val, dict):
+                    if key in BODY_HEADERS and self.check_empty(val) and \
+                            (key != 'method_body' or pending_dict['return_stmt'] is None):
+                        # Indent one level past the header line
+                        header = pending_dict[BODY_HEADERS[key]]
+                        wsnum = (len(header) - len(header.lstrip(" "))) // 4 + 1
                         f.write(" "*(wsnum*4) + 'pass' + '\n')
-                    else:
-                        self.read_dict(val,f)
+                        continue
+                    stack.append((val, iter(val.items())))
+                    break
+                elif val is None:
+                    pass
+                elif val.__class__ is ListInit:
+                    lbl = "{} = {}".format(val.name, self.arraylists[val.name])
+                    f.write(self.generate_code(lbl, val.indent) + '\n')
                 else:
-                    self.read_dict(val,f)
-            elif val is None:
-                pass
+                    f.write(val+'\n')
             else:
-                if key == 'for_stmt' or key == 'var_init':
-                    bdy_empty = self.check_empty(pending_dict['for_body'])
-                    if not bdy_empty:
-                        f.write(val+'\n')
-                else:
-                    v = val.split("=")[0].strip()
-                    if v in self.callable:
-                        if self.callable[v] > 0:
-                            if v in self.arraylists:
-                                wsnum = val.count(" ") // 4
-                                f.write(" "*(wsnum*4) + "{} = {}".format(v, self.arraylists[v]) + '\n')
-                            else:
-                                f.write(val+'\n')
-                    else:
-                        f.write(val+'\n')
+                stack.pop()
         
-    def generate_py(self):
+    def render_py(self):
         """
-        Generate Python file
+        Return the generated Python file as a string
         """
-        file_n = self.file_name[:-5]
+        file_n = os.path.basename(self.file_name[:-5])
         if file_n in self.has_main:
             if self.has_main[file_n]:
                 self.add_code('if __name__=="__main__":')
                 self.add_code(self.generate_code('{}.main({})'.format(file_n, []), 1))
-        f = open("{}.py".format(file_n), 'w')
+        f = io.StringIO()
         for c_dict in self.PY_lst:
             if isinstance(c_dict, dict):
                 self.read_dict(c_dict, f)
             else:
                 f.write(c_dict+"\n")
+        return f.getvalue()
+
+    def generate_py(self):
+        """
+        Generate Python file
+        """
+        code = self.render_py()
+        f = open("{}.py".format(self.file_name[:-5]), 'w')
+        f.write(code)
         f.close()
     
     def gen_AssignStmt(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        expr = self.generate(node.expr, indent)
-        if expr == 'true' or expr == 'false':
-            expr = expr.capitalize()
+        expr = (yield node.expr, indent)
         if not node.this:
             lbl = "{} = {}".format(node.name, expr)
         else:
             lbl = "self.{} = {}".format(node.name, expr)
-        if node.name in self.callable:
-            self.callable[node.name] += 1
         return self.generate_code(lbl, indent)
         
     
     def gen_BinOp(self, node, last_indent, print_not=True):
-        indent = last_indent + 1
-        # Left operand
-        left = self.generate(node.left, indent)
-        # Right operand
-        right = self.generate(node.right, indent)
+        """
+        Emit an operator expression (BinOp, CompareOp, LogicOp or UnaryOp).
 
-        return "{} {} {}".format(left, node.op, right)
-    
-    def gen_CompareOp(self, node, last_indent, print_not=True):
+        The whole operator tree below 'node' is walked with an explicit stack
+        and its pieces are joined once, so that long chains such as
+        'a + b + c + ...' cost linear time and no recursion. Parentheses are
+        only added where Python would otherwise group the operands
+        differently.
+        """
         indent = last_indent + 1
-        # Left operand
-        left = self.generate(node.left, indent)
-        # Right operand
-        right = self.generate(node.right, indent)
+        parts = []
+        # Items are text, or (node, strength of the enclosing operator,
+        # whether the node is a right operand)
+        stack = [(node, 0, False)]
+        while stack:
+            item = stack.pop()
+            if item.__class__ is str:
+                parts.append(item)
+                continue
+            expr, outer, right = item
+            cls = expr.__class__
+            if cls is ast.UnaryOp:
+                op, strength = UNARY_OPERATORS[expr.op]
+                paren = strength < outer
+                if paren:
+                    stack.append(')')
+                stack.append((expr.expr, strength, True))
+                stack.append(op)
+            elif cls in OPERATOR_NODES:
+                op, strength = OPERATORS[expr.op]
+                if op == '/' and expr.resolved_type is INT:
+                    # Java int division truncates toward zero
+                    stack.append(')')
+                    stack.append((expr.right, strength, True))
+                    stack.append(' / ')
+                    stack.append((expr.left, strength, False))
+                    stack.append('int(')
+                    continue
+                # Comparisons never chain like they would in Python
+                paren = strength < outer or (strength == outer and (right or strength == COMPARISON))
+                if paren:
+                    stack.append(')')
+                stack.append((expr.right, strength, True))
+                stack.append(' {} '.format(op))
+                stack.append((expr.left, strength, False))
+            else:
+                parts.append("{}".format((yield expr, indent)))
+                continue
+            if paren:
+                stack.append('(')
+        return ''.join(parts)
 
-        return "{} {} {}".format(left, node.op, right)
+    gen_CompareOp = gen_BinOp
+    gen_LogicOp = gen_BinOp
+    gen_UnaryOp = gen_BinOp
 
     def gen_Constant(self, node, last_indent, print_not=True):
-        if node.value in self.callable:
-            self.callable[node.value] += 1
+        if node.type.name != 'id' and node.resolved_type is BOOLEAN:
+            # A true or false literal, not a boolean variable
+            return node.value == 'true'
         return node.value
     
+    def gen_AttributeRef(self, node, last_indent, print_not=True):
+        return "{}.{}".format(node.obj_name, node.attr)
+
     def gen_DeclStmt(self, node, last_indent, print_not=True):
-        expr = self.generate(node.expr, 0)
+        expr = (yield node.expr, 0)
         return self.generate_code("{} = {}".format(node.name, expr), 0)
 
     def gen_DeclArrayList(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        if node.name not in self.callable:
-            self.callable[node.name] = 0
-        else:
-            self.callable[node.name] += 1
         if node.name not in self.arraylists:
             self.arraylists[node.name] = []
-        return self.generate_code("{} = []".format(node.name), indent)
+        return ListInit(node.name, indent)
 
     
     def gen_DeclFuncCall(self, node, last_indent, print_not=True):
@@ -218,14 +260,9 @@ class PYGen(object):
 
         # Push all of the arguments with "PushParam" function
         indent = last_indent + 1
-        if len(node.children()) == 3:
-            args = node.children()[2][1]
-        else:
-            args = node.children()[1][1]
-        # if node.name in self.callable:
-        #     self.callable[node.name] += 1
+        args = node.func_param
         lbl = ""
-        if len(node.children()) == 3 and node.access_type.name and node.access_type.name.upper() == "PRIVATE":
+        if node.access_type is not None and node.access_type.name and node.access_type.name.upper() == "PRIVATE":
             lbl = lbl + "_{}".format(node.name)
         else:
             lbl = lbl + "{}".format(node.name)
@@ -234,7 +271,7 @@ class PYGen(object):
         if args.func_params is not None:
             while i < len(args.func_params):
                 param = args.func_params[i]
-                expr = self.generate(param, indent)
+                expr = (yield param, indent)
                 lbl += "{}".format(expr)
                 if i + 1 >= len(args.func_params):
                     pass
@@ -245,50 +282,46 @@ class PYGen(object):
         return self.generate_code(lbl, indent)
     
     def gen_DeclIfStmt(self, node, last_indent, print_not=True):
-        cond = self.generate(node.if_cond, last_indent)
+        cond = (yield node.if_cond, last_indent)
         indent = last_indent + 1
         if_dict = {}
         if not node.elif_cond:
             # Skip to the false_body if the condition is not met
             if_dict['if_cond'] = self.generate_code("if ({}):".format(cond), indent)
-            if_dict['if_body'] = self.generate(node.if_body, indent)
+            if_dict['if_body'] = (yield node.if_body, indent)
             # Make sure the statements from false_body is skipped
 
             if_dict['else_cond'] = self.generate_code("else:", indent)
-            if_dict['else_body'] = self.generate(node.else_body, indent)
+            if_dict['else_body'] = (yield node.else_body, indent)
         else:
-            elifcond = self.generate(node.elif_cond, 0)
+            elifcond = (yield node.elif_cond, 0)
             # not if go to elseif
             if_dict['if_cond'] = self.generate_code("if ({}):".format(cond), indent)
-            if_dict['if_body'] = self.generate(node.if_body, indent)
+            if_dict['if_body'] = (yield node.if_body, indent)
              # Make sure the statements from false_body is skipped
 
             # process elif situation            
             if_dict['elif_cond'] = self.generate_code("elif ({}):".format(elifcond), indent)
-            if_dict['elif_body'] = self.generate(node.elif_body, indent)
+            if_dict['elif_body'] = (yield node.elif_body, indent)
 
             #else situation
             if_dict['else_cond'] = self.generate_code("else:", indent)
-            if_dict['else_body'] = self.generate(node.else_body, indent)
+            if_dict['else_body'] = (yield node.else_body, indent)
             #end if statement
         return if_dict
 
     def gen_DeclWhileStmt(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        cond = self.generate(node.cond, 0)
+        cond = (yield node.cond, 0)
         while_dict = {}
         # Skip to the false_body if the condition is not met
         while_dict['while_cond'] = self.generate_code("while ({}):".format(cond), indent)
-        while_dict['while_body'] = self.generate(node.body, indent)
+        while_dict['while_body'] = (yield node.body, indent)
         # Make sure the statements from false_body is skipped
         return while_dict
     
     def gen_DeclHashMap(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        if node.name not in self.callable:
-            self.callable[node.name] = 0
-        else:
-            self.callable[node.name] += 1
         return self.generate_code(f"{node.name} = {{}}", indent)
 
     def gen_DeclTryStmt(self, node, last_indent, print_not=True):
@@ -297,19 +330,19 @@ class PYGen(object):
         try_dict = {}
         if not node.finally_stmt_list:
             try_dict['try_cond'] = self.generate_code("try:", indent)
-            try_dict['try_body'] = self.generate(node.try_stmt_list, indent)
-            exception_id = self.generate(node.catch_id, indent)
+            try_dict['try_body'] = (yield node.try_stmt_list, indent)
+            exception_id = (yield node.catch_id, indent)
             try_dict['catch_cond'] = self.generate_code("except {}:".format(exception_id), indent)
-            try_dict['catch_body'] = self.generate(node.catch_stmt_list, indent)
+            try_dict['catch_body'] = (yield node.catch_stmt_list, indent)
         else:
             try_dict['try_cond'] = self.generate_code("try:", indent)
-            try_dict['try_body'] = self.generate(node.try_stmt_list, indent)
+            try_dict['try_body'] = (yield node.try_stmt_list, indent)
 
-            exception_id = self.generate(node.catch_id, indent)
+            exception_id = (yield node.catch_id, indent)
             try_dict['catch_cond'] = self.generate_code("except {}:".format(exception_id), indent)
-            try_dict['catch_body'] = self.generate(node.catch_stmt_list, indent)
+            try_dict['catch_body'] = (yield node.catch_stmt_list, indent)
             try_dict['final_cond'] = self.generate_code("finally:", indent)
-            try_dict['final_body'] = self.generate(node.finally_stmt_list, indent)
+            try_dict['final_body'] = (yield node.finally_stmt_list, indent)
         return try_dict
 
     def gen_DeclMethodStmt(self, node, last_indent, print_not=True):
@@ -341,10 +374,6 @@ class PYGen(object):
         method_dict = {}
         # Function label
         lbl = "def"
-        # if node.name not in self.callable:
-        #     self.callable[node.name] = 0
-        # else:
-        #     self.callable[node.name] += 1
         if not node.main:
             if node.name == self.class_name[-1]:
                 self.construct = True
@@ -393,113 +422,42 @@ class PYGen(object):
 
         # Actually generate the main body
 
-        method_dict['method_body'] = self.generate(node.body, indent)
-        method_dict['return_stmt'] = self.generate(node.ret_stmt, indent)
+        method_dict['method_body'] = (yield node.body, indent)
+        method_dict['return_stmt'] = (yield node.ret_stmt, indent)
 
         # Do any cleanup before jumping back
         return method_dict
 
     def gen_Program(self, node, last_indent, print_not=True):
-        for (child_name, child) in node.children():
-            for c in child:
+        if node.class_decl is not None:
+            for c in node.class_decl:
                 if c is not None:
                     if isinstance(c, list):
                         for c2 in c:
-                            self.add_code(self.generate(c2, last_indent))
+                            self.add_code((yield c2, last_indent))
                     else:
                         self.inc_class_count()
-                        self.add_code(self.generate(c, last_indent))
+                        self.add_code((yield c, last_indent))
 
     def gen_DeclRetStmt(self, node, last_indent, print_not=True):
         indent = last_indent + 1
         if node.expr:
-            expr = self.generate(node.expr, indent)
-            if expr in self.callable:
-                self.callable[expr] += 1
+            expr = (yield node.expr, indent)
             return self.generate_code("return {}".format(expr), indent)
 
     def gen_StmtList(self, node, last_indent, print_not=True):
         stmt_dict = {}
         stmt_body_count = 0
-        while_appeared = {}
-        for stmt in node.stmt_lst:
+        for stmt in node.stmt_lst or ():
             if stmt is not None:
                 if not isinstance(stmt, list):
                     stmt_body_count += 1
-                    res = self.generate(stmt, last_indent)
-                    if isinstance(res, dict):
-                        lst = list(while_appeared.keys())
-                        lst_ind = []
-                        count = 0
-                        for l in lst:
-                            if 'while_cond' in res:
-                                if res['while_cond'] in l:
-                                    count += 1
-                                    lst_ind.append(l)
-                        if 'while_cond' in res:
-                            if count == 0:
-                                stmt_dict['body{}'.format(stmt_body_count)] = res
-                                while_appeared[res['while_cond']+"{}".format(count)] = [res, 'body{}'.format(stmt_body_count)]
-                            else:
-                                for i in lst_ind:
-                                    old_while_body = while_appeared[i][0]['while_body']
-                                    new_while_body = res['while_body']
-                                    if self.check_step(new_while_body, old_while_body, res['while_cond']):
-                                        appeared = while_appeared[i]
-                                        old_res = appeared[0]
-                                        old_pos = appeared[1]
-                                        new_res = old_res
-                                        stmts = res['while_body']
-                                        for ind in list(old_res['while_body'].keys()):
-                                                if 'body' in ind:
-                                                    stmt_count = int(ind[4:])
-                                        for key, var in stmts.items():
-                                            if var not in new_res['while_body'].values():
-                                                stmt_count += 1
-                                                new_res['while_body']['body{}'.format(stmt_count)] = var
-                                        del stmt_dict[old_pos]
-                                        stmt_dict['body{}'.format(stmt_body_count)] = new_res
-                                        while_appeared[i][0] = new_res
-                                        break
-                                    else:
-                                        stmt_dict['body{}'.format(stmt_body_count)] = res
-                                        while_appeared[res['while_cond']+"{}".format(count)] = [res, 'body{}'.format(stmt_body_count)]
-                        else:
-                            stmt_dict['body{}'.format(stmt_body_count)] = res
-                    else:           
-                        stmt_dict['body{}'.format(stmt_body_count)] = res
+                    stmt_dict['body{}'.format(stmt_body_count)] = (yield stmt, last_indent)
                 else:
                     for s in stmt:
                         stmt_body_count += 1
-                        stmt_dict['body{}'.format(stmt_body_count)] = self.generate(s, last_indent+1)
+                        stmt_dict['body{}'.format(stmt_body_count)] = (yield s, last_indent+1)
         return stmt_dict
-    
-    def check_step(self, new_body, old_body, condition):
-        start_ind = condition.index('(')
-        end_ind = condition.index(')')
-        cond = condition[start_ind+1: end_ind]
-        symbol_lst = ['==', '<', '<=', '>', '>=', "!="]
-        symbol_ind = -1
-        for symbol in symbol_lst:
-            if symbol in cond:
-                symbol_ind = cond.index(symbol)
-        v = cond[:symbol_ind].replace(" ", "")
-        new_body_values = list(new_body.values())
-        old_body_values = list(old_body.values())
-        old_step = ""
-        for ov in old_body_values:
-            if v in ov:
-                old_step = ov.replace(" ","")
-                break
-        for nv in new_body_values:
-            if isinstance(nv, str):
-                rmvd = nv.replace(" ","")
-                if rmvd == old_step:
-                    return True
-            else:
-                if self.check_step(nv, old_body, condition):
-                    return True
-        return False
 
     def generate_comments(self, comments, indent):
         comments_dict = {}
@@ -516,19 +474,13 @@ class PYGen(object):
     
     def gen_DeclObjPutCall(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        args = node.children()[0]
-        if node.name in self.callable:
-            self.callable[node.name] += 1
-        expr1 = self.generate(node.expr1, indent)
-        expr2 = self.generate(node.expr2, indent)
+        expr1 = (yield node.expr1, indent)
+        expr2 = (yield node.expr2, indent)
         lbl = "{}[{}] = {}".format(node.name, expr1,expr2)
         return self.generate_code(lbl, indent)
 
     def gen_DeclObjClearCall(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        #args = node.children()[0]
-        if node.name in self.callable:
-            self.callable[node.name] += 1
         lbl = "{}.clear()".format(node.name)
         return self.generate_code(lbl, indent)
     def gen_DeclClassStmt(self, node, last_indent, print_not=True):
@@ -542,7 +494,6 @@ class PYGen(object):
         """
         body_count = 0
         lbl = "class"
-        while_appeared = {}
         if node.access_type.name and node.access_type.name.upper() == "PRIVATE":
             lbl = lbl + " _{}".format(node.name)
         else:
@@ -559,53 +510,15 @@ class PYGen(object):
                     if isinstance(stm, list): #comments
                         for s in stm:
                             body_count += 1
-                            class_dict['body{}'.format(body_count)] = self.generate(s, last_indent+1)
+                            class_dict['body{}'.format(body_count)] = (yield s, last_indent+1)
                     else:
                         body_count += 1
                         # print(type(stm))
                         # class_dict['body{}'.format(body_count)] = self.generate(stm, last_indent)
-                        res = self.generate(stm, last_indent)
-                        if isinstance(res, dict):
-                            lst = list(while_appeared.keys())
-                            lst_ind = []
-                            count = 0
-                            for l in lst:
-                                if 'while_cond' in res:
-                                    if res['while_cond'] in l:
-                                        count += 1
-                                        lst_ind.append(l)
-                            if 'while_cond' in res:
-                                if count == 0:
-                                    class_dict['body{}'.format(body_count)] = res
-                                    while_appeared[res['while_cond']+"{}".format(count)] = [res, 'body{}'.format(body_count)]
-                                else:
-                                    for i in lst_ind:
-                                        old_while_body = while_appeared[i][0]['while_body']
-                                        new_while_body = res['while_body']
-                                        if self.check_step(new_while_body, old_while_body, res['while_cond']):
-                                            appeared = while_appeared[i]
-                                            old_res = appeared[0]
-                                            old_pos = appeared[1]
-                                            new_res = old_res
-                                            stmts = res['while_body']
-                                            for ind in list(old_res['while_body'].keys()):
-                                                if 'body' in ind:
-                                                    stmt_count = int(ind[4:])
-                                            for key, var in stmts.items():
-                                                if var not in new_res['while_body'].values():
-                                                    stmt_count += 1
-                                                    new_res['while_body']['body{}'.format(stmt_count)] = var
-                                            del class_dict[old_pos]
-                                            class_dict['body{}'.format(body_count)] = new_res
-                                            while_appeared[i] = [new_res, 'body{}'.format(body_count)]
-                                            break
-                                        else:
-                                            class_dict['body{}'.format(body_count)] = res
-                                            while_appeared[res['while_cond']+"{}".format(count)] = [res, 'body{}'.format(body_count)]
-                            else:
-                                class_dict['body{}'.format(body_count)] = res
-                        else:           
-                            class_dict['body{}'.format(body_count)] = res
+                        class_dict['body{}'.format(body_count)] = (yield stm, last_indent)
+        body = {key: val for key, val in class_dict.items() if key != node.name}
+        if self.check_empty(body):
+            class_dict['pass'] = self.generate_code('pass', last_indent + 1)
         return class_dict
     
     def gen_DeclVarStmt(self, node, last_indent, print_not=True):
@@ -622,22 +535,10 @@ class PYGen(object):
             lbl += "_"
         lbl += "{}".format(node.name)
         if node.expr is not None:
-            expr = self.generate(node.expr, indent)
+            expr = (yield node.expr, indent)
         else:
-            if node.var_type.name == 'String':
-                expr = None
-            elif node.var_type.name == 'int':
-                expr = 0
-            elif node.var_type.name == 'float':
-                expr = 0.0
-            elif node.var_type.name == 'boolean':
-                expr = False
-        if node.name not in self.callable:
-            self.callable[node.name] = 0
-        if expr == 'true' or expr == 'false':
-            lbl += " = {}".format(expr.capitalize())
-        else:
-            lbl += " = {}".format(expr)
+            expr = default_value(node.resolved_type)
+        lbl += " = {}".format(expr)
         
         return self.generate_code(lbl, indent)
 
@@ -645,19 +546,19 @@ class PYGen(object):
         result = 0
         if node.func_params:
             for param in node.func_params:
-                expr = self.generate(param, 0)
+                expr = (yield param, 0)
                 result += expr
         return result
     
     def gen_FuncCallParam(self, node, last_indent, print_not=True):
         if node.expr:
-            expr = self.generate(node.expr, 0)
+            expr = (yield node.expr, 0)
             return expr
     
     def gen_DeclAccessType(self, node, last_indent, print_not=True):
         if node.name is None:
             return ''
-        temp = self.generate(node.name, 0)
+        temp = (yield node.name, 0)
         return temp
 
     def gen_DeclType(self, node, last_indent, print_not=True):
@@ -665,30 +566,32 @@ class PYGen(object):
 
     def gen_DeclForStmt(self, node, last_indent, print_not=True):
         """
-        self.var_assign = var_assign
-        self.cond = cond
-        self.body = body
-        self.coord = coord
-        self.cond_update = update
+        A for loop the RangeLoopConverter left alone runs as a while loop,
+        the update ending the body
         """
         indent = last_indent + 1
         for_dict = {}
-        var_name = self.generate(node.var_assign, last_indent)
-        var_name_splitted = var_name.split(" ")
-        for_dict['var_init'] = var_name
-        lbl = "for"
-        cond = self.generate(node.cond, indent)
-        cond_splitted = cond.split(" ")
-        update_rule = self.generate(node.cond_update, indent, False)
-        update_splitted = update_rule.split(" ")
-        if '<' in cond_splitted:
-            lbl += " {} in range({}, {}, {}):".format(cond_splitted[0], var_name_splitted[-1], cond_splitted[2], update_splitted[-1])
-        if '>' in cond_splitted:
-            lbl += " {} in range({}, {}, -{}):".format(cond_splitted[0], var_name_splitted[-1], cond_splitted[2], update_splitted[-1])
-
-        for_dict['for_stmt'] = self.generate_code(lbl, indent)
-        for_dict['for_body'] = self.generate(node.body, indent)
+        for_dict['var_init'] = (yield node.var_assign, last_indent)
+        cond = (yield node.cond, indent)
+        for_dict['while_cond'] = self.generate_code("while ({}):".format(cond), indent)
+        for_dict['while_body'] = (yield node.body, indent)
+        for_dict['update'] = (yield node.cond_update, indent)
         return for_dict
+
+    def gen_DeclRangeStmt(self, node, last_indent, print_not=True):
+        indent = last_indent + 1
+        range_dict = {}
+        stop = (yield node.stop, indent)
+        if node.body is not None:
+            start = (yield node.start, indent)
+            lbl = "for {} in range({}, {}, {}):".format(node.var, start, stop, node.step)
+            range_dict['range_stmt'] = self.generate_code(lbl, indent)
+            range_dict['range_body'] = (yield node.body, indent)
+        if node.settle:
+            # Leave the variable past the range, as the loop runs up to it
+            lbl = "{0} = {1}({0}, {2})".format(node.var, 'max' if node.step > 0 else 'min', stop)
+            range_dict['settle'] = self.generate_code(lbl, indent)
+        return range_dict
     
     def gen_Comments(self, node, last_indent, print_not=True):
         indent = last_indent
@@ -705,9 +608,7 @@ class PYGen(object):
     
     def gen_DeclPrintStmt(self, node, last_indent, print_not=True):
         indent = last_indent+1
-        expr = self.generate(node.expr, indent)
-        if expr in self.callable:
-            self.callable[expr] += 1
+        expr = (yield node.expr, indent)
         lbl = "print({})".format(expr)
         
         return self.generate_code(lbl, indent)
@@ -717,28 +618,17 @@ class PYGen(object):
 
     def gen_DeclObjAddCall(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        args = node.children()[0]
-        if node.name in self.callable:
-            self.callable[node.name] += 1
-        expr = self.generate(node.expr, indent)
+        expr = (yield node.expr, indent)
         if node.name in self.arraylists:
             if isinstance(expr, str):
-                if expr == 'true':
-                    self.arraylists[node.name].append(True)
-                elif expr == 'false':
-                    self.arraylists[node.name].append(False)
-                else:
-                    self.arraylists[node.name].append(expr.replace('"', ''))
+                self.arraylists[node.name].append(expr.replace('"', ''))
             else:
                 self.arraylists[node.name].append(expr)
         return None
     
     def gen_DeclObjRemoveCall(self, node, last_indent, print_not=True):
         indent = last_indent + 1
-        args = node.children()[0]
-        if node.name in self.callable:
-            self.callable[node.name] += 1
-        expr = self.generate(node.expr, indent)
+        expr = (yield node.expr, indent)
         lbl = "del {}[{}]".format(node.name, expr)
         return self.generate_code(lbl, indent)
 
@@ -750,15 +640,17 @@ class PYGen(object):
         self.coord = coord
         """
         indent = last_indent + 1
-        args = node.children()[0][1]
+        args = node.func_param
         lbl = ""
         lbl = lbl + "{}".format(node.obj_name)
-        lbl += ".{}(".format(node.obj_func)
+        if node.obj_func is not None:
+            lbl += ".{}".format(node.obj_func)
+        lbl += "("
         i = 0
         if args.func_params is not None:
             while i < len(args.func_params):
                 param = args.func_params[i]
-                expr = self.generate(param, indent)
+                expr = (yield param, indent)
                 lbl += "{}".format(expr)
                 if i + 1 >= len(args.func_params):
                     pass
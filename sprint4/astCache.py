@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+import gc
+import hashlib
+import os
+import pickle
+import zlib
+
+import astJava2Python as ast
+import parser
+
+MAGIC = b'J2PAST'
+
+# Bump FORMAT_VERSION when the layout of the serialized entries changes
+FORMAT_VERSION = 1
+
+
+def ast_version():
+    """
+    Return a digest of the AST node definitions and of the grammar actions
+    that build the tree. Entries written by any other version are rejected.
+    """
+    h = hashlib.sha256(b'%d' % FORMAT_VERSION)
+    for module in (ast, parser):
+        f = open(os.path.abspath(module.__file__), 'rb')
+        h.update(f.read())
+        f.close()
+    return h.digest()
+
+
+class ASTCache(object):
+    """
+    Persists the Program tree returned by Parser.parse in a BuildCache, keyed
+    by a hash of the source, so that later runs can skip scanning and
+    parsing. Entries are zlib-compressed pickles, behind a header holding
+    MAGIC and the ast_version() digest.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.header = MAGIC + ast_version()
+
+    def key(self, source):
+        return self.cache.key(b'ast', source)
+
+    def load(self, source):
+        """
+        Return the cached tree for 'source' (str or bytes), or None if there
+        is no entry or the entry was written by another AST version
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        data = self.cache.get(self.key(source))
+        if data is None or not data.startswith(self.header):
+            return None
+        payload = zlib.decompress(memoryview(data)[len(self.header):])
+        # Unpickling allocates nothing but tree nodes, running the cyclic
+        # garbage collector over them meanwhile only costs time
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(payload)
+        finally:
+            if enabled:
+                gc.enable()
+
+    def store(self, source, root):
+        """
+        Serialize 'root' as the tree of 'source'. Trees too deep to be
+        pickled are silently not cached.
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        try:
+            payload = pickle.dumps(root, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            return
+        self.cache.put(self.key(source), self.header + zlib.compress(payload, 1))
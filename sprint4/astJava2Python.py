@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import hashlib
 import sys
 import xml.etree.ElementTree as ET
 # from sympy import root
@@ -7,20 +8,101 @@ import xml.etree.ElementTree as ET
 class Node(object):
     """
     Abstract class for AST nodes.
+
+    Nodes declare their fields in __slots__ instead of keeping a per-instance
+    __dict__, which keeps large trees small. Every subclass lists the fields
+    its __init__ sets; 'coord' is declared here.
+
+    Expression and declaration nodes also have a 'resolved_type' field,
+    None until the TypeChecker stores the typeSystem.Type it resolved for
+    the node, for the code generators to use.
     """
+    __slots__ = ('coord',)
+
     # __init__ to be overwritten by child classes
 
+    # Names of the fields holding child nodes (or lists of them), in
+    # traversal order. To be overwritten by child classes. Visitors walk the
+    # tree through this per-class tuple, which allocates nothing per visit:
+    #
+    #     for name in node.child_fields:
+    #         child = getattr(node, name)
+    child_fields = ()
+
     def children(self):
         """
-        sequence of all children that are nodes, 
-        
-        To be overwritten by child classes
+        sequence of (name, child) pairs of all children that are nodes,
+        with list fields flattened. Allocates a new tuple on every call; use
+        'child_fields' on hot paths.
         """
-        pass
+        lst = []
+        for name in self.child_fields:
+            child = getattr(self, name)
+            if isinstance(child, list):
+                flatten_children(name, child, lst)
+            elif child is not None:
+                lst.append((name, child))
+        return tuple(lst)
     
     # Set of attributes for a given node
     attr_names = ()
 
+def flatten_children(name, children, lst):
+    for i, child in enumerate(children):
+        if isinstance(child, list):
+            flatten_children('%s[%d]' % (name, i), child, lst)
+        elif child is not None:
+            lst.append(('%s[%d]' % (name, i), child))
+
+def walk(node):
+    """
+    Iterate over the nodes of the subtree under 'node' in preorder
+    """
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif item is not None:
+            yield item
+            for name in reversed(item.child_fields):
+                stack.append(getattr(item, name))
+
+# Closes the fields of a node in structural_hash
+_END_NODE = object()
+
+# Every slot of each node class, base class slots first
+_all_slots = {}
+
+def structural_hash(node):
+    """
+    Return a digest of the whole subtree under 'node': the class and every
+    field (coordinates included) of each node. Two subtrees have the same
+    digest exactly when they are built alike.
+    """
+    h = hashlib.sha256()
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Node):
+            cls = item.__class__
+            slots = _all_slots.get(cls)
+            if slots is None:
+                slots = _all_slots[cls] = tuple(name for klass in reversed(cls.__mro__)
+                                                for name in klass.__dict__.get('__slots__', ()))
+            h.update(b'(' + cls.__name__.encode())
+            stack.append(_END_NODE)
+            for name in reversed(slots):
+                stack.append(getattr(item, name, None))
+        elif isinstance(item, list):
+            h.update(b'[%d' % len(item))
+            stack.extend(reversed(item))
+        elif item is _END_NODE:
+            h.update(b')')
+        else:
+            h.update(repr(item).encode() + b'\0')
+    return h.digest()
+
 class DeclClassStmt(Node):
     """
     This subclass is for class_statement in lexical specs.
@@ -28,6 +110,8 @@ class DeclClassStmt(Node):
         class MyClass {
         }
     """   
+    __slots__ = ('name', 'access_type', 'extend', 'stmt_list')
+
     def __init__(self, access_type, name, extends, stmt_list, coord=None):
         """
         initialize tokens
@@ -45,16 +129,7 @@ class DeclClassStmt(Node):
         self.stmt_list = stmt_list
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.extend is not None:
-            lst.append(('extend', self.extend))
-        if self.access_type is not None:
-            lst.append(('access_type', self.access_type))
-        if self.stmt_list is not None:
-            lst.append(('stmt_list', self.stmt_list))
-        return tuple(lst)
-
+    child_fields = ('extend', 'access_type', 'stmt_list')
     attr_names = ('name', )
 
 
@@ -62,13 +137,13 @@ class Extend(Node):
     """
     This class is for class inheritence information.
     """
+    __slots__ = ('name',)
+
     def __init__(self, name, coord=None):
         self.name = name
         self.coord = coord
 
-    def children(self):
-        return tuple([])
-
+    child_fields = ()
     attr_names = ('name', )
 
 class DeclVarStmt(Node):
@@ -78,6 +153,8 @@ class DeclVarStmt(Node):
         int i;
         int i = 0;
     """
+    __slots__ = ('access_type', 'var_type', 'name', 'expr', 'resolved_type')
+
     def __init__(self, access_type, var_type, name, expr=None, coord=None):
         """
         initialize tokens
@@ -93,52 +170,35 @@ class DeclVarStmt(Node):
         self.name = name
         self.expr = expr
         self.coord = coord
+        self.resolved_type = None
     
-    def children(self):
-        lst = []
-        if self.access_type is not None:
-            lst.append(('access_type', self.access_type))
-        if self.var_type is not None:
-            lst.append(('type', self.var_type))
-        if self.expr is not None:
-            lst.append(('expr', self.expr))
-        return tuple(lst)
-
+    child_fields = ('access_type', 'var_type', 'expr')
     attr_names = ('name', )
 class DeclObjRemoveCall(Node):
+    __slots__ = ('name', 'obj_func', 'expr')
+
     def __init__(self, obj_name, obj_func, expr, coord=None):
         self.name = obj_name
         self.obj_func = obj_func
         self.expr = expr
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.expr is not None:
-            lst.append(('func_param', self.expr))
-        if self.name is not None:
-            lst.append(('object name', self.name))
-        if self.obj_func is not None:
-            lst.append(('object func name', self.obj_func))
-        return tuple(lst)
-
+    child_fields = ('expr',)
     attr_names = ('obj_add_name')
     
 class DeclObjClearCall(Node):
+    __slots__ = ('name', 'obj_func')
+
     def __init__(self, obj_name, obj_func, coord=None):
         self.name = obj_name
         self.obj_func = obj_func
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.name is not None:
-            lst.append(('object name', self.name))
-        if self.obj_func is not None:
-            lst.append(('object func name', self.obj_func))
-        return tuple(lst)
+    child_fields = ()
     attr_names = ('obj_add_name')
 class DeclObjPutCall(Node):
+    __slots__ = ('name', 'obj_func', 'expr1', 'expr2')
+
     def __init__(self, obj_name, obj_func, expr1,expr2, coord=None):
         self.name = obj_name
         self.obj_func = obj_func
@@ -146,21 +206,12 @@ class DeclObjPutCall(Node):
         self.expr2 = expr2
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.expr1 is not None:
-            lst.append(('func_param1', self.expr1))
-        if self.expr2 is not None:
-            lst.append(('func_param2', self.expr2))
-        if self.name is not None:
-            lst.append(('object name', self.name))
-        if self.obj_func is not None:
-            lst.append(('object func name', self.obj_func))
-        return tuple(lst)
-
+    child_fields = ('expr1', 'expr2')
     attr_names = ('obj_put_name')
 
 class DeclHashMap(Node):
+    __slots__ = ('type', 'key_type', 'value_type', 'create_type', 'name', 'create_keytype', 'create_valuetype', 'resolved_type')
+
     def __init__(self, type,  key_type, value_type, name, create_type, create_keytype, create_valuetype, coord=None):
         self.type = type
         self.key_type = key_type
@@ -170,25 +221,9 @@ class DeclHashMap(Node):
         self.create_keytype = create_keytype
         self.create_valuetype = create_valuetype
         self.coord = coord
+        self.resolved_type = None
 
-    def children(self):
-        lst = []
-        if self.type is not None:
-            lst.append(('type', self.type))
-        if self.key_type is not None:
-            lst.append(('key_type', self.key_type))
-        if self.value_type is not None:
-            lst.append(('value_type', self.key_type))
-        if self.name is not None:
-            lst.append(('name', self.name))
-        if self.create_type is not None:
-            lst.append(('create_type', self.create_type))
-        if self.create_keytype is not None:
-            lst.append(('create_keytype', self.create_keytype))
-        if self.create_valuetype is not None:
-            lst.append(('create_valuetype', self.create_valuetype))
-        print("hashmap children", lst)
-        return tuple(lst)
+    child_fields = ('key_type', 'value_type', 'create_keytype', 'create_valuetype')
     attr_names = ('name',)
 
 class DeclMethodStmt(Node):
@@ -200,7 +235,9 @@ class DeclMethodStmt(Node):
 
         }
     """
-    def __init__(self, access_type, method_type, name, params, body, main=False, coord=None):
+    __slots__ = ('access_type', 'method_type', 'name', 'params', 'body', 'ret_stmt', 'main', 'source_digest')
+
+    def __init__(self, access_type, method_type, name, params, body, main=False, coord=None, source_digest=None):
         """
         initialize tokens
 
@@ -211,6 +248,7 @@ class DeclMethodStmt(Node):
         params: parameters
         body: body statements, including return statement
         coord: error index
+        source_digest: digest of the source text of the method, if known
         """
         self.access_type = access_type
         self.method_type = method_type
@@ -227,27 +265,17 @@ class DeclMethodStmt(Node):
             self.ret_stmt = self.body.stmt_lst[-1]
             self.body = StmtList(body.stmt_lst[:-1])
         self.main = main
+        self.source_digest = source_digest
 
-    def children(self):
-        lst = []
-        if self.access_type is not None:
-            lst.append(('access_type', self.access_type))
-        if self.method_type is not None:
-            lst.append(('type', self.method_type))
-        if self.body is not None:
-            lst.append(('body', self.body))
-        if self.params is not None:
-            lst.append(('params', self.params))
-        if self.ret_stmt is not None:
-            lst.append(('ret_stmt', self.ret_stmt))
-        return tuple(lst)       
-
+    child_fields = ('access_type', 'method_type', 'body', 'params', 'ret_stmt')
     attr_names = ('name', )
 
 class DeclAccessType(Node):
     """
     This subclass is for access_type in lexical specs.
     """
+    __slots__ = ('name',)
+
     def __init__(self, name, coord=None):
         """
         initialize tokens
@@ -255,51 +283,42 @@ class DeclAccessType(Node):
         self.name = name
         self.coord = coord
     
-    def children(self):
-        lst = []
-        return tuple(lst)
+    child_fields = ()
     attr_names = ('name', )
 
 class AssignStmt(Node):
+    __slots__ = ('name', 'expr', 'this', 'resolved_type')
+
     def __init__(self, name, expr, this=False, coord=None):
         self.name = name
         self.expr = expr
         self.coord = coord
+        self.resolved_type = None
         self.this = this
 
-    def children(self):
-        lst = []
-        if self.expr is not None:
-            lst.append(('expr', self.expr))
-        return tuple(lst)
-
+    child_fields = ('expr',)
     attr_names = ('name', )
 
 class DeclArrayList(Node):
+    __slots__ = ('type', 'var_type', 'name', 'create_type', 'resolved_type')
+
     def __init__(self, type,  var_type, name, create_type, coord=None):
         self.type = type
         self.var_type = var_type
         self.name = name
         self.create_type = create_type
         self.coord = coord
+        self.resolved_type = None
 
-    def children(self):
-        lst = []
-        if self.type is not None:
-            lst.append(('type', self.type))
-        if self.var_type is not None:
-            lst.append(('var_type', self.var_type))
-        if self.name is not None:
-            lst.append(('name', self.name))
-        if self.create_type is not None:
-            lst.append(('create_type', self.create_type))
-        return tuple(lst)
+    child_fields = ('var_type', 'create_type')
     attr_names = ('name',)
 
 class DeclType(Node):
     """
     This subclass is for type in lexical specs.
     """
+    __slots__ = ('name',)
+
     def __init__(self, name, coord=None):
         """
         initialize tokens
@@ -307,61 +326,51 @@ class DeclType(Node):
         self.name = name
         self.coord = coord
     
-    def children(self):
-        lst = []
-        return tuple(lst)
+    child_fields = ()
     attr_names = ('name', ) 
 
 class ParamList(Node):
     """
     This subclass is for parameter lists. 
     """
+    __slots__ = ('params',)
+
     def __init__(self, params, coord=None):
         self.params = params
         self.coord = coord
 
-    def children(self):
-        lst = []
-        for i, child in enumerate(self.params or []):
-            lst.append(('params[%d]' % i, child))
-        return tuple(lst)
+    child_fields = ('params',)
     attr_names = ()    
 
 class FuncCallParamList(Node):
+    __slots__ = ('func_params',)
+
     def __init__(self, func_params, coord=None):
         self.func_params = func_params
         self.coord = coord
 
-    def children(self):
-        lst = []
-        for i, child in enumerate(self.func_params or []):
-            lst.append(('func_params[%d]' % i, child))
-        return tuple(lst)
+    child_fields = ('func_params',)
     attr_names = ()    
 
 class Param(Node):
+    __slots__ = ('name', 'type')
+
     def __init__(self, stmt_type, name, coord=None):
         self.name = name
         self.type = stmt_type
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.type is not None:
-            lst.append(('type', self.type))
-        return tuple(lst)
-
+    child_fields = ('type',)
     attr_names = ('name', )
 
 class FuncCallParam(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, value, coord=None):
         self.expr = value
         self.coord = coord
     
-    def children(self):
-        lst=[]
-        return tuple(lst)
-    
+    child_fields = ('expr',)
     attr_names = ('name', )
 
 # class FuncCallParam(Node):
@@ -378,6 +387,8 @@ class FuncCallParam(Node):
 #     attr_names = ('name', )
 
 class DeclFuncCall(Node):
+    __slots__ = ('access_type', 'var_type', 'name', 'func_name', 'func_param', 'resolved_type')
+
     def __init__(self, access_type, var_type, name, func_name, expr, coord=None):
         self.access_type = access_type
         self.var_type = var_type
@@ -385,88 +396,63 @@ class DeclFuncCall(Node):
         self.func_name = func_name
         self.func_param = expr
         self.coord = coord
+        self.resolved_type = None
     
-    def children(self):
-        lst = []
-        if self.access_type is not None:
-            lst.append(('access_type', self.access_type))
-        if self.var_type is not None:
-            lst.append(('type', self.var_type))
-        if self.func_param is not None:
-            lst.append(('func_param', self.func_param))
-        return tuple(lst)
-
+    child_fields = ('access_type', 'var_type', 'func_param')
     attr_names = ('name', )
 
 class DeclObjCall(Node):
+    __slots__ = ('obj_name', 'obj_func', 'func_param', 'resolved_type')
+
     def __init__(self, obj_name, obj_func, expr, coord=None):
         self.obj_name = obj_name
         self.obj_func = obj_func
         self.func_param = expr
         self.coord = coord
+        self.resolved_type = None
     
-    def children(self):
-        lst = []
-        if self.func_param is not None:
-            lst.append(('func_param', self.func_param))
-        if self.obj_name is not None:
-            lst.append(('object name', self.obj_name))
-        if self.obj_func is not None:
-            lst.append(('object func name', self.obj_func))
-        return tuple(lst)
-    
+    child_fields = ('func_param',)
     attr_names = ('obj_name')
 
 
 class DeclObjAddCall(Node):
+    __slots__ = ('name', 'obj_func', 'expr')
+
     def __init__(self, obj_name, obj_func, expr, coord=None):
         self.name = obj_name
         self.obj_func = obj_func
         self.expr = expr
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.expr is not None:
-            lst.append(('func_param', self.expr))
-        if self.name is not None:
-            lst.append(('object name', self.name))
-        if self.obj_func is not None:
-            lst.append(('object func name', self.obj_func))
-        return tuple(lst)
-
+    child_fields = ('expr',)
     attr_names = ('obj_add_name')
 
 class StmtList(Node):
+    __slots__ = ('stmt_lst',)
+
     def __init__(self, stmt_lst, coord=None):
         self.stmt_lst = stmt_lst
         self.coord = coord
 
-    def children(self):
-        lst = []
-        for i, stmt in enumerate(self.stmt_lst or []):
-            lst.append(('stmt[%d]' % i, stmt))
-        return lst
-
+    child_fields = ('stmt_lst',)
     attr_names = ()
 
 class DeclRetStmt(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, coord=None):
         self.expr = expr
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.expr is not None:
-            lst.append(('expr', self.expr))
-        return tuple(lst)
-
+    child_fields = ('expr',)
     attr_names = ()
 
 class DeclIfStmt(Node):
     """
     This class is for If statement. 
     """
+    __slots__ = ('if_cond', 'if_body', 'elif_cond', 'elif_body', 'else_body')
+
     def __init__(self, if_cond, if_body, elif_cond, elif_body, else_body, coord=None):
         self.if_cond = if_cond
         self.if_body = if_body
@@ -475,45 +461,29 @@ class DeclIfStmt(Node):
         self.else_body = else_body
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.if_cond is not None:
-            lst.append(('cond', self.if_cond))
-        if self.if_body is not None:
-            lst.append(('if_body', self.if_body))
-        if self.elif_cond is not None:
-            lst.append(('elif_cond', self.elif_cond))
-        if self.elif_body is not None:
-            lst.append(('elif_body', self.elif_body))
-        if self.else_body is not None:
-            lst.append(('else_body', self.else_body))
-        return tuple(lst)
-
+    child_fields = ('if_cond', 'if_body', 'elif_cond', 'elif_body', 'else_body')
     attr_names = ()
 
 class DeclWhileStmt(Node):
     """
     This class is for While statement
     """
+    __slots__ = ('cond', 'body')
+
     def __init__(self, cond, body, coord=None):
         self.cond = cond
         self.body = body
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.cond is not None:
-            lst.append(('cond', self.cond))
-        if self.body is not None:
-            lst.append(('body', self.body))
-        return tuple(lst)
-
+    child_fields = ('cond', 'body')
     attr_names = ()
 
 class DeclForStmt(Node):
     """
     This class is for For statement
     """
+    __slots__ = ('var_assign', 'cond', 'body', 'cond_update')
+
     def __init__(self, var_assign, cond, update, body, coord=None):
         self.var_assign = var_assign
         self.cond = cond
@@ -521,195 +491,221 @@ class DeclForStmt(Node):
         self.coord = coord
         self.cond_update = update
 
-    def children(self):
-        lst = []
-        if self.var_assign is not None:
-            lst.append(('expr', self.var_assign))
-        if self.cond is not None:
-            lst.append(('cond', self.cond))
-        if self.body is not None:
-            lst.append(('body', self.body))
-        if self.cond_update is not None:
-            lst.append(('cond_update', self.cond_update))
-        return tuple(lst)
-
+    child_fields = ('var_assign', 'cond', 'body', 'cond_update')
     attr_names = ()
 
+class DeclRangeStmt(Node):
+    """
+    This class is for a loop of the variable 'var' over 'range(start, stop,
+    step)', 'step' being an int, which the RangeLoopConverter makes of the
+    counted while and for loops. If 'settle' is set, the variable is read
+    after the loop and must end there as the Java loop leaves it. Without a
+    'body', only that is left of the loop.
+    """
+    __slots__ = ('var', 'start', 'stop', 'step', 'body', 'settle')
+
+    def __init__(self, var, start, stop, step, body, settle=False, coord=None):
+        self.var = var
+        self.start = start
+        self.stop = stop
+        self.step = step
+        self.body = body
+        self.settle = settle
+        self.coord = coord
+
+    child_fields = ('start', 'stop', 'body')
+    attr_names = ('var', 'step', 'settle')
+
 class DeclTryStmt(Node):
     """
     This class is for Try Statement
     """
+    __slots__ = ('try_stmt_list', 'catch_id', 'catch_stmt_list', 'finally_stmt_list')
+
     def __init__(self, try_stmt_list, catch_id, \
     catch_stmt_list, finally_stmt_list=None, coord=None):
         self.try_stmt_list = try_stmt_list
         self.catch_id = DeclType(catch_id)
         self.catch_stmt_list = catch_stmt_list
         self.finally_stmt_list = finally_stmt_list
+        self.coord = coord
 
-    def children(self):
-        lst=[]
-        if self.try_stmt_list is not None:
-            lst.append(('try_stmt_list', self.try_stmt_list))
-        if self.catch_id is not None:
-            lst.append(('catch_id', self.catch_id))
-        if self.catch_stmt_list is not None:
-            lst.append(('cacth_stmt_list', self.catch_stmt_list))
-        if self.finally_stmt_list is not None:
-            lst.append(('finally_stmt_list', self.finally_stmt_list))
-        return tuple(lst)
+    child_fields = ('try_stmt_list', 'catch_id', 'catch_stmt_list', 'finally_stmt_list')
     attr_names = ()
 
 class ObjInstance(Node):
+    __slots__ = ('obj',)
+
     def __init__(self, obj, coord=None):
         self.obj = obj
         self.coord = coord
 
-    def children(self):
-        lst = []
-        return tuple(lst)
-
+    child_fields = ()
     attr_names = ('obj', )
 
+class AttributeRef(Node):
+    """
+    This class is for looking up the method 'attr' of the object 'obj_name',
+    which the LoopInvariantMover moves out of loops. A DeclObjCall whose
+    'obj_func' is None calls the method held in 'obj_name'.
+    """
+    __slots__ = ('obj_name', 'attr', 'resolved_type')
+
+    def __init__(self, obj_name, attr, coord=None):
+        self.obj_name = obj_name
+        self.attr = attr
+        self.coord = coord
+        self.resolved_type = None
+
+    child_fields = ()
+    attr_names = ('obj_name', 'attr')
+
 class BinOp(Node):
     """
     This class is for binary operation. 
     """
+    __slots__ = ('op', 'left', 'right', 'resolved_type')
+
     def __init__(self, op, left, right, coord=None):
         self.op = op
         self.left = left
         self.right = right
         self.coord = coord
+        self.resolved_type = None
 
-    def children(self):
-        lst = []
-        if self.left is not None:
-            lst.append(('left', self.left))
-        if self.right is not None:
-            lst.append(('right', self.right))
-        return tuple(lst)
-
+    child_fields = ('left', 'right')
     attr_names = ('op', )
 
 class UnaryOp(Node):
     """
     This class is for negation operation.
     """
+    __slots__ = ('op', 'expr', 'resolved_type')
+
     def __init__(self, op, expr, coord=None):
         self.op = op
         self.expr = expr
         self.coord = coord
+        self.resolved_type = None
 
-    def children(self):
-        lst = []
-        if self.expr is not None:
-            lst.append(('expr', self.expr))
-        return tuple(lst)
-
+    child_fields = ('expr',)
     attr_names = ('op', )
 
 class LogicOp(Node):
     """
     This class is for logic operation.
     """
+    __slots__ = ('op', 'left', 'right', 'resolved_type')
+
     def __init__(self, op, left, right, coord=None):
         self.op = op
         self.left = left
         self.right = right
         self.coord = coord
+        self.resolved_type = None
     
-    def children(self):
-        lst = []
-        if self.left is not None:
-            lst.append(('left', self.left))
-        if self.right is not None:
-            lst.append(('right', self.right))
-        return tuple(lst)
-
+    child_fields = ('left', 'right')
     attr_names = ('op', )        
 
 class CompareOp(Node):
     """
     This class is for compare operator.
     """
+    __slots__ = ('op', 'left', 'right', 'resolved_type')
+
     def __init__(self, op, left, right, coord=None):
         self.op = op
         self.left = left
         self.right = right
         self.coord = coord
+        self.resolved_type = None
     
-    def children(self):
-        lst = []
-        if self.left is not None:
-            lst.append(('left', self.left))
-        if self.right is not None:
-            lst.append(('right', self.right))
-        return tuple(lst)
-
+    child_fields = ('left', 'right')
     attr_names = ('op', )       
 
 class Constant(Node):
     """
     This class is for constant. 
     """
+    __slots__ = ('type', 'value', 'resolved_type')
+
     def __init__(self, var_type, value, coord=None):
-        self.type = DeclType(var_type)
+        self.type = constant_type(var_type)
         self.value = value
         self.coord = coord
+        self.resolved_type = None
 
-    def children(self):
-        lst = []
-        return tuple(lst)
-
+    child_fields = ()
     attr_names = ('type', 'value', )
 
+# DeclType nodes of the constant kinds ('int', 'id', ...), shared by every
+# Constant instead of allocating one type node per literal
+_constant_types = {}
+
+def constant_type(var_type):
+    try:
+        return _constant_types[var_type]
+    except KeyError:
+        decl_type = _constant_types[var_type] = DeclType(var_type)
+        return decl_type
+
 class Program(Node):
+    __slots__ = ('class_decl',)
+
     def __init__(self, class_decl, coord=None):
         self.class_decl = class_decl  #now it becomes a list of class declarations
-    def children(self):
-        lst = []
+        self.coord = coord
+
+    child_fields = ('class_decl',)
 
-        if self.class_decl is not None:
-            lst.append(('class_decl', self.class_decl))
-        
-        return tuple(lst)
-    
 class Comments(Node):
+    __slots__ = ('words',)
+
     def __init__(self, words, coord=None):
         if not isinstance(words, list):
             self.words = [words]
         else:
             self.words = words
+        self.coord = coord
     
-    def children(self):
-        lst = []
-        if self.words is not None:
-            lst.append(('Comments info', self.words))
-        return tuple(lst)
+    child_fields = ()
     attr_names = ('comments', )  
 
 class DeclPrintStmt(Node):
+    __slots__ = ('expr',)
+
     def __init__(self, expr, coord=None):
         self.expr = expr
         self.coord = coord
-    def children(self):
-        lst=[]
-        if self.expr is not None:
-            lst.append(("expr", DeclType(self.expr)))
-        return tuple(lst)
+    child_fields = ('expr',)
     attr_names = ('print', )
 
 class Word(Node):
     """
     This class is for word. 
     """
+    __slots__ = ('value',)
+
     def __init__(self, value, coord=None):
         self.value = value
         self.coord = coord
 
-    def children(self):
-        lst = []
-        if self.value is not None:
-            lst.append('value', self.value)
-        return tuple(lst)
+    child_fields = ()
+    attr_names = ('word', )
+
+# Statements declaring a variable named 'name'
+DECLARATIONS = (DeclVarStmt, DeclArrayList, DeclHashMap, DeclFuncCall)
 
-    attr_names = ('word', )
\ No newline at end of file
+def local_names(method):
+    """
+    Return the set of the names local to the DeclMethodStmt 'method': its
+    parameters and the variables declared in its body
+    """
+    names = set()
+    for params in method.params:
+        for param in params.params or []:
+            names.add(param.name)
+    for node in walk(method.body):
+        if node.__class__ in DECLARATIONS:
+            names.add(node.name)
+    return names
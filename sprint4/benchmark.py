@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import astJava2Python as ast
+from astCache import ASTCache
+from buildCache import BuildCache
+from parser import Parser, LEXTAB, PARSETAB
+from symbolTable import SymbolTable
+from typeChecker import TypeChecker
+import typeSystem
+from IRGen import IRGen
+from constantFolder import ConstantFolder
+from deadCode import DeadCodeEliminator
+from loopFusion import LoopFuser
+from loopInvariants import LoopInvariantMover
+from inductionVariables import RangeLoopConverter
+from CFG import build_cfgs
+from dataflow import Liveness, ReachingDefinitions, AvailableExpressions
+from PYGen import PYGen
+
+
+def timed(func, repeat):
+    """
+    Runs 'func' 'repeat' times and returns the best wall time in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(label, seconds):
+    print("{:<40} {:>12.3f} ms".format(label, seconds * 1000))
+
+
+################################
+## Benchmarks
+################################
+
+def bench_startup(args):
+    """
+    Cold construction (reflect over the grammar and generate the LALR and
+    lexer tables) against loading the precompiled tables and against
+    handing out a warm Parser instance.
+    """
+    def cold():
+        Parser.build_tables(Parser(), optimize=False)
+
+    def load():
+        sys.modules.pop(LEXTAB, None)
+        sys.modules.pop(PARSETAB, None)
+        Parser.build_tables(Parser(), optimize=True)
+
+    Parser()  # make sure the table modules exist
+    report("cold construction (generate tables)", timed(cold, args.repeat))
+    report("table load (optimize mode)", timed(load, args.repeat))
+    report("warm construction (Parser())", timed(Parser, args.repeat))
+
+
+def statements_source(count):
+    """
+    Return a class whose single method has 'count' statements
+    """
+    lines = ["public class Scaling {", "    public int body() {", "        int x = 0;"]
+    for i in range(count - 1):
+        lines.append("        x = x + %d;" % (i % 10))
+    lines += ["        return x;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_scaling(args):
+    """
+    Parse time for methods of growing length. Time per statement should stay
+    flat as the statement lists are built in linear time.
+    """
+    parser = Parser()
+    for count in args.sizes:
+        data = statements_source(count)
+        seconds = timed(lambda: parser.parse(data), args.repeat)
+        report("parse {} statements".format(count), seconds)
+        print("{:<40} {:>12.3f} us".format("    per statement", seconds / count * 1e6))
+
+
+def bench_astcache(args):
+    """
+    Scanning and parsing against loading the tree from the AST cache
+    """
+    parser = Parser()
+    with tempfile.TemporaryDirectory() as directory:
+        ast_cache = ASTCache(BuildCache(directory, 1 << 40))
+        for count in args.sizes:
+            data = statements_source(count)
+            ast_cache.store(data, parser.parse(data))
+            report("parse {} statements".format(count), timed(lambda: parser.parse(data), args.repeat))
+            report("load {} statements".format(count), timed(lambda: ast_cache.load(data), args.repeat))
+
+
+def count_nodes(root):
+    """
+    Return the number of distinct nodes reachable from 'root'
+    """
+    seen = set()
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, ast.Node) and id(item) not in seen:
+            seen.add(id(item))
+            for cls in type(item).__mro__:
+                for name in getattr(cls, '__slots__', ()):
+                    stack.append(getattr(item, name, None))
+    return len(seen)
+
+
+def walk_children(root):
+    """
+    Visit every node through Node.children(), which allocates a tuple of
+    (name, child) pairs per node
+    """
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for name, child in node.children():
+            stack.append(child)
+    return count
+
+
+def walk_child_fields(root, visit=None):
+    """
+    Visit every node through the per-class 'child_fields' descriptors
+    """
+    count = 0
+    stack = [root]
+    push = stack.append
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            for child in node:
+                if child is not None:
+                    push(child)
+            continue
+        count += 1
+        if visit is not None:
+            visit(node)
+        for name in node.child_fields:
+            child = getattr(node, name)
+            if child is not None:
+                push(child)
+    return count
+
+
+def expressions_source(nodes):
+    """
+    Return a class whose method holds about 'nodes' expression nodes
+    """
+    # 'x = x + 1 * 2 - 3;' is an AssignStmt over 3 operators and 4 operands
+    count = max(1, nodes // 8)
+    lines = ["public class Memory {", "    public int body() {", "        int x = 0;"]
+    lines += ["        x = x + 1 * 2 - 3;"] * count
+    lines += ["        return x;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_memory(args):
+    """
+    Bytes per AST node and peak traced memory while parsing a synthetic
+    program of about 'args.nodes' nodes
+    """
+    parser = Parser()
+    data = expressions_source(args.nodes)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    root = parser.parse(data)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    nodes = count_nodes(root)
+    print("{:<40} {:>12d}".format("nodes", nodes))
+    print("{:<40} {:>12.1f} B".format("retained bytes per node", (current - before) / nodes))
+    print("{:<40} {:>12.1f} MB".format("peak during parse", (peak - before) / 1e6))
+
+
+def bench_traverse(args):
+    """
+    Full-tree traversal through children() against child_fields
+    """
+    root = Parser().parse(expressions_source(args.nodes))
+    print("{:<40} {:>12d}".format("nodes", walk_child_fields(root)))
+    report("children()", timed(lambda: walk_children(root), args.repeat))
+    report("child_fields", timed(lambda: walk_child_fields(root), args.repeat))
+
+
+def bench_dispatch(args):
+    """
+    Handler lookup by building the method name on every visit, against the
+    type-keyed dispatch tables, and a full typecheck
+    """
+    root = Parser().parse(expressions_source(args.nodes))
+    nodes = []
+    walk_child_fields(root, nodes.append)
+    checker = TypeChecker()
+
+    def by_name():
+        for node in nodes:
+            getattr(checker, 'check_' + node.__class__.__name__, checker.generic_typecheck)
+
+    def by_table():
+        table = checker.dispatch_table
+        for node in nodes:
+            table[node.__class__]
+
+    for label, func in (("getattr('check_' + name)", by_name), ("dispatch_table", by_table)):
+        seconds = timed(func, args.repeat)
+        report(label, seconds)
+        print("{:<40} {:>12.1f} ns".format("    per visit", seconds / len(nodes) * 1e9))
+    report("typecheck", timed(lambda: checker.typecheck(root), args.repeat))
+
+
+def nested_source(depth, kind):
+    """
+    Return a class whose method nests 'depth' blocks of the given kind
+    ('if' or 'while')
+    """
+    if kind == 'if':
+        opening, closing = "if (x < 1) {", "} else { x = 0; }"
+    else:
+        opening, closing = "while (x < 1) {", "}"
+    lines = ["public class Nested {", "    public int body() {", "        int x = 0;"]
+    lines += [opening] * depth
+    lines.append("x = x + 1;")
+    lines += [closing] * depth
+    lines += ["        return x;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def chain_source(length):
+    """
+    Return a class whose method computes 'x + x + ... + x' with 'length'
+    operands, a left-leaning tree 'length' levels deep
+    """
+    expr = " + ".join(["x"] * length)
+    return "\n".join(["public class Chain {", "    public int body() {", "        int x = 1;",
+                      "        x = " + expr + ";", "        return x;", "    }", "}"])
+
+
+def bench_stress(args):
+    """
+    Runs every pass over pathologically deep trees, far deeper than the
+    Python recursion limit, to check that no pass recurses on the tree
+    """
+    parser = Parser()
+    cases = (("{}-operand expression".format(args.length), chain_source(args.length)),
+             ("{} nested if/else".format(args.depth), nested_source(args.depth, 'if')),
+             ("{} nested while".format(args.depth), nested_source(args.depth, 'while')))
+    print("{:<40} {:>12d}".format("recursion limit", sys.getrecursionlimit()))
+    for label, data in cases:
+        start = time.perf_counter()
+        root = parser.parse(data)
+        TypeChecker().typecheck(root)
+        IRGen().generate(root)
+        ConstantFolder().fold(root)
+        DeadCodeEliminator().eliminate(root)
+        LoopFuser().fuse(root)
+        LoopInvariantMover().move(root)
+        RangeLoopConverter().convert(root)
+        py_generator = PYGen('Stress.java')
+        py_generator.generate(root, 0)
+        py_generator.render_py()
+        report(label, time.perf_counter() - start)
+
+
+def scoped_source(depth):
+    """
+    Return a class whose method nests 'depth' while blocks, each declaring a
+    local and reading the outermost one
+    """
+    lines = ["public class Scopes {", "    public int body() {", "        int x = 0;"]
+    for i in range(depth):
+        lines += ["while (x < 1) {", "int y%d = x + x + x;" % i]
+    lines += ["}"] * depth
+    lines += ["        return x;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_scopes(args):
+    """
+    Cost of looking up the outermost variable from the innermost of 'depth'
+    nested scopes, which should not depend on the depth, and typecheck time
+    of deeply nested methods
+    """
+    lookups = 100000
+    for depth in args.depths:
+        st = SymbolTable()
+        st.declare_variable('x', 'int', None)
+        for i in range(depth):
+            st.push_scope()
+            st.declare_variable('y%d' % i, 'int', None)
+
+        def lookup():
+            for _ in range(lookups):
+                st.lookup_variable('x', None)
+
+        seconds = timed(lookup, args.repeat)
+        print("{:<40} {:>12.1f} ns".format("lookup at depth {}".format(depth), seconds / lookups * 1e9))
+
+        def push_pop():
+            for _ in range(lookups):
+                st.push_scope()
+                st.declare_variable('x', 'int', None)
+                st.pop_scope()
+
+        seconds = timed(push_pop, args.repeat)
+        print("{:<40} {:>12.1f} ns".format("    push, declare, pop", seconds / lookups * 1e9))
+
+    parser = Parser()
+    for depth in args.depths:
+        root = parser.parse(scoped_source(depth))
+        report("typecheck {} nested scopes".format(depth), timed(lambda: TypeChecker().typecheck(root), args.repeat))
+
+
+def hierarchy_source(depth):
+    """
+    Return 'depth' classes, each extending the previous one and adding a
+    method, and a main class calling the root method through the deepest
+    class
+    """
+    lines = ["class C0 {", "    public int m0(int x) {", "        return x;", "    }", "}"]
+    for i in range(1, depth):
+        lines += ["class C%d extends C%d {" % (i, i - 1),
+                  "    public int m%d(int x) {" % i, "        int y = m%d(x);" % (i - 1), "        return y;",
+                  "    }", "}"]
+    lines += ["public class Main {", "    public static void main(String[] args){",
+              "        C%d c = new C%d();" % (depth - 1, depth - 1)]
+    lines += ["        c.m0(1);"] * 100
+    lines += ["    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_hierarchy(args):
+    """
+    Method lookups through 'extends' chains of growing depth. Lookups should
+    not depend on the depth once the class members are resolved.
+    """
+    lookups = 100000
+    parser = Parser()
+    for depth in args.depths:
+        root = parser.parse(hierarchy_source(depth))
+        seconds = timed(lambda: TypeChecker().typecheck(root), args.repeat)
+        leaf = "C%d" % (depth - 1)
+        class_table = TypeChecker().typecheck(root)
+
+        def lookup():
+            for _ in range(lookups):
+                class_table.lookup_method(leaf, 'm0', None)
+
+        print("{:<40} {:>12.1f} ns".format("lookup at depth {}".format(depth),
+                                           timed(lookup, args.repeat) / lookups * 1e9))
+        report("    typecheck", seconds)
+
+
+def bench_types(args):
+    """
+    Typecheck time of an expression-heavy program, and the memory still
+    allocated after it. Types are interned, so the number of type objects
+    stays the same however many expressions are checked.
+    """
+    root = Parser().parse(expressions_source(args.nodes))
+    checker = TypeChecker()
+    checker.typecheck(root)
+    types = len(typeSystem._types)
+    report("typecheck", timed(lambda: checker.typecheck(root), args.repeat))
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    checker.typecheck(root)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<40} {:>12d}".format("nodes", walk_child_fields(root)))
+    print("{:<40} {:>12d}".format("new type objects", len(typeSystem._types) - types))
+    print("{:<40} {:>12.1f} kB".format("peak traced memory", (peak - before) / 1e3))
+
+
+def methods_source(methods, statements):
+    """
+    Return a class of 'methods' methods of 'statements' statements each
+    """
+    lines = ["public class Methods {"]
+    for i in range(methods):
+        lines += ["    public int m%d(int x) {" % i]
+        lines += ["        x = x + 1 * 2 - 3;"] * statements
+        lines += ["        return x;", "    }"]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def bench_bodies(args):
+    """
+    Serial typechecking against checking method bodies in a pool of
+    'args.jobs' worker processes (pool start-up included)
+    """
+    root = Parser().parse(methods_source(args.methods, args.statements))
+    report("serial", timed(lambda: TypeChecker().typecheck(root), args.repeat))
+    report("{} jobs".format(args.jobs), timed(lambda: TypeChecker(args.jobs).typecheck(root), args.repeat))
+
+
+def calls_source(methods, statements, edited=None, retyped=None):
+    """
+    Return a class of 'methods' methods of 'statements' statements, each
+    calling the previous one. The body of method 'edited' gets one more
+    statement and method 'retyped' takes a String instead of an int.
+    """
+    lines = ["public class Calls {"]
+    for i in range(methods):
+        lines += ["    public int m%d(%s x) {" % (i, "String" if i == retyped else "int")]
+        lines += ["        int y = 0;"]
+        lines += ["        y = y + 1 * 2 - 3;"] * statements
+        if i == edited:
+            lines += ["        y = y + 1;"]
+        if i > 0:
+            lines += ["        int z%d = m%d(%s);" % (i, i - 1, '"s"' if i - 1 == retyped else "y")]
+        lines += ["        return y;", "    }"]
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def bench_incremental(args):
+    """
+    Full typecheck against re-checking after no edit, after editing one
+    method body and after changing the signature of one method
+    """
+    parser = Parser()
+    middle = args.methods // 2
+    edits = (("full check", None, None),
+             ("no edit", None, None),
+             ("edit one body", middle, None),
+             ("change one signature", None, middle))
+    checker = TypeChecker(incremental=True)
+    for label, edited, retyped in edits:
+        root = parser.parse(calls_source(args.methods, args.statements, edited, retyped))
+        start = time.perf_counter()
+        checker.typecheck(root)
+        report(label, time.perf_counter() - start)
+        print("{:<40} {:>12d}".format("    methods checked", checker.checked))
+
+
+def control_source(statements):
+    """
+    Return a class whose single method holds about 'statements' statements
+    in a mix of straight-line code, if/else and nested loops
+    """
+    lines = ["public class Control {", "    public int body(int x) {", "        int y = 0;"]
+    for i in range(statements // 8):
+        lines += ["        if (x < %d) {" % i,
+                  "            y = y + x;",
+                  "        } else {",
+                  "            y = y - 1;",
+                  "        }",
+                  "        while (y < %d) {" % i,
+                  "            for (int k = 0; k < 3; k = k + 1) {",
+                  "                y = y + k;",
+                  "            }",
+                  "        }"]
+    lines += ["        return y;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_cfg(args):
+    """
+    IR generation, CFG construction, dominators and natural loops of one
+    method of each size, which should all grow linearly
+    """
+    parser = Parser()
+    for size in args.sizes:
+        root = parser.parse(control_source(size))
+        TypeChecker().typecheck(root)
+        ir_generator = IRGen()
+        start = time.perf_counter()
+        ir_generator.generate(root)
+        report("{} statements: IRGen".format(size), time.perf_counter() - start)
+        start = time.perf_counter()
+        cfg = build_cfgs(ir_generator.IR_lst)[0]
+        report("    CFG", time.perf_counter() - start)
+        start = time.perf_counter()
+        cfg.immediate_dominators()
+        report("    dominators", time.perf_counter() - start)
+        start = time.perf_counter()
+        loops = cfg.loops()
+        report("    loops", time.perf_counter() - start)
+        print("{:<40} {:>12d}".format("    blocks", len(cfg.blocks)))
+        print("{:<40} {:>12d}".format("    loops", len(loops)))
+
+
+def bench_dataflow(args):
+    """
+    Liveness, reaching definitions and available expressions of one method
+    of each size, which should grow near-linearly
+    """
+    parser = Parser()
+    for size in args.sizes:
+        root = parser.parse(control_source(size))
+        TypeChecker().typecheck(root)
+        ir_generator = IRGen()
+        ir_generator.generate(root)
+        cfg = build_cfgs(ir_generator.IR_lst)[0]
+        print("{:<40} {:>12d}".format("{} statements: blocks".format(size), len(cfg.blocks)))
+        for label, analysis in (("liveness", Liveness),
+                                ("reaching definitions", ReachingDefinitions),
+                                ("available expressions", AvailableExpressions)):
+            report("    " + label, timed(lambda: analysis(cfg), args.repeat))
+
+
+def stores_source(statements):
+    """
+    Return a class whose single method holds about 'statements' statements,
+    half of them dead stores, some of which shadow the names of live ones
+    """
+    lines = ["public class Stores {", "    public int body(int x) {", "        int y = 0;"]
+    for i in range(statements // 8):
+        lines += ["        int d%d = x * %d;" % (i, i),
+                  "        int e%d = d%d + y;" % (i, i),
+                  "        if (x < %d) {" % i,
+                  "            y = y + x;",
+                  "            int z = y;",
+                  "        } else {",
+                  "            y = y - 1;",
+                  "        }",
+                  "        while (y < %d) {" % i,
+                  "            y = y + 1;",
+                  "            d%d = y;" % i,
+                  "        }"]
+    lines += ["        return y;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_deadcode(args):
+    """
+    Dead code elimination of one method of each size, which should grow
+    near-linearly
+    """
+    parser = Parser()
+    for size in args.sizes:
+        root = parser.parse(stores_source(size))
+        TypeChecker().typecheck(root)
+        eliminator = DeadCodeEliminator()
+        start = time.perf_counter()
+        eliminator.eliminate(root)
+        report("{} statements".format(size), time.perf_counter() - start)
+        print("{:<40} {:>12d}".format("    statements removed", eliminator.removed))
+
+
+def loops_source(loops):
+    """
+    Return a class whose single method runs 'loops' counted loops over the
+    same range, in groups of four that can be fused, separated by
+    statements the next group depends on
+    """
+    lines = ["public class Loops {", "    public int body(int n) {", "        int s = 0;",
+             "        int i = 0;"]
+    for i in range(loops):
+        lines += ["        int a%d = 0;" % i,
+                  "        i = 0;",
+                  "        while (i < n) {",
+                  "            a%d = a%d + %s;" % (i, i, "s + i" if i % 4 == 0 else "i"),
+                  "            i = i + 1;",
+                  "        }"]
+        if i % 4 == 3:
+            lines += ["        s = s + a%d;" % i,
+                      "        for (int j%d = 0; j%d < n; j%d = j%d + 1) {" % ((i,) * 4),
+                      "            s = s + j%d;" % i,
+                      "        }"]
+    lines += ["        return s;", "    }", "}"]
+    return "\n".join(lines)
+
+
+def bench_fusion(args):
+    """
+    Loop fusion of one method of each size, which should grow
+    near-linearly
+    """
+    parser = Parser()
+    for size in args.sizes:
+        root = parser.parse(loops_source(size))
+        TypeChecker().typecheck(root)
+        fuser = LoopFuser()
+        start = time.perf_counter()
+        fuser.fuse(root)
+        report("{} loops".format(size), time.perf_counter() - start)
+        print("{:<40} {:>12d}".format("    loops fused", fuser.fused))
+
+
+# Loops recomputing the same values on every iteration
+INVARIANT_SOURCE = """
+public class Invariants {
+    public int body(int n, int a, int b) {
+        int s = 0;
+        int i = 0;
+        while (i < n * 2) {
+            int k = a * b + a - b;
+            s = s + k + i * (a - b) + (a * a + b * b);
+            i = i + 1;
+        }
+        for (int j = 0; j < n; j = j + 1) {
+            s = s + j * (a + b * 3) - (a - b) * (a + b);
+        }
+        return s;
+    }
+}
+"""
+
+
+def bench_invariants(args):
+    """
+    Run time of the generated Python, with and without loop-invariant code
+    motion
+    """
+    parser = Parser()
+    functions = []
+    for move in (False, True):
+        root = parser.parse(INVARIANT_SOURCE)
+        TypeChecker().typecheck(root)
+        ConstantFolder().fold(root)
+        DeadCodeEliminator().eliminate(root)
+        LoopFuser().fuse(root)
+        if move:
+            mover = LoopInvariantMover()
+            mover.move(root)
+        py_generator = PYGen('Invariants.java')
+        py_generator.generate(root, 0)
+        namespace = {}
+        exec(py_generator.render_py(), namespace)
+        functions.append(namespace['Invariants'].body)
+    print("{:<40} {:>12d}".format("statements moved", mover.hoisted))
+    before, after = functions
+    for size in args.sizes:
+        if before(size, 3, 4) != after(size, 3, 4):
+            raise AssertionError("different results for {} iterations".format(size))
+        report("{} iterations: as written".format(size), timed(lambda: before(size, 3, 4), args.repeat))
+        report("    invariants moved", timed(lambda: after(size, 3, 4), args.repeat))
+
+
+
+# Counting loops in both forms, up and down
+RANGE_SOURCE = """
+public class Ranges {
+    public int body(int n) {
+        int s = 0;
+        int i = 0;
+        while (i <= n) {
+            s = s + i;
+            i = i + 1;
+        }
+        int j = n;
+        while (j >= 0) {
+            s = s - j;
+            j = j - 2;
+        }
+        int k = 0;
+        while (k != n) {
+            s = s + k;
+            k = k + 1;
+        }
+        for (int m = n; m > 0; m = m - 1) {
+            s = s + m;
+        }
+        return s + i + k;
+    }
+}
+"""
+
+
+def bench_ranges(args):
+    """
+    Run time of the generated Python, with counted loops as while loops and
+    as range loops
+    """
+    parser = Parser()
+    functions = []
+    for convert in (False, True):
+        root = parser.parse(RANGE_SOURCE)
+        TypeChecker().typecheck(root)
+        ConstantFolder().fold(root)
+        DeadCodeEliminator().eliminate(root)
+        LoopFuser().fuse(root)
+        LoopInvariantMover().move(root)
+        if convert:
+            converter = RangeLoopConverter()
+            converter.convert(root)
+        py_generator = PYGen('Ranges.java')
+        py_generator.generate(root, 0)
+        namespace = {}
+        exec(py_generator.render_py(), namespace)
+        functions.append(namespace['Ranges'].body)
+    print("{:<40} {:>12d}".format("loops converted", converter.converted))
+    before, after = functions
+    for size in args.sizes:
+        if before(size) != after(size):
+            raise AssertionError("different results for {} iterations".format(size))
+        report("{} iterations: while loops".format(size), timed(lambda: before(size), args.repeat))
+        report("    range loops", timed(lambda: after(size), args.repeat))
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser(description='Benchmarks for the miniJava compiler')
+    argparser.add_argument('-r', '--repeat', type=int, default=5, help="Number of runs, the best one is reported")
+    subparsers = argparser.add_subparsers(dest='bench', required=True)
+    bench = subparsers.add_parser('startup', help="Parser construction cost, cold against warm")
+    bench.set_defaults(func=bench_startup)
+    bench = subparsers.add_parser('scaling', help="Parse time from short to very long methods")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 100000], help="Statement counts")
+    bench.set_defaults(func=bench_scaling)
+    bench = subparsers.add_parser('astcache', help="Parsing against loading the serialized AST")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 100000], help="Statement counts")
+    bench.set_defaults(func=bench_astcache)
+    bench = subparsers.add_parser('memory', help="Bytes per AST node and peak memory while parsing")
+    bench.add_argument('nodes', type=int, nargs='?', default=1000000, help="Approximate number of nodes")
+    bench.set_defaults(func=bench_memory)
+    bench = subparsers.add_parser('traverse', help="Full-tree traversal cost")
+    bench.add_argument('nodes', type=int, nargs='?', default=200000, help="Approximate number of nodes")
+    bench.set_defaults(func=bench_traverse)
+    bench = subparsers.add_parser('dispatch', help="Per-visit handler lookup overhead")
+    bench.add_argument('nodes', type=int, nargs='?', default=200000, help="Approximate number of nodes")
+    bench.set_defaults(func=bench_dispatch)
+    bench = subparsers.add_parser('types', help="Typecheck time and type allocations")
+    bench.add_argument('nodes', type=int, nargs='?', default=200000, help="Approximate number of nodes")
+    bench.set_defaults(func=bench_types)
+    bench = subparsers.add_parser('bodies', help="Serial against parallel typechecking of method bodies")
+    bench.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    bench.add_argument('--methods', type=int, default=1000, help="Number of methods")
+    bench.add_argument('--statements', type=int, default=200, help="Statements per method")
+    bench.set_defaults(func=bench_bodies)
+    bench = subparsers.add_parser('incremental', help="Incremental re-typechecking after small edits")
+    bench.add_argument('--methods', type=int, default=500, help="Number of methods")
+    bench.add_argument('--statements', type=int, default=100, help="Statements per method")
+    bench.set_defaults(func=bench_incremental)
+    bench = subparsers.add_parser('cfg', help="Control-flow graph, dominator and loop construction time")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 50000], help="Statement counts")
+    bench.set_defaults(func=bench_cfg)
+    bench = subparsers.add_parser('dataflow', help="Liveness, reaching definitions and available expressions time")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 4000, 16000], help="Statement counts")
+    bench.set_defaults(func=bench_dataflow)
+    bench = subparsers.add_parser('deadcode', help="Dead code elimination time")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 4000, 16000], help="Statement counts")
+    bench.set_defaults(func=bench_deadcode)
+    bench = subparsers.add_parser('fusion', help="Loop fusion time")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 4000, 16000], help="Loop counts")
+    bench.set_defaults(func=bench_fusion)
+    bench = subparsers.add_parser('invariants', help="Run time of the generated Python with and without loop-invariant code motion")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 100000], help="Loop iterations")
+    bench.set_defaults(func=bench_invariants)
+    bench = subparsers.add_parser('ranges', help="Run time of the generated Python with counted loops as while and as range loops")
+    bench.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 100000], help="Loop iterations")
+    bench.set_defaults(func=bench_ranges)
+    bench = subparsers.add_parser('scopes', help="Symbol lookups from deeply nested scopes")
+    bench.add_argument('depths', type=int, nargs='*', default=[1, 10, 100, 1000], help="Nesting depths")
+    bench.set_defaults(func=bench_scopes)
+    bench = subparsers.add_parser('hierarchy', help="Method lookups through long inheritance chains")
+    bench.add_argument('depths', type=int, nargs='*', default=[1, 10, 100, 1000], help="Inheritance depths")
+    bench.set_defaults(func=bench_hierarchy)
+    bench = subparsers.add_parser('stress', help="Parse, typecheck and generate code for very deep trees")
+    bench.add_argument('--length', type=int, default=50000, help="Operands of the long expression")
+    bench.add_argument('--depth', type=int, default=5000, help="Nesting depth of the blocks")
+    bench.set_defaults(func=bench_stress)
+    args = argparser.parse_args()
+
+    args.func(args)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+import hashlib
+import os
+import sys
+import tempfile
+
+
+class BuildCache(object):
+    """
+    Content-addressed cache of build products, stored as one file per key
+    under 'directory'. Entries are evicted least recently used first once
+    the cache grows past 'max_size' bytes; the modification time of an
+    entry records its last use.
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*parts):
+        """
+        Return the hex digest identifying the given parts, which are either
+        bytes or str
+        """
+        h = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+            h.update(len(part).to_bytes(8, 'little'))
+            h.update(part)
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key):
+        """
+        Return the bytes stored under 'key', or None on a miss
+        """
+        path = self.path(key)
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.misses += 1
+            return None
+        data = f.read()
+        f.close()
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """
+        Store 'data' under 'key'. The entry is written to a temporary file
+        first, so concurrent builds never see a partial entry.
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """
+        Delete the least recently used entries until the cache fits in
+        'max_size' bytes
+        """
+        entries = []
+        total = 0
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        entries.sort()
+        for mtime, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+def compiler_fingerprint(version):
+    """
+    Return a digest of 'version' and of the source of every loaded compiler
+    module (those living next to this file), so that any change to the
+    compiler invalidates cached build products
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    parts = [version]
+    for name, module in sorted(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == here:
+            f = open(path, 'rb')
+            parts.append(name)
+            parts.append(f.read())
+            f.close()
+    return BuildCache.key(*parts)
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+
+import math
+from visitor import Visitor
+from typeSystem import INT, FLOAT, BOOLEAN
+import astJava2Python as ast
+
+# Range of the Java int type; int results outside of it are left to run
+INT_MIN = -2 ** 31
+INT_MAX = 2 ** 31 - 1
+
+# Stands for any call among the names written by a block, since a call may
+# assign any field
+CALL = object()
+
+# Blocks whose written names are recorded by written_names
+WRITE_SCOPES = (ast.DeclWhileStmt, ast.DeclForStmt, ast.StmtList)
+
+
+def literal(node):
+    """
+    Return the Python value of the int, float or boolean literal 'node', or
+    None if 'node' is anything else
+    """
+    if node.__class__ is not ast.Constant:
+        return None
+    resolved_type = node.resolved_type
+    if resolved_type is INT or resolved_type is FLOAT:
+        if node.type.name == 'id':
+            return None
+        return node.value
+    if resolved_type is BOOLEAN and node.type.name == 'boolean':
+        return node.value == 'true'
+    return None
+
+
+def make_constant(value, resolved_type, coord=None):
+    """
+    Return a typechecked Constant node holding the Python value 'value'
+    """
+    if resolved_type is BOOLEAN:
+        node = ast.Constant('boolean', 'true' if value else 'false', coord)
+    else:
+        node = ast.Constant(resolved_type.name, value, coord)
+    node.resolved_type = resolved_type
+    return node
+
+
+def fold_arithmetic(op, left, right, resolved_type):
+    """
+    Return the value of 'left op right' with Java semantics, or None when
+    it must be left to run: int overflow, division by zero, or a float
+    result that is not finite
+    """
+    if resolved_type is INT:
+        if op == '+':
+            value = left + right
+        elif op == '-':
+            value = left - right
+        elif op == '*':
+            value = left * right
+        else:
+            if right == 0:
+                return None
+            # Java int division truncates toward zero
+            value = abs(left) // abs(right)
+            if (left < 0) != (right < 0):
+                value = -value
+        if INT_MIN <= value <= INT_MAX:
+            return value
+        return None
+    if resolved_type is FLOAT:
+        if op == '+':
+            value = left + right
+        elif op == '-':
+            value = left - right
+        elif op == '*':
+            value = left * right
+        else:
+            if right == 0:
+                return None
+            value = left / right
+        if math.isfinite(value):
+            return value
+    return None
+
+
+COMPARISONS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def assigned_name(node):
+    """
+    Return the name the statement 'node' assigns, CALL if it calls a
+    method, or None
+    """
+    cls = node.__class__
+    if cls is ast.AssignStmt or cls is ast.DeclVarStmt or cls is ast.DeclArrayList or \
+            cls is ast.DeclHashMap:
+        return node.name
+    if cls is ast.DeclObjCall:
+        return CALL
+    return None
+
+
+def written_names(root):
+    """
+    Return a dictionary mapping every loop and statement list under 'root'
+    to the set of the names assigned anywhere within it, which holds CALL
+    if it calls a method as well. Walks the tree once, without recursion.
+    """
+    result = {}
+    open_sets = [set()]
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is tuple:
+            # End of a block: its names count for the enclosing one too
+            names = open_sets.pop()
+            result[item[0]] = names
+            open_sets[-1] |= names
+            continue
+        if item.__class__ is list:
+            stack.extend(reversed(item))
+            continue
+        if item is None or item.__class__ is ast.DeclMethodStmt and item is not root:
+            # Methods are folded on their own
+            continue
+        name = assigned_name(item)
+        if name is not None:
+            open_sets[-1].add(name)
+        if item.__class__ is ast.DeclFuncCall:
+            open_sets[-1].add(item.name)
+            open_sets[-1].add(CALL)
+        if item.__class__ in WRITE_SCOPES:
+            open_sets.append(set())
+            stack.append((item,))
+        for field in reversed(item.child_fields):
+            stack.append(getattr(item, field))
+    return result
+
+
+def same_constant(a, b):
+    return a is not None and b is not None and a.resolved_type is b.resolved_type and a.value == b.value
+
+
+def intersect(a, b):
+    """
+    Return the facts holding in both environments 'a' and 'b'
+    """
+    return {name: value for name, value in a.items() if same_constant(b.get(name), value)}
+
+
+class ConstantFolder(Visitor):
+    """
+    Constant folding and propagation over the typechecked AST, run between
+    the TypeChecker and the code generators.
+
+    Operator trees whose operands are all literals are replaced by their
+    value, computed with Java semantics; an int overflow or a division by
+    zero is left for the program to run into. Variables are replaced by
+    their value wherever the last assignment on every path gave them a
+    literal. If statements whose condition becomes a literal are replaced
+    by the branch that runs, and while loops by nothing if they never
+    run.
+
+    The environment 'env' maps names to the Constant they hold. It follows
+    straight-line code and is merged after branches. Loops and try blocks
+    are handled conservatively: whatever they assign anywhere is forgotten
+    before them, and a method call forgets every field, since the callee
+    may assign it. Each method starts with an empty environment, fields
+    being unknown there.
+
+    Statement handlers return a list of statements to put in place of the
+    statement, or anything else to keep it; expression handlers return
+    the expression to put in place of the expression.
+    """
+    prefix = 'fold_'
+    fallback = 'fold_other'
+
+    def __init__(self):
+        # Names local to the method being folded, which calls cannot assign
+        self.locals = frozenset()
+        # See written_names
+        self.writes = {}
+        self.folded = 0
+
+    def fold(self, node):
+        """
+        Fold the tree under 'node' in place
+        """
+        return self.visit(node, {})
+
+    def forget(self, env, names):
+        """
+        Remove from 'env' what a block writing 'names' may change
+        """
+        for name in names:
+            env.pop(name, None)
+        if CALL in names:
+            self.forget_fields(env)
+
+    def forget_fields(self, env):
+        for name in list(env):
+            if name not in self.locals:
+                del env[name]
+
+    def fold_statements(self, stmts, env):
+        """
+        Fold the statement list 'stmts' and return the new list
+        """
+        if not stmts:
+            return stmts
+        result = []
+        for stmt in stmts:
+            if stmt is None or stmt.__class__ is list:
+                # Comments
+                result.append(stmt)
+                continue
+            replacement = yield stmt, env
+            if replacement.__class__ is list:
+                result.extend(replacement)
+            else:
+                result.append(stmt)
+        return result
+
+    def fold_other(self, node, env):
+        return node
+
+    ################################
+    ## Declarations
+    ################################
+
+    def fold_Program(self, node, env):
+        if node.class_decl is not None:
+            for c in node.class_decl:
+                if c.__class__ is list:
+                    continue
+                yield c, {}
+
+    def fold_DeclClassStmt(self, node, env):
+        self.writes = written_names(node)
+        self.locals = frozenset()
+        node.stmt_list = yield from self.fold_statements(node.stmt_list, env)
+
+    def fold_DeclMethodStmt(self, node, env):
+        outer_locals, outer_writes = self.locals, self.writes
+        self.locals = frozenset(ast.local_names(node))
+        self.writes = written_names(node)
+        method_env = {}
+        yield node.body, method_env
+        yield node.ret_stmt, method_env
+        self.locals, self.writes = outer_locals, outer_writes
+
+    ################################
+    ## Statements
+    ################################
+
+    def fold_StmtList(self, node, env):
+        node.stmt_lst = yield from self.fold_statements(node.stmt_lst, env)
+
+    def fold_DeclVarStmt(self, node, env):
+        if node.expr is not None:
+            node.expr = yield node.expr, env
+            value = node.expr if literal(node.expr) is not None else None
+        elif node.resolved_type in (INT, FLOAT, BOOLEAN):
+            # Declared without a value: the default of the type
+            value = make_constant({INT: 0, FLOAT: 0.0, BOOLEAN: False}[node.resolved_type],
+                                  node.resolved_type)
+        else:
+            value = None
+        if value is not None:
+            env[node.name] = value
+        else:
+            env.pop(node.name, None)
+
+    def fold_AssignStmt(self, node, env):
+        node.expr = yield node.expr, env
+        if literal(node.expr) is not None and not node.this:
+            env[node.name] = node.expr
+        else:
+            env.pop(node.name, None)
+
+    def fold_call_params(self, func_param, env):
+        for param in func_param.func_params or []:
+            param.expr = yield param.expr, env
+
+    def fold_DeclFuncCall(self, node, env):
+        yield from self.fold_call_params(node.func_param, env)
+        self.forget_fields(env)
+        env.pop(node.name, None)
+
+    def fold_DeclObjCall(self, node, env):
+        yield from self.fold_call_params(node.func_param, env)
+        self.forget_fields(env)
+
+    def fold_DeclObjAddCall(self, node, env):
+        node.expr = yield node.expr, env
+
+    fold_DeclObjRemoveCall = fold_DeclObjAddCall
+
+    def fold_DeclObjPutCall(self, node, env):
+        node.expr1 = yield node.expr1, env
+        node.expr2 = yield node.expr2, env
+
+    def fold_DeclArrayList(self, node, env):
+        env.pop(node.name, None)
+
+    fold_DeclHashMap = fold_DeclArrayList
+
+    def fold_DeclPrintStmt(self, node, env):
+        node.expr = yield node.expr, env
+
+    def fold_DeclRetStmt(self, node, env):
+        if node.expr is not None:
+            node.expr = yield node.expr, env
+
+    def fold_DeclIfStmt(self, node, env):
+        node.if_cond = yield node.if_cond, env
+        cond = literal(node.if_cond)
+        if cond is not None:
+            self.folded += 1
+            if cond:
+                return (yield from self.fold_branch(node.if_body, env))
+            if node.elif_cond is None:
+                return (yield from self.fold_branch(node.else_body, env))
+            # Only the else-if part is left
+            node.if_cond, node.if_body = node.elif_cond, node.elif_body
+            node.elif_cond = node.elif_body = None
+            return (yield from self.fold_DeclIfStmt(node, env))
+
+        if node.elif_cond is not None:
+            # The else-if condition is only evaluated if the first is false
+            node.elif_cond = yield node.elif_cond, env
+            cond = literal(node.elif_cond)
+            if cond is not None:
+                self.folded += 1
+                if cond:
+                    node.else_body = node.elif_body
+                node.elif_cond = node.elif_body = None
+
+        branches = [node.if_body, node.elif_body, node.else_body] if node.elif_cond is not None \
+            else [node.if_body, node.else_body]
+        merged = None
+        for body in branches:
+            branch_env = dict(env)
+            if body is not None:
+                yield body, branch_env
+            merged = branch_env if merged is None else intersect(merged, branch_env)
+        env.clear()
+        env.update(merged)
+
+    def fold_branch(self, body, env):
+        """
+        Fold 'body', the branch of an if statement that always runs, and
+        return its statements to put in place of the if statement
+        """
+        if body is None or not body.stmt_lst:
+            return []
+        yield body, env
+        return body.stmt_lst
+
+    def fold_DeclWhileStmt(self, node, env):
+        self.forget(env, self.writes[node])
+        node.cond = yield node.cond, env
+        if literal(node.cond) is False:
+            self.folded += 1
+            return []
+        yield node.body, dict(env)
+
+    def fold_DeclForStmt(self, node, env):
+        yield node.var_assign, env
+        self.forget(env, self.writes[node])
+        node.cond = yield node.cond, env
+        if literal(node.cond) is False:
+            # Only the initialization runs
+            self.folded += 1
+            return [node.var_assign]
+        body_env = dict(env)
+        yield node.body, body_env
+        yield node.cond_update, body_env
+
+    def fold_DeclTryStmt(self, node, env):
+        # The catch block may start after any statement of the try block
+        catch_env = dict(env)
+        self.forget(catch_env, self.writes[node.try_stmt_list])
+        yield node.try_stmt_list, env
+        if node.catch_stmt_list is not None:
+            yield node.catch_stmt_list, catch_env
+        merged = intersect(env, catch_env)
+        env.clear()
+        env.update(merged)
+        if node.finally_stmt_list is not None:
+            yield node.finally_stmt_list, env
+
+    ################################
+    ## Expressions
+    ################################
+
+    def fold_Constant(self, node, env):
+        if node.type.name == 'id':
+            value = env.get(node.value)
+            if value is not None:
+                self.folded += 1
+                return make_constant(literal(value), value.resolved_type, node.coord)
+        return node
+
+    def fold_BinOp(self, node, env):
+        node.left = yield node.left, env
+        node.right = yield node.right, env
+        left, right = literal(node.left), literal(node.right)
+        if left is None or right is None:
+            return node
+        value = fold_arithmetic(node.op, left, right, node.resolved_type)
+        if value is None:
+            return node
+        self.folded += 1
+        return make_constant(value, node.resolved_type, node.coord)
+
+    def fold_CompareOp(self, node, env):
+        node.left = yield node.left, env
+        node.right = yield node.right, env
+        left, right = literal(node.left), literal(node.right)
+        if left is None or right is None:
+            return node
+        self.folded += 1
+        return make_constant(COMPARISONS[node.op](left, right), BOOLEAN, node.coord)
+
+    def fold_LogicOp(self, node, env):
+        node.left = yield node.left, env
+        left = literal(node.left)
+        if left is not None:
+            # The right operand only runs if the left one does not decide
+            self.folded += 1
+            if left == (node.op == '||'):
+                return node.left
+            return (yield node.right, env)
+        node.right = yield node.right, env
+        right = literal(node.right)
+        if right is not None and right == (node.op == '&&'):
+            # 'x && true' and 'x || false' are 'x'
+            self.folded += 1
+            return node.left
+        return node
+
+    def fold_UnaryOp(self, node, env):
+        node.expr = yield node.expr, env
+        value = literal(node.expr)
+        if value is None:
+            return node
+        if node.op == '!':
+            self.folded += 1
+            return make_constant(not value, BOOLEAN, node.coord)
+        value = -value
+        if node.resolved_type is INT and not INT_MIN <= value <= INT_MAX:
+            return node
+        self.folded += 1
+        return make_constant(value, node.resolved_type, node.coord)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+
+import heapq
+from IR import Opcode, CALLS, definition, uses
+
+def solve(cfg, gen, kill, forward=True, may=True, boundary=0, universe=0):
+    """
+    Solve a bit-vector dataflow problem over 'cfg' and return the
+    (top, bottom) pair of lists of the values at the top and at the bottom
+    of each block, as Python ints used as bit sets.
+
+    'gen' and 'kill' are the per-block bit sets of the transfer function
+    'out = gen | (in & ~kill)'. Values flow from the entry towards the exit
+    if 'forward', from the exit towards the entry otherwise, and are joined
+    by union if 'may', by intersection otherwise. 'boundary' is the value
+    entering the entry (or the exit) block, and 'universe' the set of every
+    bit, from which intersections start.
+
+    The worklist always hands out the pending block that comes first in
+    reverse postorder (last, for backward problems), so that a change only
+    travels further once the loop it came from has settled: acyclic code
+    takes a single pass, and each loop as many as its nesting depth.
+    """
+    blocks = cfg.blocks
+    count = len(blocks)
+    order = cfg.reverse_postorder()
+    if len(order) < count:
+        # Blocks unreachable from the entry still get a value
+        reached = set(order)
+        order.extend(index for index in range(count) if index not in reached)
+    if forward:
+        start = 0
+        sources = [block.preds for block in blocks]
+        targets = [block.succs for block in blocks]
+    else:
+        order.reverse()
+        start = count - 1
+        sources = [block.succs for block in blocks]
+        targets = [block.preds for block in blocks]
+
+    position = [0] * count
+    for i, index in enumerate(order):
+        position[index] = i
+
+    top = 0 if may else universe
+    values_in = [top] * count
+    values_out = [gen[index] | (top & ~kill[index]) for index in range(count)]
+    # Heap of the positions of the pending blocks
+    worklist = list(range(count))
+    queued = [True] * count
+    while worklist:
+        index = order[heapq.heappop(worklist)]
+        queued[index] = False
+        preds = sources[index]
+        if index == start or not preds:
+            value = boundary
+            for pred in preds:
+                value = value | values_out[pred] if may else value & values_out[pred]
+        else:
+            value = values_out[preds[0]]
+            if may:
+                for pred in preds:
+                    value |= values_out[pred]
+            else:
+                for pred in preds:
+                    value &= values_out[pred]
+        values_in[index] = value
+        out = gen[index] | (value & ~kill[index])
+        if out != values_out[index]:
+            values_out[index] = out
+            for succ in targets[index]:
+                if not queued[succ]:
+                    queued[succ] = True
+                    heapq.heappush(worklist, position[succ])
+    if forward:
+        return values_in, values_out
+    return values_out, values_in
+
+
+def bit_set(numbers, size):
+    """
+    Return the bit set of the bit 'numbers', all below 'size', in time
+    linear in 'size' rather than quadratic in the number of bits
+    """
+    data = bytearray((size + 7) // 8)
+    for number in numbers:
+        data[number >> 3] |= 1 << (number & 7)
+    return int.from_bytes(data, 'little')
+
+
+class Numbering(object):
+    """
+    Gives consecutive bit numbers to the values of an analysis (variable
+    names, definitions, expressions) and converts bit sets back to values
+    """
+
+    def __init__(self):
+        self.bits = {}
+        self.values = []
+
+    def bit(self, value):
+        """
+        Return the bit set holding only 'value', numbering it if needed
+        """
+        number = self.bits.get(value)
+        if number is None:
+            number = self.bits[value] = len(self.values)
+            self.values.append(value)
+        return 1 << number
+
+    def decode(self, bits):
+        """
+        Return the list of the values in the bit set 'bits'
+        """
+        values = self.values
+        result = []
+        while bits:
+            # Lowest bit set, so that sparse sets take few steps
+            low = bits & -bits
+            result.append(values[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    @property
+    def universe(self):
+        return (1 << len(self.values)) - 1
+
+
+class Liveness(object):
+    """
+    Live variables of a CFG: the variables and temporaries whose current
+    value may still be read.
+
+    'fields' are the names the code shares with the rest of the program
+    (the fields of its class): they are live at the exit and read by every
+    call.
+    """
+
+    def __init__(self, cfg, fields=()):
+        self.cfg = cfg
+        self.names = names = Numbering()
+        self.field_bits = 0
+        for name in fields:
+            self.field_bits |= names.bit(name)
+        self.uses = []
+        self.defs = []
+        for block in cfg.blocks:
+            used = defined = 0
+            for instr in reversed(block.instrs):
+                kill, gen = self.transfer(instr)
+                used = (used & ~kill) | gen
+                defined = (defined | kill) & ~gen
+            self.uses.append(used)
+            self.defs.append(defined)
+        self.live_in, self.live_out = solve(cfg, self.uses, self.defs, forward=False,
+                                            boundary=self.field_bits)
+
+    def transfer(self, instr):
+        """
+        Return the (kill, gen) bit sets of 'instr': what it writes and what
+        it reads
+        """
+        names = self.names
+        name = definition(instr)
+        kill = names.bit(name) if name is not None else 0
+        gen = 0
+        for name in uses(instr):
+            gen |= names.bit(name)
+        if instr.opcode in CALLS:
+            gen |= self.field_bits
+        return kill, gen
+
+    def live_after(self, index):
+        """
+        Return the list of the bit sets of the names live right after each
+        instruction of block 'index'
+        """
+        instrs = self.cfg.blocks[index].instrs
+        live = self.live_out[index]
+        result = [0] * len(instrs)
+        for i in range(len(instrs) - 1, -1, -1):
+            result[i] = live
+            kill, gen = self.transfer(instrs[i])
+            live = (live & ~kill) | gen
+        return result
+
+    def is_live(self, bits, name):
+        """
+        Whether 'name' is in the bit set 'bits'
+        """
+        number = self.names.bits.get(name)
+        return number is not None and bits >> number & 1 == 1
+
+    def live_names(self, bits):
+        return set(self.names.decode(bits))
+
+
+class ReachingDefinitions(object):
+    """
+    Reaching definitions of a CFG: the instructions whose assignment may
+    still be the current value of their variable.
+
+    Each definition is a (block index, position, name) triple. Assignments
+    to 'this.x' and calls, which may assign 'fields', are ambiguous: they
+    add a definition without removing the earlier ones.
+    """
+
+    def __init__(self, cfg, fields=()):
+        self.cfg = cfg
+        self.fields = tuple(fields)
+        self.definitions = definitions = Numbering()
+        numbers = {}
+        block_defs = []
+        for block in cfg.blocks:
+            found = []
+            for position, instr in enumerate(block.instrs):
+                for name, ambiguous in self.defined(instr):
+                    number = len(definitions.values)
+                    definitions.bit((block.index, position, name))
+                    numbers.setdefault(name, []).append(number)
+                    found.append((number, name, ambiguous))
+            block_defs.append(found)
+        # Bit set of all the definitions of each name
+        size = len(definitions.values)
+        self.of_name = of_name = {name: bit_set(found, size) for name, found in numbers.items()}
+
+        # A block generates the last plain definition of each name and the
+        # ambiguous ones after it, and kills every other definition of the
+        # names it defines plainly
+        self.gen = []
+        self.kill = []
+        for found in block_defs:
+            gen = 0
+            killed = set()
+            for number, name, ambiguous in reversed(found):
+                if name not in killed:
+                    gen |= 1 << number
+                    if not ambiguous:
+                        killed.add(name)
+            kill = 0
+            for name in killed:
+                kill |= of_name[name]
+            self.gen.append(gen)
+            self.kill.append(kill & ~gen)
+        self.reach_in, self.reach_out = solve(cfg, self.gen, self.kill)
+
+    def defined(self, instr):
+        """
+        Return the (name, ambiguous) pairs of what 'instr' assigns
+        """
+        name = definition(instr)
+        if name is not None:
+            return ((name, False),)
+        if instr.opcode is Opcode.SET_FIELD:
+            return ((instr.dst, True),)
+        if instr.opcode in CALLS:
+            return tuple((field, True) for field in self.fields)
+        return ()
+
+    def reaching(self, bits, name):
+        """
+        Return the (block index, position, name) definitions of 'name' in
+        the bit set 'bits'
+        """
+        return self.definitions.decode(bits & self.of_name.get(name, 0))
+
+    def reaching_before(self, index):
+        """
+        Return the list of the bit sets of the definitions reaching each
+        instruction of block 'index'
+        """
+        instrs = self.cfg.blocks[index].instrs
+        bits = self.reach_in[index]
+        result = []
+        definitions = self.definitions.bits
+        for position, instr in enumerate(instrs):
+            result.append(bits)
+            for name, ambiguous in self.defined(instr):
+                if not ambiguous:
+                    bits &= ~self.of_name[name]
+                bits |= 1 << definitions[(index, position, name)]
+        return result
+
+
+class AvailableExpressions(object):
+    """
+    Available expressions of a CFG: the operations 'a op b' and 'op a'
+    computed on every path to a point, with no operand assigned since, and
+    so still held in the temporary or variable they were assigned to.
+
+    Expressions are (op, a, b) triples, 'b' being None for unary
+    operations and constants compared by their text.
+    """
+
+    def __init__(self, cfg, fields=()):
+        self.cfg = cfg
+        self.fields = tuple(fields)
+        self.expressions = expressions = Numbering()
+        # Bit set of the expressions reading each name
+        self.reading = {}
+        for block in cfg.blocks:
+            for instr in block.instrs:
+                key = self.expression(instr)
+                if key is not None:
+                    bit = expressions.bit(key)
+                    for name in uses(instr):
+                        self.reading[name] = self.reading.get(name, 0) | bit
+
+        self.gen = []
+        self.kill = []
+        for block in cfg.blocks:
+            gen = kill = 0
+            for instr in block.instrs:
+                computed, killed = self.transfer(instr)
+                gen = (gen | computed) & ~killed
+                kill = (kill | killed) & ~computed
+            self.gen.append(gen)
+            self.kill.append(kill)
+        self.avail_in, self.avail_out = solve(cfg, self.gen, self.kill, may=False,
+                                              universe=expressions.universe)
+
+    @staticmethod
+    def expression(instr):
+        """
+        Return the expression key of the operation 'instr' computes, or
+        None
+        """
+        opcode = instr.opcode
+        if opcode is Opcode.BINARY:
+            return (instr.op, str(instr.a), str(instr.b))
+        if opcode is Opcode.UNARY:
+            return (instr.op, str(instr.a), None)
+        return None
+
+    def transfer(self, instr):
+        """
+        Return the (computed, killed) bit sets of 'instr'
+        """
+        computed = 0
+        key = self.expression(instr)
+        if key is not None:
+            computed = self.expressions.bit(key)
+        killed = 0
+        name = definition(instr)
+        if name is not None:
+            killed = self.reading.get(name, 0)
+        elif instr.opcode is Opcode.SET_FIELD:
+            killed = self.reading.get(instr.dst, 0)
+        elif instr.opcode in CALLS:
+            for field in self.fields:
+                killed |= self.reading.get(field, 0)
+        # 'x := x + 1' computes the expression, then kills it
+        return computed & ~killed, killed
+
+    def available_before(self, index):
+        """
+        Return the list of the bit sets of the expressions available right
+        before each instruction of block 'index'
+        """
+        bits = self.avail_in[index]
+        result = []
+        for instr in self.cfg.blocks[index].instrs:
+            result.append(bits)
+            computed, killed = self.transfer(instr)
+            bits = (bits & ~killed) | computed
+        return result
+
+    def available(self, bits):
+        return self.expressions.decode(bits)
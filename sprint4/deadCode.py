@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+from IRGen import IRGen
+from IR import Opcode, Const, CALLS, definition, uses, is_temporary
+from CFG import build_cfgs
+from dataflow import ReachingDefinitions
+import astJava2Python as ast
+
+# Statements whose only effect is the variable they assign
+STORES = (ast.DeclVarStmt, ast.AssignStmt, ast.DeclArrayList, ast.DeclHashMap)
+
+# Statements that can go once their bodies are empty
+BRANCHING = (ast.DeclForStmt, ast.DeclIfStmt)
+
+# Classes whose constructor runs no user code
+BUILTIN_CLASSES = ('ArrayList', 'HashMap')
+
+# Instructions that only move control around
+CONTROL = frozenset((Opcode.LABEL, Opcode.JUMP, Opcode.BRANCH_FALSE, Opcode.BEGIN_LOOP))
+
+
+def is_pure(instr):
+    """
+    Whether 'instr' does nothing but compute the value it assigns: it cannot
+    raise, print or run user code
+    """
+    opcode = instr.opcode
+    if opcode is Opcode.COPY or opcode is Opcode.UNARY:
+        return True
+    if opcode is Opcode.BINARY:
+        # Division by zero raises
+        return instr.op != '/' or (instr.b.__class__ is Const and instr.b.value != 0)
+    if opcode is Opcode.NEW:
+        return instr.a in BUILTIN_CLASSES
+    return False
+
+
+def is_empty(body):
+    """
+    Whether the StmtList 'body' holds no statement, comments aside
+    """
+    if body is None or not body.stmt_lst:
+        return True
+    for stmt in body.stmt_lst:
+        if stmt is not None and stmt.__class__ is not list:
+            return False
+    return True
+
+
+def bodies(stmt):
+    if stmt.__class__ is ast.DeclForStmt:
+        return (stmt.body,)
+    return (stmt.if_body, stmt.elif_body, stmt.else_body)
+
+
+class DeadCodeEliminator(object):
+    """
+    Dead code elimination over the typechecked AST, run after the
+    ConstantFolder.
+
+    The tree is translated to IR, and the useful instructions of the CFG of
+    each method and class are marked: first those with an effect besides
+    the value they assign (calls, prints, returns, branches, field stores),
+    then, following the def-use chains given by the reaching definitions,
+    every assignment whose value a useful instruction may read. Assignments
+    and declarations with no useful instruction are dead stores, and are
+    removed from the tree, as are the statements that cannot be reached.
+    For and if statements left with empty bodies go as well, after which
+    the whole is done again, as their conditions may have been the last
+    readers of a variable.
+
+    Fields are read by every call, at the end of every method, and at the
+    end of the field initializers of their class if any other code reads
+    them.
+    """
+
+    def __init__(self):
+        self.removed = 0
+
+    def eliminate(self, root):
+        """
+        Remove the dead code of the Program 'root' in place
+        """
+        while True:
+            generator = IRGen()
+            generator.generate(root)
+            dead, pure = self.dead_statements(build_cfgs(generator.IR_lst))
+            if not self.sweep(root, dead, pure):
+                return
+
+    def dead_statements(self, cfgs):
+        """
+        Return the set of the dead statements of the CFGs 'cfgs', and the set
+        of the statements whose own instructions have no effect
+        """
+        reads = []
+        defines = []
+        scopes = []
+        # Number of CFGs reading each field, and the fields methods read
+        readers = {}
+        method_reads = set()
+        for cfg in cfgs:
+            read = set()
+            defined = set()
+            for block in cfg.blocks:
+                for instr in block.instrs:
+                    read.update(uses(instr))
+                    name = definition(instr)
+                    if name is not None:
+                        defined.add(name)
+            owner = cfg.entry.instrs[0].origin
+            if owner.__class__ is ast.DeclMethodStmt:
+                local = ast.local_names(owner)
+                shared = {name for name in read if name not in local}
+                method_reads |= shared
+            else:
+                local = ()
+                shared = read
+            for name in shared:
+                readers[name] = readers.get(name, 0) + 1
+            reads.append(read)
+            defines.append(defined)
+            scopes.append(local)
+
+        dead = set()
+        pure = set()
+        for cfg, read, defined, local in zip(cfgs, reads, defines, scopes):
+            if cfg.entry.instrs[0].origin.__class__ is ast.DeclMethodStmt:
+                fields = {name for name in read | defined
+                          if name not in local and not is_temporary(name)}
+                exit_reads = fields
+            else:
+                fields = {name for name in defined if not is_temporary(name)}
+                exit_reads = [name for name in fields if readers.get(name, 0) > (name in read)]
+            # A call only reads the fields some method reads
+            call_reads = [name for name in fields if name in method_reads]
+            self.sweep_cfg(cfg, fields, call_reads, exit_reads, dead, pure)
+        return dead, pure
+
+    def sweep_cfg(self, cfg, fields, call_reads, exit_reads, dead, pure):
+        """
+        Mark the useful instructions of 'cfg', and add its dead statements
+        to 'dead' and those without effect to 'pure'. Calls may assign the
+        names in 'fields' and read those in 'call_reads', and the names in
+        'exit_reads' are read after the code of 'cfg'.
+        """
+        blocks = cfg.blocks
+        reached = cfg.reverse_postorder()
+
+        # Statements that only assign a variable
+        candidates = set()
+        impure = set()
+        for index in reached:
+            for instr in blocks[index].instrs:
+                origin = instr.origin
+                if is_pure(instr):
+                    if origin.__class__ in STORES:
+                        candidates.add(origin)
+                elif instr.opcode not in CONTROL:
+                    impure.add(origin)
+        candidates -= impure
+
+        chains = ReachingDefinitions(cfg, fields)
+        # Per block, the definitions in the block each instruction reads, and
+        # the names it reads that the block does not define before it
+        reading = {}
+        useful = set()
+        stack = []
+        for index in reached:
+            for position, instr in enumerate(blocks[index].instrs):
+                if instr.origin not in candidates:
+                    useful.add((index, position))
+                    stack.append((index, position))
+        exit_index = len(blocks) - 1
+        for name in exit_reads:
+            for index, position, _ in chains.reaching(chains.reach_in[exit_index], name):
+                if (index, position) not in useful:
+                    useful.add((index, position))
+                    stack.append((index, position))
+
+        while stack:
+            index, position = stack.pop()
+            deps = reading.get(index)
+            if deps is None:
+                deps = reading[index] = self.block_reads(blocks[index], call_reads)
+            local, exposed = deps[position]
+            found = [(index, p) for p in local]
+            for name in exposed:
+                for def_index, def_position, _ in chains.reaching(chains.reach_in[index], name):
+                    found.append((def_index, def_position))
+            for instr_id in found:
+                if instr_id not in useful:
+                    useful.add(instr_id)
+                    stack.append(instr_id)
+
+        live = set()
+        reachable = set()
+        for index in reached:
+            for position, instr in enumerate(blocks[index].instrs):
+                reachable.add(instr.origin)
+                if (index, position) in useful:
+                    live.add(instr.origin)
+        for block in blocks:
+            for instr in block.instrs:
+                origin = instr.origin
+                if origin.__class__ is ast.DeclMethodStmt:
+                    continue
+                if origin not in reachable or (origin in candidates and origin not in live):
+                    dead.add(origin)
+        pure.update(origin for origin in reachable if origin not in impure)
+
+    @staticmethod
+    def block_reads(block, call_reads):
+        """
+        Return, for each instruction of 'block', the positions of the
+        definitions of the block it reads and the names it reads that are
+        not defined before it in the block
+        """
+        last = {}
+        result = []
+        for position, instr in enumerate(block.instrs):
+            names = uses(instr)
+            if instr.opcode in CALLS:
+                names = list(names) + call_reads
+            local = []
+            exposed = []
+            for name in names:
+                found = last.get(name)
+                if found is None:
+                    exposed.append(name)
+                else:
+                    local.append(found)
+            result.append((local, exposed))
+            name = definition(instr)
+            if name is not None:
+                last[name] = position
+        return result
+
+    def sweep(self, root, dead, pure):
+        """
+        Remove the statements in 'dead' from the tree under 'root', then the
+        for and if statements in 'pure' left with empty bodies. Returns
+        whether any of the latter was removed.
+        """
+        lists = [node for node in ast.walk(root)
+                 if node.__class__ is ast.StmtList or node.__class__ is ast.DeclClassStmt]
+        emptied = False
+        # Inner statement lists come later in preorder, and are done first
+        for node in reversed(lists):
+            stmts = node.stmt_lst if node.__class__ is ast.StmtList else node.stmt_list
+            if not stmts:
+                continue
+            kept = []
+            for stmt in stmts:
+                if stmt is not None and stmt.__class__ is not list:
+                    if stmt in dead:
+                        self.removed += 1
+                        continue
+                    if stmt.__class__ in BRANCHING and stmt in pure and \
+                            all(is_empty(body) for body in bodies(stmt)):
+                        self.removed += 1
+                        emptied = True
+                        continue
+                kept.append(stmt)
+            if node.__class__ is ast.StmtList:
+                node.stmt_lst = kept
+            else:
+                node.stmt_list = kept
+        return emptied
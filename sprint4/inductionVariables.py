@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+from IRGen import IRGen
+from IR import Opcode, definition, uses, is_temporary
+from CFG import build_cfgs
+from dataflow import Liveness
+from loopFusion import LoopFuser, Effects, FLIPPED, expression_key, is_variable, statements
+from typeSystem import INT
+import astJava2Python as ast
+
+LOOPS = (ast.DeclWhileStmt, ast.DeclForStmt)
+
+
+class RangeLoopConverter(object):
+    """
+    Induction-variable analysis, run last among the optimizations: counted
+    while and for loops become DeclRangeStmt loops over 'range()'.
+
+    A loop is counted when its condition compares an int variable with a
+    bound, the last statement of its body (the update of a for loop) adds
+    an int literal to the variable, and nothing else in the body assigns
+    the variable or what the bound reads. Calls may assign fields, so a
+    body with a call only qualifies if the variable and the bound are
+    local. The bound is then computed once. The comparison must agree with
+    the sign of the step:
+
+    - 'i < n' and 'i <= n' with a positive step, 'i > n' and 'i >= n' with
+      a negative one, the last two ending at 'n + 1' and 'n - 1';
+    - 'i != n' with a step of 1 or -1, when the variable starts from an
+      int literal and 'n' is one it counts up (or down) to. Otherwise the
+      variable could start past the bound, and the Java loop would go on.
+
+    A while loop starts from the value of its variable, and a for loop
+    from its initial value. Unlike the Java loop, a range loop leaves the
+    variable at its last value in the range. When the variable is live
+    where the loop ends, the step must be 1 or -1, and the variable is
+    moved up to the bound after the loop. A loop with nothing left in its
+    body is reduced to that, or removed if the variable is dead.
+    """
+
+    def __init__(self):
+        self.converted = 0
+
+    def convert(self, root):
+        """
+        Turn the counted loops of the Program 'root' into range loops, in
+        place
+        """
+        generator = IRGen()
+        generator.generate(root)
+        # Per loop, whether a name is live where the loop ends
+        self.live_after = {}
+        for cfg in build_cfgs(generator.IR_lst):
+            self.find_exits(cfg)
+
+        stack = [(root, ())]
+        while stack:
+            node, local = stack.pop()
+            if node.__class__ is list:
+                stack.extend((item, local) for item in node)
+                continue
+            if node is None:
+                continue
+            cls = node.__class__
+            if cls is ast.DeclMethodStmt:
+                local = ast.local_names(node)
+            elif cls is ast.StmtList:
+                if node.stmt_lst:
+                    node.stmt_lst = self.convert_list(node.stmt_lst, local)
+            elif cls is ast.DeclClassStmt:
+                if node.stmt_list:
+                    node.stmt_list = self.convert_list(node.stmt_list, local)
+            for field in node.child_fields:
+                stack.append((getattr(node, field), local))
+
+    def find_exits(self, cfg):
+        """
+        Record how to tell the names live where each loop of 'cfg' ends
+        """
+        blocks = cfg.blocks
+        owner = cfg.entry.instrs[0].origin
+        read = set()
+        defined = set()
+        # The labels starting each loop: its condition, then its end
+        labels = {}
+        for block in blocks:
+            for instr in block.instrs:
+                read.update(uses(instr))
+                name = definition(instr)
+                if name is not None:
+                    defined.add(name)
+            first = block.instrs[0]
+            if first.opcode is Opcode.LABEL and first.origin.__class__ in LOOPS:
+                labels.setdefault(first.origin, []).append(block.index)
+        if not labels:
+            return
+        if owner.__class__ is ast.DeclMethodStmt:
+            local = ast.local_names(owner)
+            fields = {name for name in read | defined if name not in local and not is_temporary(name)}
+        else:
+            fields = {name for name in defined if not is_temporary(name)}
+        liveness = Liveness(cfg, fields)
+        for loop, indexes in labels.items():
+            if len(indexes) == 2:
+                self.live_after[loop] = (liveness, liveness.live_in[indexes[1]])
+
+    def convert_list(self, stmts, local):
+        """
+        Return the statement list 'stmts' with its counted loops converted.
+        The names in 'local' are local to the method, if any.
+        """
+        result = []
+        for stmt in stmts:
+            if stmt is not None and stmt.__class__ in LOOPS:
+                converted = self.range_loop(stmt, local)
+                if converted is not None:
+                    if stmt.__class__ is ast.DeclForStmt:
+                        result.append(stmt.var_assign)
+                    self.converted += 1
+                    if converted.body is None and not converted.settle:
+                        continue
+                    stmt = converted
+            result.append(stmt)
+        return result
+
+    def range_loop(self, loop, local):
+        """
+        Return the DeclRangeStmt running the iterations of 'loop', or None if
+        it is not a counted loop
+        """
+        if loop.__class__ is ast.DeclWhileStmt:
+            body = statements(loop.body)
+            update = None
+            for item in reversed(body):
+                if item is not None and item.__class__ is not list:
+                    update = item
+                    break
+            if update is None:
+                return None
+            var, step = LoopFuser.step(update)
+            if var is None:
+                return None
+            start = self.variable(var, loop.coord)
+            rest = [item for item in body if item is not update]
+        else:
+            var, step = LoopFuser.step(loop.cond_update)
+            init = loop.var_assign
+            if var is None or var != init.name or init.expr is None:
+                return None
+            # The initial assignment stays before the range loop
+            start = init.expr
+            if start.__class__ is not ast.Constant:
+                start = self.variable(var, loop.coord)
+            rest = statements(loop.body)
+
+        cond = loop.cond
+        if cond.__class__ is not ast.CompareOp:
+            return None
+        if is_variable(cond.left, var):
+            var_ref, op, bound = cond.left, cond.op, cond.right
+        elif is_variable(cond.right, var):
+            var_ref, op, bound = cond.right, FLIPPED[cond.op], cond.left
+        else:
+            return None
+        if var_ref.resolved_type is not INT or bound.resolved_type is not INT:
+            return None
+        if loop.__class__ is ast.DeclForStmt and init.expr.resolved_type is not INT:
+            return None
+        if expression_key(bound) is None:
+            return None
+        fixed = Effects().add(bound).reads
+        body_effects = Effects().add(rest)
+        if var in fixed or var in body_effects.writes or fixed & body_effects.writes:
+            return None
+        if body_effects.barrier and (var not in local or not fixed.issubset(local)):
+            return None
+
+        if op == '<' and step > 0 or op == '>' and step < 0:
+            stop = bound
+        elif op == '!=' and self.reaches(start, bound, step):
+            stop = bound
+        elif op == '<=' and step > 0:
+            stop = self.offset(bound, 1)
+        elif op == '>=' and step < 0:
+            stop = self.offset(bound, -1)
+        else:
+            return None
+
+        found = self.live_after.get(loop)
+        if found is None:
+            return None
+        liveness, bits = found
+        settle = liveness.is_live(bits, var)
+        if settle and step not in (1, -1):
+            return None
+
+        if all(item is None or item.__class__ is list for item in rest):
+            # Only the value the variable ends with is left of the loop
+            body = None
+        else:
+            body = loop.body
+            body.stmt_lst = rest
+        return ast.DeclRangeStmt(var, start, stop, step, body, settle, loop.coord)
+
+    @staticmethod
+    def reaches(start, bound, step):
+        """
+        Whether counting from 'start' by 'step', of 1 or -1, surely meets
+        'bound'. Both must be int literals.
+        """
+        if step not in (1, -1):
+            return False
+        for expr in (start, bound):
+            if expr.__class__ is not ast.Constant or expr.type.name != 'int':
+                return False
+        return (bound.value - start.value) * step >= 0
+
+    @staticmethod
+    def variable(name, coord):
+        constant = ast.Constant('id', name, coord)
+        constant.resolved_type = INT
+        return constant
+
+    @staticmethod
+    def offset(bound, amount):
+        """
+        Return the expression 'bound + amount'
+        """
+        if bound.__class__ is ast.Constant and bound.type.name == 'int':
+            expr = ast.Constant('int', bound.value + amount, bound.coord)
+        else:
+            op = '+' if amount > 0 else '-'
+            expr = ast.BinOp(op, bound, ast.Constant('int', abs(amount), bound.coord), bound.coord)
+        expr.resolved_type = INT
+        if expr.__class__ is ast.BinOp:
+            expr.right.resolved_type = INT
+        return expr
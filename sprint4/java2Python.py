@@ -1,57 +1,321 @@
 #!/usr/bin/env python3
 
 import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from astCache import ASTCache
+from buildCache import BuildCache, compiler_fingerprint
 from parser import Parser
-from symbolTable import SymbolTable
+from symbolTable import SymbolTable, ParseError
 from typeChecker import TypeChecker
+from IRGen import IRGen
+from constantFolder import ConstantFolder
+from deadCode import DeadCodeEliminator
+from loopFusion import LoopFuser
+from loopInvariants import LoopInvariantMover
+from inductionVariables import RangeLoopConverter
 from PYGen import PYGen
 
 import astJava2Python as ast
 
-if __name__ == "__main__":
+VERSION = '4.1'
+
+# Command line flags that change the generated code, and so the cache key
+OUTPUT_FLAGS = ('no_optimize',)
+
+
+def find_sources(paths):
+    """
+    Expand the given files, directories and glob patterns into the list of
+    source files to compile. Directories are searched recursively for .java
+    files. Order follows the command line, each expansion being sorted.
+    """
+    sources = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            found = sorted(glob.glob(os.path.join(path, '**', '*.java'), recursive=True))
+        elif glob.has_magic(path):
+            found = sorted(glob.glob(path, recursive=True))
+        else:
+            found = [path]
+        for f in found:
+            if f not in seen:
+                seen.add(f)
+                sources.append(f)
+    return sources
 
-    # Python module "argparse" allows you to easily add commandline flags
-    # to your program, which can help with adding debugging options, such
-    # as '--verbose' and '--print-ast' as described below.
-    #
-    # Of course, this is entirely optional and not necessary, as long as
-    # the compiler functions correctly.
-    argparser = argparse.ArgumentParser(description='Take in the miniJava source code and compile it')
-    argparser.add_argument('FILE', help="Input file")
-    argparser.add_argument('-p', '--parse-only', action='store_true', help="Stop after scanning and parsing the input")
-    argparser.add_argument('-t', '--typecheck-only', action='store_true', help="Stop after typechecking")
-    argparser.add_argument('-v', '--verbose', action='store_true', help="Provides additional output")
-    args = argparser.parse_args()
 
+def compile_file(file_name, parser, typechecker, args, ast_cache=None):
+    """
+    Compile a single source file with the given (shared) parser and
+    typechecker. Every file gets its own PYGen. If 'ast_cache' is given, the
+    tree is loaded from it instead of being parsed whenever possible.
+
+    Returns the generated Python code, or None if the user asked to stop
+    before code generation.
+    """
     # Prints additional output if the flag is set
     if args.verbose:
-        print("* Reading file " + args.FILE + "...")
+        print("* Reading file " + file_name + "...")
 
-    f = open(args.FILE, 'r')
+    f = open(file_name, 'r')
     data = f.read()
     f.close()
 
-    if args.verbose:
-        print("* Scanning and Parsing...")
+    root = None
+    if ast_cache is not None:
+        root = ast_cache.load(data)
+        if root is not None and args.verbose:
+            print("* Loaded AST from cache...")
 
-    # Build and runs the parser to get AST
-    parser = Parser()
-    root = parser.parse(data)
+    if root is None:
+        if args.verbose:
+            print("* Scanning and Parsing...")
+
+        # Runs the parser to get AST
+        root = parser.parse(data)
+        if root is None:
+            raise ParseError("Unable to parse \"" + file_name + "\"")
+        if ast_cache is not None:
+            ast_cache.store(data, root)
 
     # If user asks to quit after parsing, do so.
     if args.parse_only:
-        quit()
+        return None
 
     if args.verbose:
         print("* Typechecking...")
 
-    typechecker = TypeChecker()
     typechecker.typecheck(root)
 
+    if not args.no_optimize:
+        if args.verbose:
+            print("* Folding constants...")
+        ConstantFolder().fold(root)
+        if args.verbose:
+            print("* Removing dead code...")
+        DeadCodeEliminator().eliminate(root)
+        if args.verbose:
+            print("* Fusing loops...")
+        LoopFuser().fuse(root)
+        if args.verbose:
+            print("* Moving loop-invariant code...")
+        LoopInvariantMover().move(root)
+        if args.verbose:
+            print("* Turning counted loops into range loops...")
+        RangeLoopConverter().convert(root)
+
+    if args.print_ir:
+        ir_generator = IRGen()
+        ir_generator.generate(root)
+        ir_generator.print_ir()
+
+    if args.typecheck_only:
+        return None
+
     if args.verbose:
         print("* Generating Python Code...")
 
-    py_generator = PYGen(args.FILE)
+    py_generator = PYGen(file_name)
     py_generator.generate(root, 0)
     # py_generator.print_py()
-    py_generator.generate_py()
\ No newline at end of file
+    return py_generator.render_py()
+
+
+################################
+## Compile workers
+################################
+
+# Parser, typechecker and AST cache of this process, shared by every
+# compiled file
+_parser = None
+_typechecker = None
+_ast_cache = None
+
+
+def init_worker(args):
+    """
+    Build the parser and typechecker of the current process up front, so
+    that worker processes are warm before they receive their first file.
+    """
+    global _parser, _typechecker, _ast_cache
+    if _parser is None:
+        _parser = Parser()
+        _typechecker = TypeChecker(args.check_jobs)
+        if args.ast_cache and not args.no_cache:
+            _ast_cache = ASTCache(BuildCache(args.cache_dir, args.cache_size * 1024 * 1024))
+
+
+def compile_task(file_name, args):
+    """
+    Compile 'file_name' in the current process. Errors are caught and
+    returned so that one bad file does not stop the whole run.
+
+    Returns a (file_name, code, error, seconds) tuple.
+    """
+    init_worker(args)
+    start = time.perf_counter()
+    code = None
+    error = None
+    try:
+        code = compile_file(file_name, _parser, _typechecker, args, _ast_cache)
+    except Exception as e:
+        error = format_error(e)
+    return file_name, code, error, time.perf_counter() - start
+
+
+def format_error(e):
+    return "{}: {}".format(type(e).__name__, " ".join(str(a) for a in e.args))
+
+
+def compile_all(sources, args):
+    """
+    Compile every file in 'sources', in this process or in a pool of
+    'args.jobs' worker processes. Results are yielded in source order.
+    """
+    if args.jobs <= 1 or len(sources) <= 1:
+        for file_name in sources:
+            yield compile_task(file_name, args)
+        return
+
+    chunksize = max(1, len(sources) // (args.jobs * 4))
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(args,)) as executor:
+        yield from executor.map(compile_task, sources, [args] * len(sources), chunksize=chunksize)
+
+
+def watch(sources, args, interval=0.5):
+    """
+    Compile every file in 'sources' and compile it again whenever it is
+    modified, until interrupted. Each file has its own incremental
+    typechecker, so only the methods touched by an edit are checked again.
+    """
+    parser = Parser()
+    checkers = {}
+    mtimes = {}
+    while True:
+        for file_name in sources:
+            try:
+                mtime = os.stat(file_name).st_mtime_ns
+            except OSError:
+                continue
+            if mtimes.get(file_name) == mtime:
+                continue
+            mtimes[file_name] = mtime
+            checker = checkers.get(file_name)
+            if checker is None:
+                checker = checkers[file_name] = TypeChecker(incremental=True)
+            start = time.perf_counter()
+            try:
+                code = compile_file(file_name, parser, checker, args)
+            except Exception as e:
+                print("{}: {}".format(file_name, format_error(e)), file=sys.stderr)
+                continue
+            if code is not None:
+                f = open("{}.py".format(file_name[:-5]), 'w')
+                f.write(code)
+                f.close()
+            print("{:<40} {:>10.2f} ms   {} methods checked, {} reused".format(
+                file_name, (time.perf_counter() - start) * 1000, checker.checked, checker.reused))
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+
+    # Python module "argparse" allows you to easily add commandline flags
+    # to your program, which can help with adding debugging options, such
+    # as '--verbose' and '--print-ast' as described below.
+    #
+    # Of course, this is entirely optional and not necessary, as long as
+    # the compiler functions correctly.
+    argparser = argparse.ArgumentParser(description='Take in the miniJava source code and compile it')
+    argparser.add_argument('FILE', nargs='+', help="Input files, directories or glob patterns")
+    argparser.add_argument('-p', '--parse-only', action='store_true', help="Stop after scanning and parsing the input")
+    argparser.add_argument('-t', '--typecheck-only', action='store_true', help="Stop after typechecking")
+    argparser.add_argument('--print-ir', action='store_true', help="Print the three-address code of the input")
+    argparser.add_argument('--no-optimize', action='store_true', help="Generate code without constant folding, dead code elimination, loop fusion, loop-invariant code motion and range loops")
+    argparser.add_argument('-v', '--verbose', action='store_true', help="Provides additional output")
+    argparser.add_argument('-j', '--jobs', type=int, default=1, help="Number of worker processes to compile with")
+    argparser.add_argument('--check-jobs', type=int, default=1, help="Number of worker processes to typecheck method bodies with")
+    argparser.add_argument('--no-cache', action='store_true', help="Compile every file, ignoring the build and AST caches")
+    argparser.add_argument('--ast-cache', action='store_true', help="Load parsed trees from the cache directory instead of parsing")
+    argparser.add_argument('--cache-dir', default='.java2python_cache', help="Build cache directory")
+    argparser.add_argument('--cache-size', type=int, default=64, help="Build cache size limit, in megabytes")
+    argparser.add_argument('-w', '--watch', action='store_true', help="Compile the files again whenever they change, typechecking incrementally")
+    args = argparser.parse_args()
+
+    sources = find_sources(args.FILE)
+
+    if args.watch:
+        try:
+            watch(sources, args)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    # Only full compiles go through the build cache
+    cache = None
+    if not (args.no_cache or args.parse_only or args.typecheck_only or args.print_ir):
+        cache = BuildCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        version = compiler_fingerprint(VERSION)
+        flags = repr([(flag, getattr(args, flag)) for flag in OUTPUT_FLAGS])
+
+    total_start = time.perf_counter()
+    keys = {}
+    pending = []
+    for file_name in sources:
+        if cache is None:
+            pending.append(file_name)
+            continue
+        f = open(file_name, 'rb')
+        data = f.read()
+        f.close()
+        key = cache.key(data, os.path.basename(file_name), version, flags)
+        code = cache.get(key)
+        if code is None:
+            keys[file_name] = key
+            pending.append(file_name)
+            continue
+        # Cache hit: only rewrite the output if it differs
+        out_name = "{}.py".format(file_name[:-5])
+        try:
+            f = open(out_name, 'rb')
+            current = f.read()
+            f.close()
+        except OSError:
+            current = None
+        if current != code:
+            f = open(out_name, 'wb')
+            f.write(code)
+            f.close()
+            if args.verbose:
+                print("* Restored " + out_name + " from the build cache")
+        elif args.verbose:
+            print("* " + out_name + " is up to date")
+
+    failed = []
+    for file_name, code, error, seconds in compile_all(pending, args):
+        # Outputs are written by this process, in source order
+        if code is not None:
+            f = open("{}.py".format(file_name[:-5]), 'w')
+            f.write(code)
+            f.close()
+            if file_name in keys:
+                cache.put(keys[file_name], code.encode('utf-8'))
+        if error is not None:
+            failed.append(file_name)
+            print("{}: {}".format(file_name, error), file=sys.stderr)
+        if len(sources) > 1:
+            print("{:<40} {:>10.2f} ms".format(file_name, seconds * 1000))
+    if len(sources) > 1:
+        print("{:<40} {:>10.2f} ms".format("total ({} files, {} cached)".format(len(sources), len(sources) - len(pending)),
+                                          (time.perf_counter() - total_start) * 1000))
+    if cache is None and args.ast_cache and not args.no_cache:
+        cache = BuildCache(args.cache_dir, args.cache_size * 1024 * 1024)
+    if cache is not None:
+        cache.evict()
+    if failed:
+        sys.exit(1)
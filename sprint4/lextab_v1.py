@@ -0,0 +1,10 @@
+# lextab_v1.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ADD', 'AND', 'ARRAYLIST', 'BANG', 'BOOLEAN', 'CATCH', 'CLASS', 'CLEAR', 'COMM', 'COMMA', 'DIVIDE', 'DOUBLEEQ', 'ELSE', 'EQ', 'EXCEPTION', 'EXTENDS', 'FALSE', 'FINALLY', 'FLOAT', 'FOR', 'GREATER', 'GREATEREQ', 'HASHMAP', 'ID', 'IF', 'INT', 'LBRACE', 'LBRACK', 'LESS', 'LESSEQ', 'LPAREN', 'MAIN', 'MINUS', 'NEQ', 'NEW', 'NULL', 'NUMBER', 'OR', 'PERIOD', 'PLUS', 'PRINT', 'PRIVATE', 'PUBLIC', 'PUT', 'RBRACE', 'RBRACK', 'REMOVE', 'RETURN', 'RPAREN', 'SEMICOL', 'STATIC', 'STR', 'STRING', 'THIS', 'TIMES', 'TRUE', 'TRY', 'VOID', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NUMBER>\\d+)|(?P<t_STR>"(?:[^"\\\\]|\\\\.)*")|(?P<t_PRINT>System.out.println)|(?P<t_ID>[a-zA-Z_][a-zA-Z_0-9]*)|(?P<t_COMM>//.*)|(?P<t_newline>\\n+)|(?P<t_OR>\\|\\|)|(?P<t_AND>\\&&)|(?P<t_DOUBLEEQ>\\==)|(?P<t_GREATEREQ>\\>=)|(?P<t_LESSEQ>\\<=)|(?P<t_NEQ>\\!=)|(?P<t_BANG>\\!)|(?P<t_EQ>\\=)|(?P<t_GREATER>\\>)|(?P<t_LBRACE>\\{)|(?P<t_LBRACK>\\[)|(?P<t_LESS>\\<)|(?P<t_LPAREN>\\()|(?P<t_PERIOD>\\.)|(?P<t_PLUS>\\+)|(?P<t_RBRACE>\\})|(?P<t_RBRACK>\\])|(?P<t_RPAREN>\\))|(?P<t_TIMES>\\*)|(?P<t_COMMA>,)|(?P<t_DIVIDE>/)|(?P<t_MINUS>-)|(?P<t_SEMICOL>;)', [None, ('t_NUMBER', 'NUMBER'), ('t_STR', 'STR'), ('t_PRINT', 'PRINT'), ('t_ID', 'ID'), ('t_COMM', 'COMM'), ('t_newline', 'newline'), (None, 'OR'), (None, 'AND'), (None, 'DOUBLEEQ'), (None, 'GREATEREQ'), (None, 'LESSEQ'), (None, 'NEQ'), (None, 'BANG'), (None, 'EQ'), (None, 'GREATER'), (None, 'LBRACE'), (None, 'LBRACK'), (None, 'LESS'), (None, 'LPAREN'), (None, 'PERIOD'), (None, 'PLUS'), (None, 'RBRACE'), (None, 'RBRACK'), (None, 'RPAREN'), (None, 'TIMES'), (None, 'COMMA'), (None, 'DIVIDE'), (None, 'MINUS'), (None, 'SEMICOL')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+
+import astJava2Python as ast
+
+# Pseudo-name written by the code whose order is observable: prints, and
+# while loops, which may never end
+ORDER = '<order>'
+
+# Code that may do more than read and write variables: calls, returns and
+# object creations. Fusion never moves code across them.
+BARRIERS = (ast.DeclFuncCall, ast.DeclObjCall, ast.DeclRetStmt, ast.ObjInstance)
+
+# Statements assigning the variable 'name'
+ASSIGNMENTS = (ast.AssignStmt, ast.DeclVarStmt, ast.DeclArrayList, ast.DeclHashMap)
+
+# Statements changing the contents of the list or map 'name'
+OBJECT_CALLS = (ast.DeclObjAddCall, ast.DeclObjRemoveCall, ast.DeclObjPutCall, ast.DeclObjClearCall)
+
+OPERATORS = (ast.BinOp, ast.CompareOp, ast.LogicOp)
+
+# Comparison operators with their operands swapped
+FLIPPED = {'<': '>', '>': '<', '<=': '>=', '>=': '<=', '==': '==', '!=': '!='}
+
+
+def expression_key(expr):
+    """
+    Return a string that is the same for expressions built alike and
+    different otherwise, or None if 'expr' is not made of operators,
+    literals and variables
+    """
+    tokens = []
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        cls = node.__class__
+        if cls is ast.Constant:
+            tokens.append("{}:{!r}".format(node.type.name, node.value))
+        elif cls is ast.UnaryOp:
+            tokens.append('u' + node.op)
+            stack.append(node.expr)
+        elif cls in OPERATORS:
+            tokens.append(node.op)
+            stack.append(node.right)
+            stack.append(node.left)
+        else:
+            return None
+    return ' '.join(tokens)
+
+
+def is_variable(expr, name):
+    return expr.__class__ is ast.Constant and expr.type.name == 'id' and expr.value == name
+
+
+def statements(body):
+    """
+    Return the items of the StmtList 'body', comments included
+    """
+    if body is None or not body.stmt_lst:
+        return []
+    return body.stmt_lst
+
+
+class Effects(object):
+    """
+    The names some code reads and writes, and whether it holds a barrier
+    """
+    __slots__ = ('reads', 'writes', 'barrier')
+
+    def __init__(self):
+        self.reads = set()
+        self.writes = set()
+        self.barrier = False
+
+    def add(self, code):
+        """
+        Add the effects of 'code', a node or a list of them
+        """
+        reads = self.reads
+        writes = self.writes
+        for node in ast.walk(code):
+            cls = node.__class__
+            if cls is ast.Constant:
+                if node.type.name == 'id':
+                    reads.add(node.value)
+            elif cls in ASSIGNMENTS:
+                writes.add(node.name)
+            elif cls in OBJECT_CALLS:
+                reads.add(node.name)
+                writes.add(node.name)
+            elif cls is ast.DeclPrintStmt or cls is ast.DeclWhileStmt:
+                writes.add(ORDER)
+            elif cls is ast.DeclTryStmt:
+                writes.add(node.catch_id.name)
+            elif cls is ast.BinOp and node.op == '/':
+                # Division by zero raises
+                divisor = node.right
+                if divisor.__class__ is not ast.Constant or divisor.type.name not in ('int', 'float') \
+                        or divisor.value == 0:
+                    self.barrier = True
+            elif cls in BARRIERS:
+                self.barrier = True
+        return self
+
+    def merge(self, other):
+        self.reads |= other.reads
+        self.writes |= other.writes
+        self.barrier = self.barrier or other.barrier
+
+
+class CountedLoop(object):
+    """
+    A while or for loop stepping the variable 'var' by a constant, up to a
+    bound the loop does not change.
+
+    Two loops with the same 'key' run the same iterations when nothing they
+    depend on ('fixed', and 'var' for while loops) changes in between. The
+    key is made of the kind of loop, the variable, the condition normalized
+    to 'var op bound', the step and the initial value of the variable. For
+    loops leave the variable out, as each declares its own.
+    'effects' are those of the body, update of the variable aside.
+    """
+    __slots__ = ('loop', 'var', 'key', 'update', 'effects', 'fixed', 'position', 'between',
+                 'moved', 'checked')
+
+    def __init__(self, loop, var, key, update, effects, fixed):
+        self.loop = loop
+        self.var = var
+        self.key = key
+        self.update = update
+        self.effects = effects
+        self.fixed = fixed
+        # Position of the loop in the statement list being built, effects of
+        # the statements after it that stay there, positions of those that
+        # can move before it, and position up to which they are known
+        self.position = None
+        self.between = Effects()
+        self.moved = []
+        self.checked = None
+
+
+class LoopFuser(object):
+    """
+    Fusion of the counted loops that run the same iterations, run after the
+    DeadCodeEliminator.
+
+    Each statement list is scanned once. Counted loops are indexed by their
+    key (see CountedLoop), so that a loop is only compared with the last
+    loop of the list with the same key. The statements between the two
+    that can move before the first loop (assignments that do not depend on
+    it) do, and the two loops are fused when the second one can move over
+    the statements left between them:
+
+    - Neither the loops nor the statements between them hold a barrier
+      (call, return, possible exception), or change the variable, the
+      bound or the initial value.
+    - No variable written by one of the moved pieces of code is read or
+      written by the other: the body of the first loop against the body of
+      the second, and the statements between them against the body of the
+      second. Prints and while loops count as writing the order of the
+      output, so two of them never swap.
+
+    The body of the second loop is then appended to the body of the first.
+    A while loop starts at the value its variable is last assigned before
+    it, and the second loop only fuses if that assignment comes right
+    before it, in which case the assignment is dropped. The variable of the
+    second for loop is renamed to that of the first, if no other statement
+    reads it.
+    """
+
+    def __init__(self):
+        self.fused = 0
+
+    def fuse(self, root):
+        """
+        Fuse the loops of every statement list under 'root', in place
+        """
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.__class__ is list:
+                stack.extend(node)
+                continue
+            if node is None:
+                continue
+            cls = node.__class__
+            if cls is ast.StmtList:
+                if node.stmt_lst:
+                    node.stmt_lst = self.fuse_list(node.stmt_lst, False)
+            elif cls is ast.DeclClassStmt:
+                if node.stmt_list:
+                    node.stmt_list = self.fuse_list(node.stmt_list, True)
+            elif cls is ast.Constant or cls in OPERATORS or cls is ast.UnaryOp:
+                continue
+            for field in node.child_fields:
+                stack.append(getattr(node, field))
+
+    def fuse_list(self, stmts, shared):
+        """
+        Return the statement list 'stmts' with its loops fused. The names
+        the list declares are fields if 'shared'.
+        """
+        self.stmts = stmts
+        self.shared = shared
+        self.result = result = []
+        self.candidates = candidates = {}
+        # Effects of each statement, computed once, and number of statements
+        # reading each name
+        self.effects = {}
+        self.readers = None
+        # Statements moved before each fused loop. Their place in 'result' is
+        # left to None, so that the positions of the candidates hold.
+        self.hoisted = hoisted = {}
+        fused_before = self.fused
+        for stmt in stmts:
+            if stmt is None or stmt.__class__ is list:
+                result.append(stmt)
+                continue
+            counted = self.counted_loop(stmt)
+            if counted is not None:
+                previous = candidates.get(counted.key)
+                if previous is not None and self.try_fuse(previous, counted):
+                    continue
+                counted.position = len(result)
+                counted.checked = len(result) + 1
+                candidates[counted.key] = counted
+            result.append(stmt)
+        if self.fused == fused_before:
+            return result
+        fused = []
+        for stmt in result:
+            if stmt is None:
+                continue
+            if stmt.__class__ is not list:
+                fused.extend(hoisted.get(stmt, ()))
+            fused.append(stmt)
+        return fused
+
+    def effects_of(self, stmt):
+        found = self.effects.get(stmt)
+        if found is None:
+            found = self.effects[stmt] = Effects().add(stmt)
+        return found
+
+    def counted_loop(self, stmt):
+        """
+        Return the CountedLoop of 'stmt', or None if it is not a counted
+        loop
+        """
+        cls = stmt.__class__
+        if cls is ast.DeclWhileStmt:
+            body = statements(stmt.body)
+            update = None
+            for item in reversed(body):
+                if item is not None and item.__class__ is not list:
+                    update = item
+                    break
+            if update is None:
+                return None
+            var, step = self.step(update)
+            if var is None:
+                return None
+            init = self.initial_value(var)
+            if init is None:
+                return None
+            init_key = expression_key(init.expr)
+            rest = [item for item in body if item is not update]
+        elif cls is ast.DeclForStmt:
+            update = stmt.cond_update
+            var, step = self.step(update)
+            if var is None or var != stmt.var_assign.name:
+                return None
+            init = stmt.var_assign
+            init_key = expression_key(init.expr)
+            rest = statements(stmt.body)
+        else:
+            return None
+        if init_key is None:
+            return None
+
+        cond = stmt.cond
+        if cond.__class__ is not ast.CompareOp:
+            return None
+        if is_variable(cond.left, var):
+            op, bound = cond.op, cond.right
+        elif is_variable(cond.right, var):
+            op, bound = FLIPPED[cond.op], cond.left
+        else:
+            return None
+        bound_key = expression_key(bound)
+        if bound_key is None:
+            return None
+        fixed = Effects().add(bound).add(init.expr).reads
+        if var in fixed:
+            return None
+
+        body_effects = Effects().add(rest)
+        if var in body_effects.writes:
+            return None
+        if cls is ast.DeclWhileStmt:
+            key = (cls.__name__, var, op, bound_key, step, init_key)
+        else:
+            key = (cls.__name__, op, bound_key, step, init_key)
+        return CountedLoop(stmt, var, key, update, body_effects, fixed)
+
+    @staticmethod
+    def step(update):
+        """
+        Return the variable and the step of the update 'var = var + k' or
+        'var = var - k', 'k' being an int literal, or (None, None)
+        """
+        if update.__class__ is not ast.AssignStmt or update.this:
+            return None, None
+        expr = update.expr
+        if expr.__class__ is not ast.BinOp or expr.op not in ('+', '-'):
+            return None, None
+        var = update.name
+        if is_variable(expr.left, var):
+            amount = expr.right
+        elif expr.op == '+' and is_variable(expr.right, var):
+            amount = expr.left
+        else:
+            return None, None
+        if amount.__class__ is not ast.Constant or amount.type.name != 'int':
+            return None, None
+        return var, amount.value if expr.op == '+' else -amount.value
+
+    def initial_value(self, var):
+        """
+        Return the statement giving 'var' its value at the end of the
+        statements fused so far, if it is a plain assignment whose operands
+        keep their value until then, or None
+        """
+        result = self.result
+        written = set()
+        for position in range(len(result) - 1, -1, -1):
+            stmt = result[position]
+            if stmt is None or stmt.__class__ is list:
+                continue
+            stmt_effects = self.effects_of(stmt)
+            if var in stmt_effects.writes:
+                if stmt.__class__ is not ast.AssignStmt and stmt.__class__ is not ast.DeclVarStmt:
+                    return None
+                if stmt.expr is None or stmt.__class__ is ast.AssignStmt and stmt.this:
+                    return None
+                if Effects().add(stmt.expr).reads & written:
+                    return None
+                return stmt
+            if stmt_effects.barrier:
+                return None
+            written |= stmt_effects.writes
+        return None
+
+    def read_elsewhere(self, name, stmt):
+        """
+        Whether a statement of the list other than 'stmt' reads 'name'
+        """
+        if self.readers is None:
+            self.readers = readers = {}
+            for item in self.stmts:
+                if item is not None and item.__class__ is not list:
+                    for read in self.effects_of(item).reads:
+                        readers[read] = readers.get(read, 0) + 1
+        return self.readers.get(name, 0) > (name in self.effects_of(stmt).reads)
+
+    def try_fuse(self, first, second):
+        """
+        Fuse the loop 'second' into the earlier loop 'first' if that is
+        legal. Returns whether it was.
+        """
+        result = self.result
+        end = len(result)
+        if second.loop.__class__ is ast.DeclWhileStmt:
+            # The initial assignment of the second loop must come right
+            # before it
+            end -= 1
+            while end >= 0 and (result[end] is None or result[end].__class__ is list):
+                end -= 1
+            if end <= first.position or second.var not in self.effects_of(result[end]).writes:
+                return False
+
+        # Sort the statements between the loops seen since the last attempt
+        for position in range(first.checked, end):
+            stmt = result[position]
+            if stmt is not None and stmt.__class__ is not list:
+                stmt_effects = self.effects_of(stmt)
+                if stmt.__class__ in ASSIGNMENTS and self.can_hoist(first, stmt_effects):
+                    first.moved.append(position)
+                else:
+                    first.between.merge(stmt_effects)
+        first.checked = max(first.checked, end)
+
+        one = first.effects
+        two = second.effects
+        between = first.between
+        if one.barrier or two.barrier or between.barrier:
+            return False
+        var = first.var
+        if var in between.writes or first.fixed & (one.writes | two.writes | between.writes):
+            return False
+        if one.writes & (two.reads | two.writes) or two.writes & one.reads:
+            return False
+        if between.writes & (two.reads | two.writes) or two.writes & between.reads:
+            return False
+        renamed = second.var != var
+        if renamed:
+            # Fields may be read anywhere, and the body of the second loop
+            # must neither use the variable of the first nor declare its own
+            # again
+            if self.shared or var in two.reads or var in two.writes or second.var in two.writes:
+                return False
+            if self.read_elsewhere(second.var, second.loop):
+                return False
+
+        loop = first.loop
+        if loop.__class__ is ast.DeclWhileStmt:
+            body = [item for item in statements(loop.body) if item is not first.update]
+            body += [item for item in statements(second.loop.body) if item is not second.update]
+            body.append(first.update)
+            result[end] = None
+        else:
+            added = statements(second.loop.body)
+            if renamed:
+                self.rename(added, second.var, var)
+            body = list(statements(loop.body)) + list(added)
+        if loop.body is None:
+            loop.body = ast.StmtList(body)
+        else:
+            loop.body.stmt_lst = body
+        self.moved(first, two)
+        one.merge(two)
+        self.effects_of(loop).merge(two)
+        self.fused += 1
+        return True
+
+    def moved(self, first, added):
+        """
+        Move the statements that go before the loop 'first', which just got
+        the body with effects 'added', and update the other candidates the
+        fused loop and the moved statements come after
+        """
+        result = self.result
+        positions = set(first.moved)
+        if positions:
+            hoisted = self.hoisted.setdefault(first.loop, [])
+            for position in first.moved:
+                hoisted.append(result[position])
+            first.moved = []
+        for other in self.candidates.values():
+            if other is first or other.position > first.position or other.checked <= first.position:
+                continue
+            other.between.merge(added)
+            if positions and positions.intersection(other.moved):
+                # Those stay after the other loop, but no longer after the
+                # statements it has between
+                for position in other.moved:
+                    if position in positions:
+                        other.between.merge(self.effects_of(result[position]))
+                other.moved = [position for position in other.moved if position not in positions]
+        for position in positions:
+            result[position] = None
+
+    @staticmethod
+    def rename(stmts, name, new_name):
+        """
+        Make the variable reads of 'name' in 'stmts' read 'new_name'
+        """
+        for node in ast.walk(stmts):
+            for field in node.child_fields:
+                child = getattr(node, field)
+                if is_variable(child, name):
+                    renamed = ast.Constant('id', new_name, child.coord)
+                    renamed.resolved_type = child.resolved_type
+                    setattr(node, field, renamed)
+
+    @staticmethod
+    def can_hoist(first, stmt_effects):
+        """
+        Whether a statement with effects 'stmt_effects', coming after the
+        loop 'first' and the statements of 'first.between', can move before
+        them
+        """
+        if stmt_effects.barrier or first.between.barrier:
+            return False
+        reads = stmt_effects.reads
+        writes = stmt_effects.writes
+        if first.var in reads or first.var in writes or writes & first.fixed:
+            return False
+        one = first.effects
+        between = first.between
+        if writes & (one.reads | one.writes | between.reads | between.writes):
+            return False
+        return not reads & (one.writes | between.writes)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+
+from IRGen import IRGen
+from IR import Opcode, CALLS, definition, uses, is_temporary
+from CFG import build_cfgs
+from dataflow import Liveness
+from loopFusion import expression_key, statements
+import astJava2Python as ast
+
+# Names of the variables holding the values moved out of loops, followed by
+# their number
+INVARIANT_PREFIX = '_inv'
+
+LOOPS = (ast.DeclWhileStmt, ast.DeclForStmt)
+
+OPERATORS = (ast.BinOp, ast.CompareOp, ast.LogicOp, ast.UnaryOp)
+
+
+def is_invariant(expr, changed):
+    """
+    Whether the expression 'expr' only reads names not in 'changed', and
+    computes its value without any other effect: it cannot raise
+    """
+    stack = [expr]
+    while stack:
+        node = stack.pop()
+        cls = node.__class__
+        if cls is ast.Constant:
+            if node.type.name == 'id' and node.value in changed:
+                return False
+        elif cls is ast.UnaryOp:
+            stack.append(node.expr)
+        elif cls in OPERATORS:
+            if node.op == '/':
+                # Division by zero raises
+                divisor = node.right
+                if divisor.__class__ is not ast.Constant or divisor.type.name not in ('int', 'float') \
+                        or divisor.value == 0:
+                    return False
+            stack.append(node.left)
+            stack.append(node.right)
+        else:
+            return False
+    return True
+
+
+def reads_variable(expr):
+    for node in ast.walk(expr):
+        if node.__class__ is ast.Constant and node.type.name == 'id':
+            return True
+    return False
+
+
+class LoopInvariantMover(object):
+    """
+    Loop-invariant code motion, run after the LoopFuser.
+
+    The tree is translated to IR, and the natural loops of the CFG of each
+    method and class are matched with the while and for statements they
+    come from. A name is invariant in a loop if no instruction of the loop
+    assigns it (calls may assign the fields). The following move to just
+    before the loop:
+
+    - Assignments of invariant expressions in the body of the loop, when
+      they are the only assignment of their variable in the loop, and the
+      variable is not live where the loop starts (no read in the loop sees
+      a value from before it) nor where it ends (the loop may run no
+      iteration at all, or leave with an exception).
+    - The largest invariant operations in the body and in the condition of
+      a while loop, into new variables. Equal operations share a variable.
+    - The lookups of the methods the body calls on invariant local objects:
+      'o.f(x)' becomes 'g(x)', with 'g = o.f' before the loop.
+
+    Only code that cannot raise moves, since it now runs even when the loop
+    does not. Code moved out of an inner loop may move again out of the
+    outer one, so the whole is done again until nothing moves.
+    """
+
+    def __init__(self):
+        self.hoisted = 0
+
+    def move(self, root):
+        """
+        Move the invariant code of the loops of the Program 'root' in place
+        """
+        self.used = set()
+        for node in ast.walk(root):
+            if node.__class__ is ast.Constant:
+                if node.type.name == 'id':
+                    self.used.add(node.value)
+            elif node.__class__ in ast.DECLARATIONS:
+                self.used.add(node.name)
+        self.count = 0
+        while True:
+            generator = IRGen()
+            generator.generate(root)
+            moved = {}
+            for cfg in build_cfgs(generator.IR_lst):
+                if cfg.loops():
+                    self.move_cfg(cfg, moved)
+            if not moved:
+                return
+            self.insert(root, moved)
+
+    def new_name(self):
+        while True:
+            self.count += 1
+            name = "{}{}".format(INVARIANT_PREFIX, self.count)
+            if name not in self.used:
+                self.used.add(name)
+                return name
+
+    def move_cfg(self, cfg, moved):
+        """
+        Find the code to move out of the loops of 'cfg', and add the
+        statements to put before each loop to 'moved'
+        """
+        blocks = cfg.blocks
+        owner = cfg.entry.instrs[0].origin
+        read = set()
+        defined = set()
+        for block in blocks:
+            for instr in block.instrs:
+                read.update(uses(instr))
+                name = definition(instr)
+                if name is not None:
+                    defined.add(name)
+        if owner.__class__ is ast.DeclMethodStmt:
+            local = ast.local_names(owner)
+            fields = {name for name in read | defined if name not in local and not is_temporary(name)}
+        else:
+            local = ()
+            fields = {name for name in defined if not is_temporary(name)}
+        liveness = Liveness(cfg, fields)
+
+        # Per loop, done: the statements assigning each name in the loop, None
+        # standing for calls, whether it calls, and the blocks it exits to.
+        # The dictionaries of the inner loops are reused by the outer ones.
+        summaries = {}
+        for loop in cfg.loops():
+            children = [summaries.pop(child) for child in loop.children]
+            children.sort(key=lambda summary: len(summary[0]), reverse=True)
+            changed, calls, exits = children[0] if children else ({}, False, [])
+            exits = [index for index in exits if not loop.contains(cfg.loop_of(index))]
+            for inner_changed, inner_calls, inner_exits in children[1:]:
+                for name, origins in inner_changed.items():
+                    changed.setdefault(name, set()).update(origins)
+                calls = calls or inner_calls
+                exits.extend(index for index in inner_exits if not loop.contains(cfg.loop_of(index)))
+            inner_calls = calls
+            for index in loop.own:
+                for instr in blocks[index].instrs:
+                    name = definition(instr)
+                    if name is None and instr.opcode is Opcode.SET_FIELD:
+                        name = instr.dst
+                    if name is not None:
+                        changed.setdefault(name, set()).add(instr.origin)
+                    elif instr.opcode in CALLS:
+                        calls = True
+                exits.extend(succ for succ in blocks[index].succs
+                             if not loop.contains(cfg.loop_of(succ)))
+            if calls and not inner_calls:
+                for name in fields:
+                    changed.setdefault(name, set()).add(None)
+            summaries[loop] = (changed, calls, exits)
+
+            node = blocks[loop.header].instrs[0].origin
+            if node.__class__ not in LOOPS:
+                continue
+            live = [liveness.live_in[loop.header]] + [liveness.live_in[index] for index in set(exits)]
+            hoisted = self.hoist_statements(node, changed, liveness, live)
+            # The statements moved still assign their variables in the outer
+            # loops
+            kept = [(stmt.name, {stmt}) for stmt in hoisted]
+            hoisted += self.hoist_expressions(node, changed, local, hoisted)
+            if hoisted:
+                moved[node] = hoisted
+            changed.update(kept)
+
+    def hoist_statements(self, loop, changed, liveness, live):
+        """
+        Return the assignments of the body of 'loop' that can move before
+        it, and take their variables out of 'changed'
+        """
+        hoisted = []
+        for stmt in statements(loop.body):
+            cls = stmt.__class__
+            if cls is ast.AssignStmt:
+                if stmt.this:
+                    continue
+            elif cls is not ast.DeclVarStmt or stmt.expr is None:
+                continue
+            name = stmt.name
+            if changed.get(name) != {stmt} or not is_invariant(stmt.expr, changed):
+                continue
+            if any(liveness.is_live(bits, name) for bits in live):
+                continue
+            hoisted.append(stmt)
+            del changed[name]
+        if hoisted:
+            kept = [stmt for stmt in statements(loop.body) if stmt not in hoisted]
+            loop.body.stmt_lst = kept
+            self.hoisted += len(hoisted)
+        return hoisted
+
+    def hoist_expressions(self, loop, changed, local, hoisted):
+        """
+        Replace the invariant operations and method lookups of 'loop', but
+        those of the statements in 'hoisted' and of the inner loops, by new
+        variables, and return the declarations of the latter
+        """
+        declared = []
+        names = {}
+        # (node, field) pairs of the places holding an expression or a
+        # statement
+        stack = [(loop, 'body')]
+        if loop.__class__ is ast.DeclWhileStmt:
+            stack.append((loop, 'cond'))
+        while stack:
+            parent, field = stack.pop()
+            node = parent[field] if parent.__class__ is list else getattr(parent, field)
+            cls = node.__class__
+            if node is None or cls in LOOPS or cls is ast.DeclObjAddCall:
+                # The elements added to lists are read from the source (see
+                # PYGen.gen_DeclObjAddCall)
+                continue
+            if cls is list:
+                for index, item in enumerate(node):
+                    if item is not None and item.__class__ is not list and item not in hoisted:
+                        stack.append((node, index))
+                continue
+            if cls in OPERATORS:
+                if is_invariant(node, changed) and reads_variable(node):
+                    key = expression_key(node)
+                    name = names.get(key)
+                    if name is None:
+                        name = names[key] = self.new_name()
+                        declared.append(self.declaration(name, node, node.resolved_type))
+                    self.replace(parent, field, ast.Constant('id', name, node.coord), node.resolved_type)
+                    continue
+            elif cls is ast.DeclObjCall and node.obj_func is not None and \
+                    node.obj_name in local and node.obj_name not in changed:
+                key = (node.obj_name, node.obj_func)
+                name = names.get(key)
+                if name is None:
+                    name = names[key] = self.new_name()
+                    lookup = ast.AttributeRef(node.obj_name, node.obj_func, node.coord)
+                    declared.append(self.declaration(name, lookup, None))
+                node.obj_name = name
+                node.obj_func = None
+            for child in node.child_fields:
+                stack.append((node, child))
+        self.hoisted += len(declared)
+        return declared
+
+    @staticmethod
+    def declaration(name, expr, resolved_type):
+        type_name = resolved_type.name if resolved_type is not None else None
+        decl = ast.DeclVarStmt(ast.DeclAccessType(None), ast.DeclType(type_name), name, expr, expr.coord)
+        decl.resolved_type = resolved_type
+        return decl
+
+    @staticmethod
+    def replace(parent, field, constant, resolved_type):
+        constant.resolved_type = resolved_type
+        if parent.__class__ is list:
+            parent[field] = constant
+        else:
+            setattr(parent, field, constant)
+
+    def insert(self, root, moved):
+        """
+        Put the statements of 'moved' before their loops
+        """
+        for node in ast.walk(root):
+            if node.__class__ is ast.StmtList:
+                stmts = node.stmt_lst
+            elif node.__class__ is ast.DeclClassStmt:
+                stmts = node.stmt_list
+            else:
+                continue
+            if not stmts or not any(stmt in moved for stmt in stmts if stmt.__class__ in LOOPS):
+                continue
+            result = []
+            for stmt in stmts:
+                if stmt.__class__ in LOOPS and stmt in moved:
+                    result.extend(moved[stmt])
+                result.append(stmt)
+            if node.__class__ is ast.StmtList:
+                node.stmt_lst = result
+            else:
+                node.stmt_list = result
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 import argparse
+import copy
+import hashlib
+import os
 from ply import yacc
 from scanner import Scanner
 import astJava2Python as ast
@@ -8,6 +11,23 @@ import xml.etree.ElementTree as ET
 # from sympy import root
 from scanner import tokens
 
+# Bump TABLE_VERSION whenever the grammar or the token list changes, so that
+# stale precompiled tables are never loaded in optimize mode
+TABLE_VERSION = 1
+LEXTAB = 'lextab_v%d' % TABLE_VERSION
+PARSETAB = 'parsetab_v%d' % TABLE_VERSION
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def source_digest(p, access_type, method_type, first):
+    """
+    Return a digest of the access type, the return type and the source text
+    of the method spanning the symbols 'first' to the last of production 'p'
+    """
+    h = hashlib.sha256()
+    h.update(repr((access_type.name if access_type is not None else None, method_type.name)).encode())
+    h.update(p.lexer.lexdata[p.lexpos(first):p.lexpos(len(p) - 1) + 1].encode())
+    return h.digest()
+
 class Parser:
     precedence = (
         ('left', 'AND', 'OR'),
@@ -20,20 +40,54 @@ class Parser:
 
     start = 'program'
 
+    # Shared lexer/parser prototypes, built once per process
+    _lexer = None
+    _parser = None
+
     def __init__(self):
         """
-        Builds the Lexer and Parser
+        Builds the Lexer and Parser.
+
+        The lexer and LALR tables are only built by the first instance in the
+        process (see 'build_tables'); every later instance gets its own cheap
+        clone of the shared prototypes.
         """
         self.tokens = tokens
+        if Parser._parser is None:
+            Parser._lexer, Parser._parser = Parser.build_tables(self)
         self.lexer = Scanner()
-        self.lexer.build()
-        self.parser = yacc.yacc(module=self)
+        self.lexer.tokens = tokens
+        self.lexer.lexer = Parser._lexer.clone()
+        self.parser = copy.copy(Parser._parser)
+
+    @staticmethod
+    def build_tables(module, optimize=True):
+        """
+        Returns a (lexer, parser) pair built from 'module'.
+
+        With 'optimize' set, PLY skips the grammar validation and signature
+        check and loads the precompiled, versioned table modules LEXTAB and
+        PARSETAB, writing them next to this file if they do not exist yet.
+        Without it, the tables are generated from scratch and nothing is
+        written (used to measure the cold construction cost).
+        """
+        scanner = Scanner()
+        if optimize:
+            scanner.build(optimize=1, lextab=LEXTAB, outputdir=TABLE_DIR)
+            parser = yacc.yacc(module=module, optimize=1, tabmodule=PARSETAB,
+                               outputdir=TABLE_DIR, debug=False)
+        else:
+            scanner.build()
+            parser = yacc.yacc(module=module, tabmodule='parsetab_cold',
+                               write_tables=False, debug=False)
+        return scanner.lexer, parser
 
     def parse(self, data):
         """
         Returns the root (Program) node of the AST, after parsing the file
         """
-        return self.parser.parse(data)
+        self.lexer.lexer.lineno = 1
+        return self.parser.parse(data, lexer=self.lexer.lexer)
 
     ################################
     ## Program (starting point)
@@ -60,7 +114,8 @@ class Parser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
     
     def p_comments(self, p):
         '''
@@ -83,7 +138,8 @@ class Parser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])
+            p[0] = p[1]
     
     ################################
     ## Class/Var/Method Declarations
@@ -114,9 +170,11 @@ class Parser:
                   | comments_lst_or_empty class_decl
         '''
         if len(p) == 3:
-            p[0] = [p[1]] + [p[2]]
+            p[0] = [p[1], p[2]]
         else:
-            p[0] = p[1] + [p[2]] + [p[3]]
+            p[1].append(p[2])
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_class_decl(self, p):
         '''
@@ -157,9 +215,11 @@ class Parser:
                   | comments_lst_or_empty decl_lst
         '''
         if len(p) == 3:
-            p[0] = [p[1]] + [p[2]]
+            p[0] = [p[1], p[2]]
         else:
-            p[0] = p[1] + [p[2]] + [p[3]]
+            p[1].append(p[2])
+            p[1].append(p[3])
+            p[0] = p[1]
 
     def p_decl_list(self, p):
         '''
@@ -186,7 +246,7 @@ class Parser:
         if isinstance(p[1], ast.DeclAccessType):
             p[0] = ast.DeclFuncCall(p[1], p[2], p[3], p[5], p[6])
         else:
-            p[0] = ast.DeclFuncCall(None, p[1], p[2], p[5], p[6])
+            p[0] = ast.DeclFuncCall(None, ast.DeclType(p[1]), p[2], p[5], p[6])
 
     def p_object_remove_stmt(self, p):
         '''
@@ -229,7 +289,8 @@ class Parser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
     
     def p_func_call_param(self, p):
         '''
@@ -242,11 +303,15 @@ class Parser:
         method_decl_stmt : access_or_empty STATIC VOID MAIN method_params LBRACE stmts_or_empty RBRACE 
                          | access_or_empty type ID method_params LBRACE stmts_or_empty RBRACE 
         '''
+        # Digest of the access type, return type and source text of the
+        # method, which tells incremental typechecking what changed
         if len(p) == 9:
             void_type = ast.DeclType("void", "void")
-            p[0] = ast.DeclMethodStmt(p[1], void_type, "main", p[5], p[7], True)
+            digest = source_digest(p, p[1], void_type, 2)
+            p[0] = ast.DeclMethodStmt(p[1], void_type, "main", p[5], p[7], True, source_digest=digest)
         else:
-            p[0] = ast.DeclMethodStmt(p[1], p[2], p[3], p[4], p[6], False) 
+            digest = source_digest(p, p[1], p[2], 3)
+            p[0] = ast.DeclMethodStmt(p[1], p[2], p[3], p[4], p[6], False, source_digest=digest)
     
     def p_method_params(self, p):
         '''
@@ -276,7 +341,8 @@ class Parser:
         if len(p) == 2:
             p[0] = [p[1]]
         else:
-            p[0] = p[1] + [p[3]]
+            p[1].append(p[3])
+            p[0] = p[1]
     
     def p_param(self, p):
         '''
@@ -297,9 +363,11 @@ class Parser:
                  | comments_lst_or_empty stmt
         '''
         if len(p) == 3:
-            p[0] = [p[1]] + [p[2]]
+            p[0] = [p[1], p[2]]
         else:
-            p[0] = p[1] + [p[2]] + [p[3]]
+            p[1].append(p[2])
+            p[1].append(p[3])
+            p[0] = p[1]
     
     def p_statement(self, p):
         '''
@@ -1,5 +1,5 @@
 
-# parsetab.py
+# parsetab_v1.py
 # This file is automatically generated. Do not edit.
 # pylint: disable=W,C,R
 _tabversion = '3.10'
@@ -27,112 +27,112 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> class_decl_or_empty','program',1,'p_program','parser.py',44),
-  ('print_stmt -> PRINT LPAREN expr RPAREN SEMICOL','print_stmt',5,'p_print_stmt','parser.py',50),
-  ('comments_lst -> comments_lst comments','comments_lst',2,'p_comments_lst','parser.py',57),
-  ('comments_lst -> comments','comments_lst',1,'p_comments_lst','parser.py',58),
-  ('comments -> words_lst','comments',1,'p_comments','parser.py',67),
-  ('comments_lst_or_empty -> comments_lst','comments_lst_or_empty',1,'p_comments_lst_or_empty','parser.py',73),
-  ('comments_lst_or_empty -> empty','comments_lst_or_empty',1,'p_comments_lst_or_empty','parser.py',74),
-  ('words_lst -> words_lst COMM','words_lst',2,'p_words_lst','parser.py',80),
-  ('words_lst -> COMM','words_lst',1,'p_words_lst','parser.py',81),
-  ('class_decl_or_empty -> class_lst','class_decl_or_empty',1,'p_class_decl_or_empty','parser.py',94),
-  ('class_decl_or_empty -> empty','class_decl_or_empty',1,'p_class_decl_or_empty','parser.py',95),
-  ('obj_call_stmt -> ID PERIOD PUT LPAREN expr COMMA expr RPAREN SEMICOL','obj_call_stmt',9,'p_object_put_stmt','parser.py',101),
-  ('obj_call_stmt -> ID PERIOD CLEAR LPAREN RPAREN SEMICOL','obj_call_stmt',6,'p_object_clear_stmt','parser.py',107),
-  ('class_lst -> class_lst comments_lst_or_empty class_decl','class_lst',3,'p_class_list','parser.py',113),
-  ('class_lst -> comments_lst_or_empty class_decl','class_lst',2,'p_class_list','parser.py',114),
-  ('class_decl -> access_or_empty CLASS ID ext_or_empty LBRACE decl_lsts RBRACE','class_decl',7,'p_class_decl','parser.py',123),
-  ('access_or_empty -> access_type','access_or_empty',1,'p_access_or_empty','parser.py',129),
-  ('access_or_empty -> empty','access_or_empty',1,'p_access_or_empty','parser.py',130),
-  ('access_type -> PUBLIC','access_type',1,'p_access_type','parser.py',136),
-  ('access_type -> PRIVATE','access_type',1,'p_access_type','parser.py',137),
-  ('ext_or_empty -> extends','ext_or_empty',1,'p_extend_or_empty','parser.py',143),
-  ('ext_or_empty -> empty','ext_or_empty',1,'p_extend_or_empty','parser.py',144),
-  ('extends -> EXTENDS ID','extends',2,'p_extend','parser.py',150),
-  ('decl_lsts -> decl_lsts comments_lst_or_empty decl_lst','decl_lsts',3,'p_decl_lists','parser.py',156),
-  ('decl_lsts -> comments_lst_or_empty decl_lst','decl_lsts',2,'p_decl_lists','parser.py',157),
-  ('decl_lst -> method_decl_stmt','decl_lst',1,'p_decl_list','parser.py',166),
-  ('decl_lst -> stmt','decl_lst',1,'p_decl_list','parser.py',167),
-  ('var_decl_stmt -> access_or_empty type ID SEMICOL','var_decl_stmt',4,'p_var_decl_stmt','parser.py',173),
-  ('var_decl_stmt -> access_or_empty type ID EQ expr SEMICOL','var_decl_stmt',6,'p_var_decl_stmt','parser.py',174),
-  ('func_call_stmt -> access_or_empty type ID EQ ID func_call_params SEMICOL','func_call_stmt',7,'p_func_call_stmt','parser.py',183),
-  ('func_call_stmt -> ID ID EQ NEW ID func_call_params SEMICOL','func_call_stmt',7,'p_func_call_stmt','parser.py',184),
-  ('obj_call_stmt -> ID PERIOD REMOVE LPAREN expr RPAREN SEMICOL','obj_call_stmt',7,'p_object_remove_stmt','parser.py',193),
-  ('obj_call_stmt -> ID PERIOD ADD LPAREN expr RPAREN SEMICOL','obj_call_stmt',7,'p_object_add_stmt','parser.py',198),
-  ('obj_call_stmt -> ID PERIOD ID func_call_params SEMICOL','obj_call_stmt',5,'p_object_call_stmt','parser.py',204),
-  ('func_call_params -> LPAREN func_call_param_lst_or_empty RPAREN','func_call_params',3,'p_func_call_params','parser.py',210),
-  ('func_call_param_lst_or_empty -> func_call_param_lst','func_call_param_lst_or_empty',1,'p_func_params_or_empty','parser.py',216),
-  ('func_call_param_lst_or_empty -> empty','func_call_param_lst_or_empty',1,'p_func_params_or_empty','parser.py',217),
-  ('func_call_param_lst -> func_call_param_lst COMMA func_call_param','func_call_param_lst',3,'p_func_call_param_lst','parser.py',226),
-  ('func_call_param_lst -> func_call_param','func_call_param_lst',1,'p_func_call_param_lst','parser.py',227),
-  ('func_call_param -> expr','func_call_param',1,'p_func_call_param','parser.py',236),
-  ('method_decl_stmt -> access_or_empty STATIC VOID MAIN method_params LBRACE stmts_or_empty RBRACE','method_decl_stmt',8,'p_method_decl_stmt','parser.py',242),
-  ('method_decl_stmt -> access_or_empty type ID method_params LBRACE stmts_or_empty RBRACE','method_decl_stmt',7,'p_method_decl_stmt','parser.py',243),
-  ('method_params -> LPAREN param_or_empty RPAREN','method_params',3,'p_method_params','parser.py',253),
-  ('method_params -> LPAREN STRING LBRACK RBRACK ID RPAREN','method_params',6,'p_method_params','parser.py',254),
-  ('param_or_empty -> param_lst','param_or_empty',1,'p_param_or_empty','parser.py',263),
-  ('param_or_empty -> empty','param_or_empty',1,'p_param_or_empty','parser.py',264),
-  ('param_lst -> param_lst COMMA param','param_lst',3,'p_param_lst','parser.py',273),
-  ('param_lst -> param','param_lst',1,'p_param_lst','parser.py',274),
-  ('param -> type ID','param',2,'p_param','parser.py',283),
-  ('stmts_or_empty -> stmt_lst','stmts_or_empty',1,'p_statements_or_empty','parser.py',289),
-  ('stmts_or_empty -> empty','stmts_or_empty',1,'p_statements_or_empty','parser.py',290),
-  ('stmt_lst -> stmt_lst comments_lst_or_empty stmt','stmt_lst',3,'p_statement_list','parser.py',296),
-  ('stmt_lst -> comments_lst_or_empty stmt','stmt_lst',2,'p_statement_list','parser.py',297),
-  ('stmt -> assign_stmt','stmt',1,'p_statement','parser.py',306),
-  ('stmt -> var_decl_stmt','stmt',1,'p_statement','parser.py',307),
-  ('stmt -> if_stmt','stmt',1,'p_statement','parser.py',308),
-  ('stmt -> while_stmt','stmt',1,'p_statement','parser.py',309),
-  ('stmt -> for_stmt','stmt',1,'p_statement','parser.py',310),
-  ('stmt -> try_stmt','stmt',1,'p_statement','parser.py',311),
-  ('stmt -> ret_stmt','stmt',1,'p_statement','parser.py',312),
-  ('stmt -> func_call_stmt','stmt',1,'p_statement','parser.py',313),
-  ('stmt -> print_stmt','stmt',1,'p_statement','parser.py',314),
-  ('stmt -> obj_call_stmt','stmt',1,'p_statement','parser.py',315),
-  ('stmt -> array_lst','stmt',1,'p_statement','parser.py',316),
-  ('stmt -> hash_map','stmt',1,'p_statement','parser.py',317),
-  ('assign_stmt -> ID EQ expr SEMICOL','assign_stmt',4,'p_assign_statement','parser.py',323),
-  ('assign_stmt -> ID EQ expr','assign_stmt',3,'p_assign_statement','parser.py',324),
-  ('assign_stmt -> THIS PERIOD ID EQ expr SEMICOL','assign_stmt',6,'p_assign_statement','parser.py',325),
-  ('if_stmt -> IF LPAREN expr RPAREN scope ELSE scope','if_stmt',7,'p_if_statement','parser.py',334),
-  ('if_stmt -> IF LPAREN expr RPAREN scope ELSE IF LPAREN expr RPAREN scope ELSE scope','if_stmt',13,'p_if_statement','parser.py',335),
-  ('scope -> LBRACE stmts_or_empty RBRACE','scope',3,'p_scope','parser.py',344),
-  ('array_lst -> ARRAYLIST LESS type GREATER ID EQ NEW ARRAYLIST LESS type GREATER LPAREN RPAREN SEMICOL','array_lst',14,'p_array_list','parser.py',350),
-  ('while_stmt -> WHILE LPAREN expr RPAREN scope','while_stmt',5,'p_while_statement','parser.py',358),
-  ('for_stmt -> FOR LPAREN type ID EQ expr SEMICOL expr SEMICOL assign_stmt RPAREN scope','for_stmt',12,'p_for_statement','parser.py',364),
-  ('try_stmt -> TRY scope CATCH LPAREN EXCEPTION ID RPAREN scope FINALLY scope','try_stmt',10,'p_try_statement','parser.py',371),
-  ('try_stmt -> TRY scope CATCH LPAREN EXCEPTION ID RPAREN scope','try_stmt',8,'p_try_statement','parser.py',372),
-  ('ret_stmt -> RETURN expr SEMICOL','ret_stmt',3,'p_return_statement','parser.py',382),
-  ('expr -> NEW ID LPAREN RPAREN','expr',4,'p_expr_object_instance','parser.py',391),
-  ('expr -> expr PLUS expr','expr',3,'p_expr_binops','parser.py',397),
-  ('expr -> expr MINUS expr','expr',3,'p_expr_binops','parser.py',398),
-  ('expr -> expr TIMES expr','expr',3,'p_expr_binops','parser.py',399),
-  ('expr -> expr DIVIDE expr','expr',3,'p_expr_binops','parser.py',400),
-  ('expr -> expr DOUBLEEQ expr','expr',3,'p_expr_compareops','parser.py',406),
-  ('expr -> expr LESS expr','expr',3,'p_expr_compareops','parser.py',407),
-  ('expr -> expr LESSEQ expr','expr',3,'p_expr_compareops','parser.py',408),
-  ('expr -> expr GREATER expr','expr',3,'p_expr_compareops','parser.py',409),
-  ('expr -> expr GREATEREQ expr','expr',3,'p_expr_compareops','parser.py',410),
-  ('expr -> expr NEQ expr','expr',3,'p_expr_compareops','parser.py',411),
-  ('expr -> expr AND expr','expr',3,'p_expr_logicops','parser.py',417),
-  ('expr -> expr OR expr','expr',3,'p_expr_logicops','parser.py',418),
-  ('expr -> MINUS expr','expr',2,'p_expr_unary','parser.py',424),
-  ('expr -> BANG expr','expr',2,'p_expr_unary','parser.py',425),
-  ('expr -> LPAREN expr RPAREN','expr',3,'p_expr_group','parser.py',431),
-  ('expr -> NUMBER PERIOD NUMBER','expr',3,'p_expr_number','parser.py',437),
-  ('expr -> NUMBER','expr',1,'p_expr_number','parser.py',438),
-  ('expr -> STR','expr',1,'p_expr_str','parser.py',448),
-  ('expr -> TRUE','expr',1,'p_expr_bool','parser.py',454),
-  ('expr -> FALSE','expr',1,'p_expr_bool','parser.py',455),
-  ('expr -> NULL','expr',1,'p_expr_null','parser.py',461),
-  ('expr -> ID','expr',1,'p_expr_id','parser.py',467),
-  ('type -> base_type','type',1,'p_type','parser.py',483),
-  ('base_type -> INT','base_type',1,'p_base_type','parser.py',489),
-  ('base_type -> BOOLEAN','base_type',1,'p_base_type','parser.py',490),
-  ('base_type -> STRING','base_type',1,'p_base_type','parser.py',491),
-  ('base_type -> VOID','base_type',1,'p_base_type','parser.py',492),
-  ('base_type -> FLOAT','base_type',1,'p_base_type','parser.py',493),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',507),
-  ('hash_map -> HASHMAP LESS type COMMA type GREATER ID EQ NEW HASHMAP LESS type COMMA type GREATER LPAREN RPAREN SEMICOL','hash_map',18,'p_hash_map','parser.py',515),
+  ('program -> class_decl_or_empty','program',1,'p_program','parser.py',87),
+  ('print_stmt -> PRINT LPAREN expr RPAREN SEMICOL','print_stmt',5,'p_print_stmt','parser.py',93),
+  ('comments_lst -> comments_lst comments','comments_lst',2,'p_comments_lst','parser.py',100),
+  ('comments_lst -> comments','comments_lst',1,'p_comments_lst','parser.py',101),
+  ('comments -> words_lst','comments',1,'p_comments','parser.py',110),
+  ('comments_lst_or_empty -> comments_lst','comments_lst_or_empty',1,'p_comments_lst_or_empty','parser.py',116),
+  ('comments_lst_or_empty -> empty','comments_lst_or_empty',1,'p_comments_lst_or_empty','parser.py',117),
+  ('words_lst -> words_lst COMM','words_lst',2,'p_words_lst','parser.py',123),
+  ('words_lst -> COMM','words_lst',1,'p_words_lst','parser.py',124),
+  ('class_decl_or_empty -> class_lst','class_decl_or_empty',1,'p_class_decl_or_empty','parser.py',137),
+  ('class_decl_or_empty -> empty','class_decl_or_empty',1,'p_class_decl_or_empty','parser.py',138),
+  ('obj_call_stmt -> ID PERIOD PUT LPAREN expr COMMA expr RPAREN SEMICOL','obj_call_stmt',9,'p_object_put_stmt','parser.py',144),
+  ('obj_call_stmt -> ID PERIOD CLEAR LPAREN RPAREN SEMICOL','obj_call_stmt',6,'p_object_clear_stmt','parser.py',150),
+  ('class_lst -> class_lst comments_lst_or_empty class_decl','class_lst',3,'p_class_list','parser.py',156),
+  ('class_lst -> comments_lst_or_empty class_decl','class_lst',2,'p_class_list','parser.py',157),
+  ('class_decl -> access_or_empty CLASS ID ext_or_empty LBRACE decl_lsts RBRACE','class_decl',7,'p_class_decl','parser.py',166),
+  ('access_or_empty -> access_type','access_or_empty',1,'p_access_or_empty','parser.py',172),
+  ('access_or_empty -> empty','access_or_empty',1,'p_access_or_empty','parser.py',173),
+  ('access_type -> PUBLIC','access_type',1,'p_access_type','parser.py',179),
+  ('access_type -> PRIVATE','access_type',1,'p_access_type','parser.py',180),
+  ('ext_or_empty -> extends','ext_or_empty',1,'p_extend_or_empty','parser.py',186),
+  ('ext_or_empty -> empty','ext_or_empty',1,'p_extend_or_empty','parser.py',187),
+  ('extends -> EXTENDS ID','extends',2,'p_extend','parser.py',193),
+  ('decl_lsts -> decl_lsts comments_lst_or_empty decl_lst','decl_lsts',3,'p_decl_lists','parser.py',199),
+  ('decl_lsts -> comments_lst_or_empty decl_lst','decl_lsts',2,'p_decl_lists','parser.py',200),
+  ('decl_lst -> method_decl_stmt','decl_lst',1,'p_decl_list','parser.py',209),
+  ('decl_lst -> stmt','decl_lst',1,'p_decl_list','parser.py',210),
+  ('var_decl_stmt -> access_or_empty type ID SEMICOL','var_decl_stmt',4,'p_var_decl_stmt','parser.py',216),
+  ('var_decl_stmt -> access_or_empty type ID EQ expr SEMICOL','var_decl_stmt',6,'p_var_decl_stmt','parser.py',217),
+  ('func_call_stmt -> access_or_empty type ID EQ ID func_call_params SEMICOL','func_call_stmt',7,'p_func_call_stmt','parser.py',226),
+  ('func_call_stmt -> ID ID EQ NEW ID func_call_params SEMICOL','func_call_stmt',7,'p_func_call_stmt','parser.py',227),
+  ('obj_call_stmt -> ID PERIOD REMOVE LPAREN expr RPAREN SEMICOL','obj_call_stmt',7,'p_object_remove_stmt','parser.py',236),
+  ('obj_call_stmt -> ID PERIOD ADD LPAREN expr RPAREN SEMICOL','obj_call_stmt',7,'p_object_add_stmt','parser.py',241),
+  ('obj_call_stmt -> ID PERIOD ID func_call_params SEMICOL','obj_call_stmt',5,'p_object_call_stmt','parser.py',247),
+  ('func_call_params -> LPAREN func_call_param_lst_or_empty RPAREN','func_call_params',3,'p_func_call_params','parser.py',253),
+  ('func_call_param_lst_or_empty -> func_call_param_lst','func_call_param_lst_or_empty',1,'p_func_params_or_empty','parser.py',259),
+  ('func_call_param_lst_or_empty -> empty','func_call_param_lst_or_empty',1,'p_func_params_or_empty','parser.py',260),
+  ('func_call_param_lst -> func_call_param_lst COMMA func_call_param','func_call_param_lst',3,'p_func_call_param_lst','parser.py',269),
+  ('func_call_param_lst -> func_call_param','func_call_param_lst',1,'p_func_call_param_lst','parser.py',270),
+  ('func_call_param -> expr','func_call_param',1,'p_func_call_param','parser.py',279),
+  ('method_decl_stmt -> access_or_empty STATIC VOID MAIN method_params LBRACE stmts_or_empty RBRACE','method_decl_stmt',8,'p_method_decl_stmt','parser.py',285),
+  ('method_decl_stmt -> access_or_empty type ID method_params LBRACE stmts_or_empty RBRACE','method_decl_stmt',7,'p_method_decl_stmt','parser.py',286),
+  ('method_params -> LPAREN param_or_empty RPAREN','method_params',3,'p_method_params','parser.py',296),
+  ('method_params -> LPAREN STRING LBRACK RBRACK ID RPAREN','method_params',6,'p_method_params','parser.py',297),
+  ('param_or_empty -> param_lst','param_or_empty',1,'p_param_or_empty','parser.py',306),
+  ('param_or_empty -> empty','param_or_empty',1,'p_param_or_empty','parser.py',307),
+  ('param_lst -> param_lst COMMA param','param_lst',3,'p_param_lst','parser.py',316),
+  ('param_lst -> param','param_lst',1,'p_param_lst','parser.py',317),
+  ('param -> type ID','param',2,'p_param','parser.py',326),
+  ('stmts_or_empty -> stmt_lst','stmts_or_empty',1,'p_statements_or_empty','parser.py',332),
+  ('stmts_or_empty -> empty','stmts_or_empty',1,'p_statements_or_empty','parser.py',333),
+  ('stmt_lst -> stmt_lst comments_lst_or_empty stmt','stmt_lst',3,'p_statement_list','parser.py',339),
+  ('stmt_lst -> comments_lst_or_empty stmt','stmt_lst',2,'p_statement_list','parser.py',340),
+  ('stmt -> assign_stmt','stmt',1,'p_statement','parser.py',349),
+  ('stmt -> var_decl_stmt','stmt',1,'p_statement','parser.py',350),
+  ('stmt -> if_stmt','stmt',1,'p_statement','parser.py',351),
+  ('stmt -> while_stmt','stmt',1,'p_statement','parser.py',352),
+  ('stmt -> for_stmt','stmt',1,'p_statement','parser.py',353),
+  ('stmt -> try_stmt','stmt',1,'p_statement','parser.py',354),
+  ('stmt -> ret_stmt','stmt',1,'p_statement','parser.py',355),
+  ('stmt -> func_call_stmt','stmt',1,'p_statement','parser.py',356),
+  ('stmt -> print_stmt','stmt',1,'p_statement','parser.py',357),
+  ('stmt -> obj_call_stmt','stmt',1,'p_statement','parser.py',358),
+  ('stmt -> array_lst','stmt',1,'p_statement','parser.py',359),
+  ('stmt -> hash_map','stmt',1,'p_statement','parser.py',360),
+  ('assign_stmt -> ID EQ expr SEMICOL','assign_stmt',4,'p_assign_statement','parser.py',366),
+  ('assign_stmt -> ID EQ expr','assign_stmt',3,'p_assign_statement','parser.py',367),
+  ('assign_stmt -> THIS PERIOD ID EQ expr SEMICOL','assign_stmt',6,'p_assign_statement','parser.py',368),
+  ('if_stmt -> IF LPAREN expr RPAREN scope ELSE scope','if_stmt',7,'p_if_statement','parser.py',377),
+  ('if_stmt -> IF LPAREN expr RPAREN scope ELSE IF LPAREN expr RPAREN scope ELSE scope','if_stmt',13,'p_if_statement','parser.py',378),
+  ('scope -> LBRACE stmts_or_empty RBRACE','scope',3,'p_scope','parser.py',387),
+  ('array_lst -> ARRAYLIST LESS type GREATER ID EQ NEW ARRAYLIST LESS type GREATER LPAREN RPAREN SEMICOL','array_lst',14,'p_array_list','parser.py',393),
+  ('while_stmt -> WHILE LPAREN expr RPAREN scope','while_stmt',5,'p_while_statement','parser.py',401),
+  ('for_stmt -> FOR LPAREN type ID EQ expr SEMICOL expr SEMICOL assign_stmt RPAREN scope','for_stmt',12,'p_for_statement','parser.py',407),
+  ('try_stmt -> TRY scope CATCH LPAREN EXCEPTION ID RPAREN scope FINALLY scope','try_stmt',10,'p_try_statement','parser.py',414),
+  ('try_stmt -> TRY scope CATCH LPAREN EXCEPTION ID RPAREN scope','try_stmt',8,'p_try_statement','parser.py',415),
+  ('ret_stmt -> RETURN expr SEMICOL','ret_stmt',3,'p_return_statement','parser.py',425),
+  ('expr -> NEW ID LPAREN RPAREN','expr',4,'p_expr_object_instance','parser.py',434),
+  ('expr -> expr PLUS expr','expr',3,'p_expr_binops','parser.py',440),
+  ('expr -> expr MINUS expr','expr',3,'p_expr_binops','parser.py',441),
+  ('expr -> expr TIMES expr','expr',3,'p_expr_binops','parser.py',442),
+  ('expr -> expr DIVIDE expr','expr',3,'p_expr_binops','parser.py',443),
+  ('expr -> expr DOUBLEEQ expr','expr',3,'p_expr_compareops','parser.py',449),
+  ('expr -> expr LESS expr','expr',3,'p_expr_compareops','parser.py',450),
+  ('expr -> expr LESSEQ expr','expr',3,'p_expr_compareops','parser.py',451),
+  ('expr -> expr GREATER expr','expr',3,'p_expr_compareops','parser.py',452),
+  ('expr -> expr GREATEREQ expr','expr',3,'p_expr_compareops','parser.py',453),
+  ('expr -> expr NEQ expr','expr',3,'p_expr_compareops','parser.py',454),
+  ('expr -> expr AND expr','expr',3,'p_expr_logicops','parser.py',460),
+  ('expr -> expr OR expr','expr',3,'p_expr_logicops','parser.py',461),
+  ('expr -> MINUS expr','expr',2,'p_expr_unary','parser.py',467),
+  ('expr -> BANG expr','expr',2,'p_expr_unary','parser.py',468),
+  ('expr -> LPAREN expr RPAREN','expr',3,'p_expr_group','parser.py',474),
+  ('expr -> NUMBER PERIOD NUMBER','expr',3,'p_expr_number','parser.py',480),
+  ('expr -> NUMBER','expr',1,'p_expr_number','parser.py',481),
+  ('expr -> STR','expr',1,'p_expr_str','parser.py',491),
+  ('expr -> TRUE','expr',1,'p_expr_bool','parser.py',497),
+  ('expr -> FALSE','expr',1,'p_expr_bool','parser.py',498),
+  ('expr -> NULL','expr',1,'p_expr_null','parser.py',504),
+  ('expr -> ID','expr',1,'p_expr_id','parser.py',510),
+  ('type -> base_type','type',1,'p_type','parser.py',526),
+  ('base_type -> INT','base_type',1,'p_base_type','parser.py',532),
+  ('base_type -> BOOLEAN','base_type',1,'p_base_type','parser.py',533),
+  ('base_type -> STRING','base_type',1,'p_base_type','parser.py',534),
+  ('base_type -> VOID','base_type',1,'p_base_type','parser.py',535),
+  ('base_type -> FLOAT','base_type',1,'p_base_type','parser.py',536),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',550),
+  ('hash_map -> HASHMAP LESS type COMMA type GREATER ID EQ NEW HASHMAP LESS type COMMA type GREATER LPAREN RPAREN SEMICOL','hash_map',18,'p_hash_map','parser.py',558),
 ]
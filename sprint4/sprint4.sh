@@ -1,5 +1,6 @@
 #!/bin/sh
-python3 java2Python.py Employee.java  # this generates Employee.py and to examine the overall data types, methods, and OOP
-python3 java2Python.py arraylist.java  # this generates arraylist.py and to examine the newly optimized arraylist
-python3 java2Python.py demo.java  # this generates demo.py and to examine our optimizations in sprint4
-python3 java2Python.py map.java  # this generates map.py and to examine the newly added hashmap -> dictionary feature
\ No newline at end of file
+# Employee.java:  generates Employee.py and to examine the overall data types, methods, and OOP
+# arraylist.java: generates arraylist.py and to examine the newly optimized arraylist
+# demo.java:      generates demo.py and to examine our optimizations in sprint4
+# map.java:       generates map.py and to examine the newly added hashmap -> dictionary feature
+python3 java2Python.py Employee.java arraylist.java demo.java map.java
@@ -1,36 +1,98 @@
 #!/usr/bin/env python3
 
+from typeSystem import parameterized_type
+
 class ParseError(Exception): pass
 
+class MethodSignature(object):
+    """
+    Signature of a declared method: the Types of its parameters and of its
+    return value, and the DeclMethodStmt node declaring it
+    """
+    __slots__ = ('name', 'param_types', 'return_type', 'node')
+
+    def __init__(self, name, param_types, return_type, node):
+        self.name = name
+        self.param_types = param_types
+        self.return_type = return_type
+        self.node = node
+
+
 class SymbolTable(object):
     """
     Base symbol table class
+
+    Variables live in one flat dictionary mapping each name to the stack of
+    its visible bindings, innermost last, so that lookups cost a single
+    dictionary access whatever the nesting depth. Each binding records the
+    depth of the scope declaring it. Every declaration is also appended to
+    an undo log, and 'pop_scope' unwinds the log down to the mark left by
+    the matching 'push_scope'.
     """
 
-    def __init__(self):
+    def __init__(self, class_name=None, class_table=None):
         self.methods = dict()
-        self.scope_stack = [dict()]
+        self.fields = dict()
+        self.bindings = dict()
+        self.undo_log = []
+        self.scope_marks = []
+        # Symbol tables of classes belong to a ClassTable, which resolves
+        # the members they inherit
+        self.class_name = class_name
+        self.class_table = class_table
 
     def push_scope(self):
-        self.scope_stack.append(dict())
+        self.scope_marks.append(len(self.undo_log))
 
     def pop_scope(self):
-        assert len(self.scope_stack) > 1
-        self.scope_stack.pop()
+        assert self.scope_marks
+        mark = self.scope_marks.pop()
+        bindings = self.bindings
+        undo_log = self.undo_log
+        for name in undo_log[mark:]:
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+        del undo_log[mark:]
 
-    def declare_method(self, method_name, method_node, line_number):
+    def bind(self, name, value, line_number):
+        """
+        Bind 'name' to 'value' in the innermost scope, checking for
+        duplicates in that scope
         """
-        Declare a new method in this class, checking for duplicates
+        depth = len(self.scope_marks)
+        stack = self.bindings.get(name)
+        if stack is None:
+            self.bindings[name] = [(depth, value)]
+        elif stack[-1][0] == depth:
+            raise ParseError("Redeclaring variable named \"" + name + "\"", line_number)
+        else:
+            stack.append((depth, value))
+        self.undo_log.append(name)
+        if depth == 0:
+            self.fields[name] = value
+            if self.class_table is not None:
+                self.class_table.invalidate(self.class_name)
+
+    def declare_method(self, method_name, signature, line_number):
+        """
+        Declare a new method in this class with its MethodSignature,
+        checking for duplicates
         """
         if method_name in self.methods:
             raise ParseError("Redeclaring method named \"" + method_name + "\"", line_number)
-        self.methods[method_name] = method_node
+        self.methods[method_name] = signature
+        if self.class_table is not None:
+            self.class_table.invalidate(self.class_name)
 
     def lookup_method(self, method_name, line_number):
         """
-        Return the MethodNode associated with the method named 'method_name',
-        or throw a ParseError if the method is not declared
+        Return the MethodSignature of the method named 'method_name', or
+        throw a ParseError if the method is not declared
         """
+        if self.class_table is not None:
+            return self.class_table.lookup_method(self.class_name, method_name, line_number)
         if method_name not in self.methods:
             raise ParseError("Referencing undefined method \"" + method_name + "\"")
         return self.methods[method_name]
@@ -40,32 +102,216 @@ class SymbolTable(object):
         Add a new variable.
         Need to do duplicate variable declaration error checking.
         """
-        if name in self.scope_stack[-1]:
-            raise ParseError("Redeclaring variable named \"" + name + "\"", line_number)
-        self.scope_stack[-1][name] = type
+        self.bind(name, type, line_number)
 
     def declare_array_variable(self, name, arraytype, type, line_number):
         '''
         add a new array variable with declare inner variable
         '''
-        if name in self.scope_stack[-1]:
-            raise ParseError("Redeclaring variable named \"" + name + "\"", line_number)
-        self.scope_stack[-1][name] = [arraytype,type]
+        self.bind(name, parameterized_type(arraytype, (type,)), line_number)
 
     def lookup_variable(self, name, line_number):
         """
         Return the type of the variable named 'name', or throw
         a ParseError if the variable is not declared in the scope.
         """
-        # You should traverse through the entire scope stack
-        for scope in reversed(self.scope_stack):
-            if name in scope:
-                return scope[name]
-        raise ParseError("Referencing undefined variable \"" + name + "\"", line_number)
+        stack = self.bindings.get(name)
+        if stack is None:
+            if self.class_table is not None:
+                return self.class_table.lookup_field(self.class_name, name, line_number)
+            raise ParseError("Referencing undefined variable \"" + name + "\"", line_number)
+        binding = stack[-1]
+        if binding[0] == 0 and self.class_table is not None and self.class_table.dependencies is not None:
+            # A field of this class
+            self.class_table.dependencies.add(('field', self.class_name, name))
+        return binding[1]
+
     def declare_hashmap_variable(self, name, maptype, keytype, valuetype, line_number):
         '''
         add a new hashmap variable with declare inner variable
         '''
-        if name in self.scope_stack[-1]:
-            raise ParseError("Redeclaring variable named \"" + name + "\"", line_number)
-        self.scope_stack[-1][name] = [maptype,keytype,valuetype]
+        self.bind(name, parameterized_type(maptype, (keytype, valuetype)), line_number)
+
+
+class ClassTable(object):
+    """
+    Table of the classes of a program, each with its own SymbolTable.
+
+    The method resolution order of a class follows its 'extends' chain up to
+    the first class that is not declared in the program. It is computed once
+    per class, and the methods and fields visible in a class (its own and
+    the inherited ones) are flattened into one dictionary each, so that a
+    member lookup is a single dictionary access however deep the hierarchy.
+    Declaring a member in a class drops the flattened dictionaries of that
+    class and of its subclasses.
+
+    While 'dependencies' is a set, every lookup of a class, method or field
+    adds a (kind, class name, member name) tuple to it. 'fingerprint' tells
+    what such a dependency resolves to.
+    """
+
+    def __init__(self):
+        self.classes = dict()
+        self.bases = dict()
+        self.subclasses = dict()
+        self.mros = dict()
+        self.members = dict()
+        self.dependencies = None
+
+    def declare_class(self, class_name, base_name, line_number):
+        """
+        Declare a new class extending the class named 'base_name' (or None),
+        checking for duplicates, and return its symbol table
+        """
+        if class_name in self.classes:
+            raise ParseError("Redeclaring class named \"" + class_name + "\"", line_number)
+        st = SymbolTable(class_name, self)
+        self.classes[class_name] = st
+        self.bases[class_name] = base_name
+        self.subclasses.setdefault(base_name, []).append(class_name)
+        # The new class may extend the chain of classes declared before it
+        self.mros.clear()
+        self.members.clear()
+        return st
+
+    def is_class(self, class_name):
+        """
+        Return whether the program declares a class named 'class_name'
+        """
+        if self.dependencies is not None:
+            self.dependencies.add(('class', class_name, None))
+        return class_name in self.classes
+
+    def lookup_constructor(self, class_name, line_number):
+        """
+        Return the MethodSignature of the constructor of the class named
+        'class_name', None if it declares none, or throw a ParseError if the
+        class is not declared
+        """
+        if self.dependencies is not None:
+            self.dependencies.add(('constructor', class_name, None))
+        return self.lookup_class(class_name, line_number).methods.get(class_name)
+
+    def lookup_class(self, class_name, line_number):
+        """
+        Return the symbol table of the class named 'class_name', or throw a
+        ParseError if the class is not declared
+        """
+        if class_name not in self.classes:
+            raise ParseError("Referencing undefined class \"" + class_name + "\"", line_number)
+        return self.classes[class_name]
+
+    def invalidate(self, class_name):
+        """
+        Forget the members resolved for 'class_name' and its subclasses
+        """
+        # Resolving a class resolves its ancestors, so subclasses of an
+        # unresolved class are unresolved too
+        stack = [class_name]
+        while stack:
+            name = stack.pop()
+            if self.members.pop(name, None) is not None:
+                stack.extend(self.subclasses.get(name, ()))
+
+    def mro(self, class_name):
+        """
+        Return the names of 'class_name' and of the declared classes it
+        inherits from, nearest first
+        """
+        mro = self.mros.get(class_name)
+        if mro is not None:
+            return mro
+        if class_name not in self.classes:
+            raise ParseError("Referencing undefined class \"" + class_name + "\"")
+        chain = []
+        seen = set()
+        name = class_name
+        while name in self.classes:
+            cached = self.mros.get(name)
+            if cached is not None:
+                chain.extend(cached)
+                break
+            if name in seen:
+                raise ParseError("Cyclic inheritance involving class \"" + name + "\"")
+            seen.add(name)
+            chain.append(name)
+            name = self.bases[name]
+        # Every class along the chain shares a suffix of it
+        for i, name in enumerate(chain):
+            if name in self.mros:
+                break
+            self.mros[name] = tuple(chain[i:])
+        return self.mros[class_name]
+
+    def resolve(self, class_name):
+        """
+        Return the (methods, fields) dictionaries of every member visible in
+        the class named 'class_name'
+        """
+        resolved = self.members.get(class_name)
+        if resolved is not None:
+            return resolved
+        mro = self.mro(class_name)
+        # Start from the nearest ancestor already resolved, then let each
+        # class down to 'class_name' override what it inherits
+        i = len(mro)
+        methods, fields = dict(), dict()
+        for j, name in enumerate(mro):
+            if name in self.members:
+                i = j
+                methods, fields = self.members[name]
+                break
+        for name in reversed(mro[:i]):
+            st = self.classes[name]
+            methods = dict(methods)
+            methods.update(st.methods)
+            fields = dict(fields)
+            fields.update(st.fields)
+            self.members[name] = (methods, fields)
+        return self.members[class_name]
+
+    def lookup_method(self, class_name, method_name, line_number):
+        """
+        Return the method named 'method_name' that instances of the class
+        named 'class_name' call, or throw a ParseError if there is none
+        """
+        if self.dependencies is not None:
+            self.dependencies.add(('method', class_name, method_name))
+        methods = self.resolve(class_name)[0]
+        if method_name not in methods:
+            raise ParseError("Referencing undefined method \"" + method_name + "\"", line_number)
+        return methods[method_name]
+
+    def lookup_field(self, class_name, name, line_number):
+        """
+        Return the type of the field named 'name' of the class named
+        'class_name', or throw a ParseError if there is none
+        """
+        if self.dependencies is not None:
+            self.dependencies.add(('field', class_name, name))
+        fields = self.resolve(class_name)[1]
+        if name not in fields:
+            raise ParseError("Referencing undefined variable \"" + name + "\"", line_number)
+        return fields[name]
+
+    def fingerprint(self, dependency):
+        """
+        Return what the dependency (kind, class name, member name) resolves
+        to: whether the class exists, or the type of the field, or the
+        parameter and return types of the method or constructor. Code that
+        only used dependencies with unchanged fingerprints checks the same.
+        """
+        kind, class_name, name = dependency
+        if class_name not in self.classes:
+            return None
+        if kind == 'class':
+            return True
+        if kind == 'constructor':
+            signature = self.classes[class_name].methods.get(class_name)
+        elif kind == 'method':
+            signature = self.resolve(class_name)[0].get(name)
+        else:
+            return self.resolve(class_name)[1].get(name, False)
+        if signature is None:
+            return False
+        return (signature.param_types, signature.return_type)
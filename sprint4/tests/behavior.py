@@ -0,0 +1,40 @@
+"""
+Helpers comparing the behavior of the code generated with and without
+optimizations
+"""
+import contextlib
+import io
+
+
+def run(code, cls, method, *args):
+    """
+    Run the generated 'code' and call 'method' of class 'cls' on 'args'.
+    Returns what it returned and printed, or the type of the exception it
+    raised.
+    """
+    namespace = {}
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            exec(code, namespace)
+            result = getattr(namespace[cls], method)(*args)
+    except Exception as e:
+        return type(e).__name__
+    return result, out.getvalue()
+
+
+def lines(code):
+    return [line.strip() for line in code.splitlines()]
+
+
+def check_behavior(compile_java, source, cls, method, *calls):
+    """
+    Compile 'source' with and without optimizations, and check that both
+    behave alike on each tuple of arguments in 'calls'. Returns the
+    optimized code.
+    """
+    optimized = compile_java(source)
+    plain = compile_java(source, optimize=False)
+    for args in calls:
+        assert run(optimized, cls, method, *args) == run(plain, cls, method, *args)
+    return optimized
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+# The compiler modules live next to this directory and import each other by
+# their plain names
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Parser
+
+
+@pytest.fixture(scope='session')
+def parser():
+    return Parser()
+
+
+@pytest.fixture
+def compile_java(parser, tmp_path):
+    """
+    Return a function compiling a Java source to Python, optimized or not,
+    through the same steps as java2Python.py
+    """
+    from argparse import Namespace
+    from java2Python import compile_file
+    from typeChecker import TypeChecker
+
+    def compile_source(source, optimize=True):
+        path = tmp_path / 'Source.java'
+        path.write_text(source)
+        args = Namespace(verbose=False, parse_only=False, typecheck_only=False,
+                         print_ir=False, no_optimize=not optimize)
+        return compile_file(str(path), parser, TypeChecker(), args)
+    return compile_source
@@ -0,0 +1,101 @@
+from behavior import check_behavior, lines, run
+
+
+def test_folding_and_propagation(compile_java):
+    source = """
+public class Arithmetic {
+    public int body(int a) {
+        int x = 2 * 3;
+        int y = x + 4;
+        return y * a;
+    }
+    public int division() {
+        return 7 / 2 + (0 - 7) / 2;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Arithmetic', 'body', (0,), (3,), (-2,))
+    assert 'return 10 * a' in lines(code)
+    # Java int division truncates toward zero
+    code = check_behavior(compile_java, source, 'Arithmetic', 'division', ())
+    assert 'return 0' in lines(code)
+
+
+def test_branch_pruning(compile_java):
+    source = """
+public class Branches {
+    public int body(int a) {
+        int s = 0;
+        int k = 3;
+        if (k < 2) {
+            s = 1;
+        } else if (k == 3) {
+            s = 2;
+        } else {
+            s = 3;
+        }
+        if (a > k) {
+            s = s + 10;
+        } else {
+            s = s + 20;
+        }
+        return s;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Branches', 'body', (0,), (3,), (4,))
+    # Only the else-if branch can run, and 's' is known in both branches
+    # of the second if statement
+    assert 'if (a > 3):' in lines(code)
+    assert 's = 12' in lines(code)
+    assert 's = 22' in lines(code)
+    assert not any(line.startswith('elif') for line in lines(code))
+
+
+def test_loops_that_never_run(compile_java):
+    source = """
+public class Loops {
+    public int body(int a) {
+        int n = a;
+        int limit = 0;
+        while (limit > 5) {
+            n = n + 1;
+        }
+        for (int j = 0; limit > 3; j = j + 1) {
+            n = n + j;
+        }
+        int i = 0;
+        while (i < a) {
+            i = i + 1;
+            n = n + 2;
+        }
+        return i + n;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Loops', 'body', (0,), (4,), (-1,))
+    assert 'n = n + 1' not in lines(code)
+    assert 'n = n + j' not in lines(code)
+    # 'i' is assigned in the loop, so its condition is not folded
+    assert 'n = n + 2' in lines(code)
+    assert run(code, 'Loops', 'body', 4) == (16, '')
+
+
+def test_overflow_and_division_by_zero_are_left_to_run(compile_java):
+    source = """
+public class Unfolded {
+    public int body(int a) {
+        int big = 2147483647;
+        int zero = 0;
+        if (a > 0) {
+            System.out.println(big + 1);
+        } else {
+            System.out.println(a / zero);
+        }
+        return a;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Unfolded', 'body', (1,), (0,))
+    assert 'print(2147483647 + 1)' in lines(code)
+    assert run(code, 'Unfolded', 'body', 0) == 'ZeroDivisionError'
@@ -0,0 +1,128 @@
+from behavior import check_behavior, lines, run
+
+
+def test_dead_stores_and_unused_locals(compile_java):
+    source = """
+public class Stores {
+    public int body(int a) {
+        int unused = a * 3;
+        int x = 1;
+        x = a + 2;
+        int y = x * 2;
+        y = y + a;
+        return x;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Stores', 'body', (0,), (5,), (-4,))
+    assert 'unused = a * 3' not in lines(code)
+    assert 'x = 1' not in lines(code)
+    assert not any(line.startswith('y =') for line in lines(code))
+    assert 'x = a + 2' in lines(code)
+    assert run(code, 'Stores', 'body', 5) == (7, '')
+
+
+def test_local_shadowing_a_field(compile_java):
+    source = """
+public class Shadow {
+    int count = 5;
+    int seen = 8;
+    public int body(int a) {
+        int count = 7;
+        count = a;
+        return count;
+    }
+    public int other() {
+        return seen;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Shadow', 'body', (3,))
+    # The local does not keep the field alive, nor the field the local
+    assert 'count = 5' not in lines(code)
+    assert 'count = 7' not in lines(code)
+    assert 'seen = 8' in lines(code)
+    assert run(code, 'Shadow', 'body', 3) == (3, '')
+
+
+def test_field_writes_read_through_calls(compile_java):
+    source = """
+public class Fields {
+    int total = 0;
+    public int get() {
+        return total;
+    }
+    public void set(int v) {
+        total = v;
+    }
+    public int body(int a) {
+        total = a;
+        int r = get();
+        total = 0;
+        return r;
+    }
+}
+"""
+    code = compile_java(source)
+    assert 'total = v' in lines(code)
+    # Read by the call, then at the end of the method
+    assert 'total = a' in lines(code)
+    assert 'total = 0' in lines(code)
+    assert code.count('total = ') == compile_java(source, optimize=False).count('total = ')
+
+
+def test_field_initializer_read_by_another_method(compile_java):
+    source = """
+public class Limits {
+    int limit = 10;
+    int spare = 3;
+    public int body() {
+        return limit;
+    }
+}
+"""
+    code = compile_java(source)
+    assert 'limit = 10' in lines(code)
+    assert 'spare = 3' not in lines(code)
+    namespace = {}
+    exec(code, namespace)
+    assert namespace['Limits'].limit == 10
+
+
+def test_statements_emptied_by_removal(compile_java):
+    source = """
+public class Empty {
+    public int body(int n) {
+        int s = n + 1;
+        for (int i = 0; i < n; i = i + 1) {
+            int t = i * 2;
+        }
+        if (n > 2) {
+            int u = 1;
+        }
+        else {
+            int w = 2;
+        }
+        return s;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Empty', 'body', (0,), (1,), (5,))
+    assert not any(line.startswith(('for ', 'while ', 'if ', 'else')) for line in lines(code))
+    assert run(code, 'Empty', 'body', 5) == (6, '')
+
+
+def test_division_by_possible_zero_is_kept(compile_java):
+    source = """
+public class Divide {
+    public int body(int a, int b) {
+        int q = a / b;
+        int h = a / 2;
+        return a;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Divide', 'body', (7, 2), (7, 0))
+    assert 'q = int(a / b)' in lines(code)
+    assert not any(line.startswith('h =') for line in lines(code))
+    assert run(code, 'Divide', 'body', 7, 0) == 'ZeroDivisionError'
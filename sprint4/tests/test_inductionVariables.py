@@ -0,0 +1,94 @@
+from behavior import check_behavior, lines, run
+
+
+def test_not_equal_from_an_unknown_start(compile_java):
+    source = """
+public class Unknown {
+    public int body(int a, int b) {
+        int i = a;
+        while (i != b) {
+            if (i == 10) {
+                return i;
+            } else {
+                System.out.println(i);
+            }
+            i = i + 1;
+        }
+        return 0 - 1;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Unknown', 'body', (0, 5), (3, 3), (5, 0))
+    # 'a' may start past 'b', where the Java loop goes on up to 10
+    assert not any('range(' in line for line in lines(code))
+    assert run(code, 'Unknown', 'body', 5, 0) == (10, '5\n6\n7\n8\n9\n')
+
+
+def test_not_equal_between_literals(compile_java):
+    source = """
+public class Literals {
+    public int body() {
+        int s = 0;
+        for (int i = 0; i != 5; i = i + 1) {
+            s = s + i;
+        }
+        for (int j = 5; j != 0; j = j - 1) {
+            s = s + j;
+        }
+        return s;
+    }
+    public int past() {
+        int s = 0;
+        for (int i = 7; i != 3; i = i + 1) {
+            s = s + 1;
+            if (s > 20) {
+                return s;
+            } else {
+                s = s + 0;
+            }
+        }
+        return 0 - 1;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Literals', 'body', ())
+    assert 'for i in range(0, 5, 1):' in lines(code)
+    assert 'for j in range(5, 0, -1):' in lines(code)
+    assert run(code, 'Literals', 'body') == (25, '')
+    # Starting past the bound
+    code = check_behavior(compile_java, source, 'Literals', 'past', ())
+    assert 'while (i != 3):' in lines(code)
+    assert run(code, 'Literals', 'past') == (21, '')
+
+
+def test_inclusive_bounds_and_negative_steps(compile_java):
+    source = """
+public class Bounds {
+    public int up(int a, int b) {
+        int s = 0;
+        for (int i = a; i <= b; i = i + 2) {
+            s = s + i;
+        }
+        return s;
+    }
+    public int down(int a, int b) {
+        int s = 0;
+        int i = a;
+        while (b <= i) {
+            s = s + 10 / i;
+            i = i - 1;
+        }
+        return s + i;
+    }
+}
+"""
+    calls = [(0, 5), (5, 0), (3, 3), (-2, 4), (7, -1), (6, 1)]
+    code = check_behavior(compile_java, source, 'Bounds', 'up', *calls)
+    assert 'for i in range(a, b + 1, 2):' in lines(code)
+    code = check_behavior(compile_java, source, 'Bounds', 'down', *calls)
+    assert 'for i in range(i, b - 1, -1):' in lines(code)
+    # The variable is read after the loop, and ends one past the bound
+    assert 'i = min(i, b - 1)' in lines(code)
+    assert run(code, 'Bounds', 'down', 6, 1) == (23, '')
+    assert run(code, 'Bounds', 'down', 0, 5) == (0, '')
+    assert run(code, 'Bounds', 'down', 2, 0) == 'ZeroDivisionError'
@@ -0,0 +1,133 @@
+from behavior import check_behavior, lines, run
+
+
+def test_hoisting_across_comments(compile_java):
+    source = """
+public class Comments {
+    public int body(int a, int n) {
+        int s = 0;
+        int t = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + i;
+        }
+        // comment
+        int k = a;
+        // comment
+        for (int j = 0; j < n; j = j + 1) {
+            t = t + k;
+        }
+        return s + t;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Comments', 'body', (2, 0), (2, 5), (-3, 4))
+    # 'int k = a;' moved before the fused loop, the comments stayed
+    assert lines(code).index('k = a') < lines(code).index('s = s + i')
+    assert 't = t + k' in lines(code)
+    assert lines(code).count('#  comment') == 2
+
+
+def test_independent_loops(compile_java):
+    source = """
+public class Independent {
+    public int counted(int n) {
+        int s = 0;
+        int t = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + i;
+        }
+        for (int j = 0; j < n; j = j + 1) {
+            t = t + j * 2;
+        }
+        return s + t;
+    }
+    public int whiles(int n) {
+        int s = 0;
+        int t = 0;
+        int i = 0;
+        while (i < n) {
+            s = s + i;
+            i = i + 1;
+        }
+        i = 0;
+        while (i < n) {
+            t = t + i;
+            i = i + 1;
+        }
+        return s * t + i;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Independent', 'counted', (0,), (5,), (-2,))
+    check_behavior(compile_java, source, 'Independent', 'whiles', (0,), (5,), (-2,))
+    # One loop left in each method
+    assert sum(line.startswith('for ') for line in lines(code)) == 2
+    assert 't = t + i * 2' in lines(code)
+
+
+def test_loops_that_must_stay_apart(compile_java):
+    source = """
+public class Apart {
+    public int dependent(int n) {
+        int s = 0;
+        int t = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + i;
+        }
+        for (int j = 0; j < n; j = j + 1) {
+            t = t + s;
+        }
+        return t;
+    }
+    public int between(int n) {
+        int s = 0;
+        int t = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + i;
+        }
+        int k = s;
+        for (int j = 0; j < n; j = j + 1) {
+            t = t + k;
+        }
+        return t;
+    }
+    public int bounds(int n) {
+        int s = 0;
+        int t = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + i;
+        }
+        for (int j = 0; j < n + 1; j = j + 1) {
+            t = t + j;
+        }
+        return s + t;
+    }
+    public int prints(int n) {
+        for (int i = 0; i < n; i = i + 1) {
+            System.out.println(i);
+        }
+        for (int j = 0; j < n; j = j + 1) {
+            System.out.println(j * 10);
+        }
+        return 0;
+    }
+    public int division(int n, int d) {
+        int s = 0;
+        int t = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + i;
+        }
+        for (int j = 0; j < n; j = j + 1) {
+            t = t + 10 / d;
+        }
+        return s + t;
+    }
+}
+"""
+    for method in ('dependent', 'between', 'bounds', 'prints'):
+        code = check_behavior(compile_java, source, 'Apart', method, (0,), (4,))
+    code = check_behavior(compile_java, source, 'Apart', 'division', (0, 0), (4, 2), (4, 0))
+    # The second loop reads what the first one writes, directly or through
+    # 'k', runs once more, swaps prints, or may raise
+    assert sum(line.startswith('for ') for line in lines(code)) == 10
+    assert run(code, 'Apart', 'prints', 2) == (0, '0\n1\n0\n10\n')
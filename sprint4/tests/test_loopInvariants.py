@@ -0,0 +1,91 @@
+from behavior import check_behavior, lines, run
+
+
+def test_invariant_code_leaves_the_loop(compile_java):
+    source = """
+public class Hoisted {
+    public int body(int a, int b, int n) {
+        int s = 0;
+        int i = 0;
+        while (i < n) {
+            int k = a * b;
+            s = s + k + (a + b) * 3;
+            i = i + 1;
+        }
+        return s;
+    }
+}
+"""
+    code = check_behavior(compile_java, source, 'Hoisted', 'body', (2, 3, 0), (2, 3, 4), (-1, 5, 2))
+    body = lines(code)
+    loop = next(index for index, line in enumerate(body) if line.startswith(('for ', 'while ')))
+    assert body.index('k = a * b') < loop
+    assert body.index('_inv1 = (a + b) * 3') < loop
+    assert 's = s + k + _inv1' in body
+
+
+def test_division_by_a_possibly_zero_value_stays(compile_java):
+    source = """
+public class Division {
+    public int body(int a, int d, int n) {
+        int s = 0;
+        int i = 0;
+        while (i < n) {
+            s = s + a / d;
+            i = i + 1;
+        }
+        return s;
+    }
+    public int guarded(int a, int d, int n) {
+        int s = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            if (d != 0) {
+                s = s + a / d;
+            } else {
+                s = s + 1;
+            }
+        }
+        return s;
+    }
+}
+"""
+    calls = [(7, 0, 0), (7, 2, 3), (7, 0, 3)]
+    code = check_behavior(compile_java, source, 'Division', 'body', *calls)
+    # The loop may not run, or only run the division when 'd' is not zero
+    assert 's = s + int(a / d)' in lines(code)
+    assert run(code, 'Division', 'body', 7, 0, 0) == (0, '')
+    code = check_behavior(compile_java, source, 'Division', 'guarded', *calls)
+    assert not any(line.startswith('_inv') and '/' in line for line in lines(code))
+    assert run(code, 'Division', 'guarded', 7, 0, 3) == (3, '')
+
+
+def test_assignments_read_outside_the_loop(compile_java):
+    source = """
+public class Live {
+    public int before(int a, int n) {
+        int k = 5;
+        int s = 0;
+        for (int i = 0; i < n; i = i + 1) {
+            s = s + k;
+            k = a * 2;
+        }
+        return s;
+    }
+    public int after(int a, int n) {
+        int k = 5;
+        for (int i = 0; i < n; i = i + 1) {
+            k = a * 2;
+        }
+        return k;
+    }
+}
+"""
+    calls = [(3, 0), (3, 1), (3, 4)]
+    # 'k' is read before its assignment in the loop, or after the loop,
+    # where it still holds 5 if the loop does not run: only the operation
+    # moves
+    for method in ('before', 'after'):
+        code = check_behavior(compile_java, source, 'Live', method, *calls)
+        assert 'k = a * 2' not in lines(code)
+        assert any(line.startswith('k = _inv') for line in lines(code))
+    assert run(code, 'Live', 'after', 3, 0) == (5, '')
@@ -0,0 +1,119 @@
+import pytest
+
+from symbolTable import ParseError
+from typeChecker import TypeChecker, method_types
+from typeSystem import BOOLEAN, INT
+import astJava2Python as ast
+
+
+# The loop variable of a class level for statement stays in the class
+# scope, for the methods after the loop only
+LOOP_THEN_METHOD = """
+public class Loops {
+    int n = 3;
+    for (int i = 0; i < n; i = i + 1) {
+        n = n + 1;
+    }
+    public int first() {
+        return i;
+    }
+    public int second() {
+        return n;
+    }
+}
+"""
+
+METHOD_THEN_LOOP = """
+public class Loops {
+    int n = 3;
+    public int first() {
+        return i;
+    }
+    for (int i = 0; i < n; i = i + 1) {
+        n = n + 1;
+    }
+    public int second() {
+        return i;
+    }
+}
+"""
+
+LOOP_IN_BASE = """
+public class Base {
+    for (int i = 0; i < 2; i = i + 1) {
+        int k = i;
+    }
+    public int first() {
+        return i;
+    }
+}
+public class Derived extends Base {
+    public int second() {
+        return i + 1;
+    }
+}
+"""
+
+
+def check(parser, source, jobs):
+    """
+    Typecheck 'source' with 'jobs' workers, and return the error raised if
+    any and the types resolved in each method
+    """
+    root = parser.parse(source)
+    error = None
+    try:
+        TypeChecker(jobs).typecheck(root)
+    except ParseError as e:
+        error = e.args
+    methods = [node for node in ast.walk(root) if node.__class__ is ast.DeclMethodStmt]
+    return error, [method_types(method) for method in methods]
+
+
+@pytest.mark.parametrize('source', [LOOP_THEN_METHOD, METHOD_THEN_LOOP, LOOP_IN_BASE])
+def test_parallel_bodies_match_serial(parser, source):
+    serial = check(parser, source, 1)
+    assert check(parser, source, 2) == serial
+
+
+def test_class_level_loop_variable_after_loop(parser):
+    error, _ = check(parser, LOOP_THEN_METHOD, 2)
+    assert error is None
+
+
+def test_class_level_loop_variable_before_loop(parser):
+    error, _ = check(parser, METHOD_THEN_LOOP, 2)
+    assert error is not None and 'undefined variable "i"' in error[0]
+
+
+ELIF_TEMPLATE = """
+public class Branches {
+    public int pick(int a, int b) {
+        int r = 0;
+        if (a == 0) {
+            r = 1;
+        }
+        else if (%s) {
+            r = 2;
+        }
+        else {
+            r = 3;
+        }
+        return r;
+    }
+}
+"""
+
+
+def test_elif_condition_must_be_boolean(parser):
+    root = parser.parse(ELIF_TEMPLATE % "a")
+    with pytest.raises(ParseError, match="requires boolean"):
+        TypeChecker().typecheck(root)
+
+
+def test_elif_condition_is_annotated(parser):
+    root = parser.parse(ELIF_TEMPLATE % "a / 2 == b / 2")
+    TypeChecker().typecheck(root)
+    stmt = next(node for node in ast.walk(root) if node.__class__ is ast.DeclIfStmt)
+    assert stmt.elif_cond.resolved_type is BOOLEAN
+    assert stmt.elif_cond.left.resolved_type is INT
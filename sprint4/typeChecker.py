@@ -1,38 +1,110 @@
 #!/usr/bin/env python3
 
-from symbolTable import SymbolTable, ParseError
+from concurrent.futures import ProcessPoolExecutor
+from astJava2Python import structural_hash
+from symbolTable import ClassTable, MethodSignature, SymbolTable, ParseError
+from typeSystem import Type, type_of, array_list_type, hash_map_type, INT, FLOAT, BOOLEAN, VOID
+from visitor import Visitor
 import astJava2Python as ast
 
-class TypeChecker(object):
+class MethodResult(object):
+    """
+    Outcome of checking a method body: the structural hash of the method,
+    the (dependency, fingerprint) pairs of the class members it looked up,
+    the ParseError it raised, if any, and the types it resolved (see
+    method_types) along with the method node they were last stored on
+    """
+    __slots__ = ('digest', 'dependencies', 'error', 'types', 'node')
+
+    def __init__(self, digest, dependencies, error, types, node):
+        self.digest = digest
+        self.dependencies = dependencies
+        self.error = error
+        self.types = types
+        self.node = node
+
+
+# Nodes the checker stores a resolved type on
+ANNOTATED_NODES = frozenset(cls for cls in vars(ast).values()
+                            if isinstance(cls, type) and 'resolved_type' in getattr(cls, '__slots__', ()))
+
+# Class level statements that declare a field
+FIELD_NODES = (ast.DeclVarStmt, ast.DeclArrayList, ast.DeclHashMap, ast.DeclFuncCall)
+
+class TypeChecker(Visitor):
+    prefix = 'check_'
+    fallback = 'generic_typecheck'
+
+    def __init__(self, jobs=1, incremental=False):
+        """
+        jobs: number of worker processes method bodies are checked in.
+        Any number gives the same result and the same first error.
+
+        incremental: keep the outcome of every method body check between
+        calls to 'typecheck', and on later calls only check the bodies of
+        the methods that changed or whose dependencies changed. Incremental
+        checkers check every body in this process.
+        """
+        self.jobs = jobs
+        # Maps each method node to the error its body raised in a worker
+        # (None if it checked fine) and the types it resolved there, while a
+        # parallel check is running
+        self.body_results = None
+        # Maps (class name, method name) to the MethodResult of its body
+        self.method_results = dict() if incremental else None
+        # Number of bodies checked and reused by the last 'typecheck'
+        self.checked = 0
+        self.reused = 0
 
     def typecheck(self, node, st=None):
-        method = 'check_' + node.__class__.__name__
-        return getattr(self, method, self.generic_typecheck)(node, st)
+        """
+        Typecheck 'node' and return its type.
+
+        Handlers that need the type of a child are generators: they yield
+        '(child, st)' and receive the child's type back. 'visit' runs them on
+        an explicit stack, so deeply nested input never hits the recursion
+        limit.
+        """
+        return self.visit(node, st)
 
     def generic_typecheck(self, node, st=None):
         if node is None:
             return ''
-        else:
-            return ''.join(self.typecheck(c, st) for c_name, c in node.children())
+        for name in node.child_fields:
+            child = getattr(node, name)
+            if isinstance(child, list):
+                yield from self.typecheck_list(child, st)
+            elif child is not None:
+                yield child, st
+        return ''
+
+    def typecheck_list(self, lst, st):
+        for child in lst:
+            if isinstance(child, list):
+                yield from self.typecheck_list(child, st)
+            elif child is not None:
+                yield child, st
 
 
     def eq_type(self, t1, t2):
         """
-        Helper function to check if two given type node is that of the
-        same type. Precondition is that both t1 and t2 are that of class Type
+        Helper function to check if two given types are the same type.
+        Precondition is that both t1 and t2 are that of class Type, which
+        are interned, so that equal types are the same object
         """
-        if not isinstance(t1, ast.DeclType) or not isinstance(t2, ast.DeclType):
+        if t1.__class__ is not Type or t2.__class__ is not Type:
             raise ParseError("eq_type invoked on non-type objects")
-        return t1.name == t2.name
+        return t1 is t2
 
     def check_AssignStmt(self, node, st):
         var_type = st.lookup_variable(node.name, node.coord)
-        expr_type = self.typecheck(node.expr, st)
+        expr_type = (yield node.expr, st)
         if not self.eq_type(var_type, expr_type):
             raise ParseError("Variable \"" + node.name + "\" has the type",
                              var_type.name, "but is being assigned the type",
                              expr_type.name)
 
+        node.resolved_type = expr_type
         return expr_type
 
 
@@ -45,58 +117,85 @@ class TypeChecker(object):
         example, it only checks if the left and right expressions are of the
         same type, but that won't be sufficient for your project.
         """
-        left_type = self.typecheck(node.left, st)
-        right_type = self.typecheck(node.right, st)
+        left_type = (yield node.left, st)
+        right_type = (yield node.right, st)
         if not self.eq_type(left_type, right_type):
             raise ParseError("Left and right expressions are of different type", node.coord)
 
+        # Arithmetic keeps the type of its operands
         if node.op in ['+', '-', '*', '/']:
-            return ast.DeclType("int")
-
-        return ast.DeclType("boolean")
+            node.resolved_type = left_type
+        else:
+            node.resolved_type = BOOLEAN
+        return node.resolved_type
+
+    def check_LogicOp(self, node, st):
+        left_type = (yield node.left, st)
+        right_type = (yield node.right, st)
+        if not self.eq_type(BOOLEAN, left_type) or not self.eq_type(BOOLEAN, right_type):
+            raise ParseError("Logical operator \"" + node.op + "\" requires boolean operands", node.coord)
+
+        node.resolved_type = BOOLEAN
+        return BOOLEAN
+
+    def check_UnaryOp(self, node, st):
+        expr_type = (yield node.expr, st)
+        if node.op == '!':
+            if not self.eq_type(BOOLEAN, expr_type):
+                raise ParseError("Operator \"!\" requires a boolean operand", node.coord)
+        elif not self.eq_type(INT, expr_type) and not self.eq_type(FLOAT, expr_type):
+            raise ParseError("Operator \"" + node.op + "\" requires a numeric operand", node.coord)
+
+        node.resolved_type = expr_type
+        return expr_type
 
     def check_Constant(self, node, st):
         """
         Returns the type of the constant. If the constant refers to
         some kind of id, then we need to find if the id has been declared.
         """
-        if self.eq_type(node.type, ast.DeclType('id')):
-            return st.lookup_variable(node.value, node.coord)
-        return node.type
+        if node.type.name == 'id':
+            node.resolved_type = st.lookup_variable(node.value, node.coord)
+        else:
+            node.resolved_type = type_of(node.type)
+        return node.resolved_type
 
     def check_DeclVarStmt(self, node, st):
-        st.declare_variable(node.name, node.var_type, node.coord)
+        var_type = type_of(node.var_type)
+        st.declare_variable(node.name, var_type, node.coord)
         if node.expr is not None:
-            expr_type = self.typecheck(node.expr, st)
-            if not self.eq_type(expr_type, node.var_type):
+            expr_type = (yield node.expr, st)
+            if not self.eq_type(expr_type, var_type):
                 raise ParseError("Mismatch of declaration type", node.coord)
 
-        return node.var_type
+        node.resolved_type = var_type
+        return var_type
 
     def check_DeclArrayList(self,node,st):
         if node.var_type.name!=node.create_type.name:
             raise ParseError("Mismatch of declaration type", node.coord)
         else:
-            st.declare_array_variable(node.name, node.type,node.var_type,node.coord)
-            return [node.type,node.var_type]
+            st.declare_array_variable(node.name, node.type, type_of(node.var_type), node.coord)
+            node.resolved_type = array_list_type(type_of(node.var_type))
+            return node.resolved_type
 
 
     def check_Formal(self, node, st):
-        st.declare_variable(node.name, node.type, node.coord)
-        return node.type
+        st.declare_variable(node.name, type_of(node.type), node.coord)
+        return type_of(node.type)
 
     def check_FuncCall(self, node, st):
         method = st.lookup_method(node.name ,node.coord)
 
-        if len(method.params or []) != len(node.args or []):
+        if len(method.param_types) != len(node.args or []):
             raise ParseError("Argument length mismatch with method", node.coord)
 
         for i, arg in enumerate(node.args or []):
-            arg_type = self.typecheck(arg)
-            if not self.eq_type(arg_type, method.params[i].type):
+            arg_type = (yield arg, None)
+            if not self.eq_type(arg_type, method.param_types[i]):
                 raise ParseError("Argument type mismatch with method parameter", node.coord)
 
-        return method.ret_type
+        return method.return_type
 
 
     def check_DeclIfStmt(self, node, st):
@@ -108,21 +207,25 @@ class TypeChecker(object):
         Python, all accepts ints/floats for conditions as well. That is
         something you should consider for your project.
         """
-        cond_type = self.typecheck(node.if_cond, st)
-        if not self.eq_type(ast.DeclType('boolean'), cond_type):
+        cond_type = (yield node.if_cond, st)
+        if not self.eq_type(BOOLEAN, cond_type):
             raise ParseError("If statement requires boolean as its condition", node.coord)
+        if node.elif_cond is not None:
+            cond_type = (yield node.elif_cond, st)
+            if not self.eq_type(BOOLEAN, cond_type):
+                raise ParseError("If statement requires boolean as its condition", node.coord)
 
         if node.if_body is not None:
             st.push_scope()
-            self.typecheck(node.if_body, st)
+            yield node.if_body, st
             st.pop_scope()
         if node.elif_body is not None:
             st.push_scope()
-            self.typecheck(node.elif_body, st)
+            yield node.elif_body, st
             st.pop_scope()
         if node.else_body is not None:
             st.push_scope()
-            self.typecheck(node.else_body, st)
+            yield node.else_body, st
             st.pop_scope()
 
         return None
@@ -138,15 +241,15 @@ class TypeChecker(object):
         something you should consider for your project.
         """
         #check condition
-        self.typecheck(node.var_assign, st)
-        cond_type = self.typecheck(node.cond, st)
-        if not self.eq_type(ast.DeclType('boolean'), cond_type):
+        yield node.var_assign, st
+        cond_type = (yield node.cond, st)
+        if not self.eq_type(BOOLEAN, cond_type):
             raise ParseError("If statement requires boolean as its condition", node.coord)
         if node.cond_update is not None:
-            self.typecheck(node.cond_update, st)
+            yield node.cond_update, st
         if node.body is not None:
             st.push_scope()
-            self.typecheck(node.body, st)
+            yield node.body, st
             st.pop_scope()
         return None
 
@@ -160,52 +263,53 @@ class TypeChecker(object):
         something you should consider for your project.
         """
         #check condition
-        cond_type = self.typecheck(node.cond, st)
-        if not self.eq_type(ast.DeclType('boolean'), cond_type):
+        cond_type = (yield node.cond, st)
+        if not self.eq_type(BOOLEAN, cond_type):
             raise ParseError("If statement requires boolean as its condition", node.coord)
 
         if node.body is not None:
             st.push_scope()
-            self.typecheck(node.body, st)
+            yield node.body, st
             st.pop_scope()
         return None
 
     
     def check_CompareOp(self, node, st):
-        left_type = self.typecheck(node.left, st)
-        right_type = self.typecheck(node.right, st)
+        left_type = (yield node.left, st)
+        right_type = (yield node.right, st)
         if not self.eq_type(left_type, right_type):
             raise ParseError("Left and right expressions are of different type", node.coord)
 
-        if node.op in ['+', '-', '*', '/']:
-            return ast.DeclType("int")
-
-        return ast.DeclType("boolean")
+        node.resolved_type = BOOLEAN
+        return BOOLEAN
 
     def check_DeclMethodStmt(self, node, st):
+        # Parameters get a scope of their own, which the body may shadow
+        st.push_scope()
+
         # Go through the parameters
         for param in node.params:
-            self.typecheck(param, st)
+            yield param, st
 
         st.push_scope()
 
         # Go through the method body and type check each statements
         if node.body is not None:
-            self.typecheck(node.body, st)
+            yield node.body, st
 
         # Check if the type of the return statement matches the return type
         # of the method
         if node.ret_stmt.expr is not None:
-            ret_stmt_type = self.typecheck(node.ret_stmt, st)
-            if not self.eq_type(ret_stmt_type, node.method_type):
+            ret_stmt_type = (yield node.ret_stmt, st)
+            if not self.eq_type(ret_stmt_type, type_of(node.method_type)):
                 raise ParseError("Mismatch of return type within method \"" +
                                 node.name + "\"", node.coord)
         else:
-            ret_stmt_type = ast.DeclType("void", "void")
+            ret_stmt_type = VOID
 
         st.pop_scope()
+        st.pop_scope()
 
-        st.declare_method(node.name, node, node.coord)
         return ret_stmt_type
 
     def check_ParamList(self, node, st):
@@ -216,7 +320,7 @@ class TypeChecker(object):
         # "Formal" class, instead of declaring them as a variable here.
         if node.params is not None:
             for param in node.params:
-                st.declare_variable(param.name, param.type, param.coord)
+                st.declare_variable(param.name, type_of(param.type), param.coord)
         return None
     
     def check_FuncCallParamList(self, node, st):
@@ -224,36 +328,167 @@ class TypeChecker(object):
 
     def check_Program(self, node, st=None):
         """
-        Generate global symbol table. Recursively typecheck its classes and
-        add its class symbol table to itself.
+        Generate the class table, with a symbol table per class, in two
+        phases. First every class is declared, so that 'extends' may name a
+        class declared further down, then the fields and method signatures
+        of every class. Only then are the classes recursively typechecked
+        within their own symbol table, so that no method body depends on the
+        order of the declarations.
         """
-        # Generate global symbol table
-        global_st = SymbolTable()
-        for classes in node.class_decl:
-            if isinstance(classes, list):
-                for c in classes:
-                    self.typecheck(c, global_st)
-            else:
-                self.typecheck(classes, global_st)
+        class_table, classes = self.declare_program(node)
+        methods = self.program_methods(class_table, classes)
+        self.checked = self.reused = 0
+        if self.jobs > 1 and len(methods) > 1 and self.method_results is None:
+            self.body_results = check_bodies(node, methods, self.jobs)
+        try:
+            for c in classes:
+                if isinstance(c, ast.DeclClassStmt):
+                    yield c, class_table.classes[c.name]
+                else:
+                    yield c, st
+        finally:
+            self.body_results = None
+
+        return class_table
 
-        return global_st
+    def declare_program(self, node):
+        """
+        Run the declaration phase over the Program 'node'. Returns the class
+        table and the list of the top level declarations.
+        """
+        class_table = ClassTable()
+        classes = []
+        for c in node.class_decl:
+            if isinstance(c, list):
+                classes.extend(c)
+            else:
+                classes.append(c)
+        for c in classes:
+            if isinstance(c, ast.DeclClassStmt):
+                class_table.declare_class(c.name, c.extend.name if c.extend else None, c.coord)
+        for c in classes:
+            if isinstance(c, ast.DeclClassStmt):
+                self.declare_members(c, class_table.classes[c.name])
+        return class_table, classes
+
+    def program_methods(self, class_table, classes):
+        """
+        Return the (method node, class symbol table) pairs of every method,
+        in source order
+        """
+        methods = []
+        for c in classes:
+            if isinstance(c, ast.DeclClassStmt):
+                st = class_table.classes[c.name]
+                for stmt in c.stmt_list or []:
+                    if isinstance(stmt, ast.DeclMethodStmt):
+                        methods.append((stmt, st))
+        return methods
 
     def check_DeclRetStmt(self, node, st):
-        return self.typecheck(node.expr, st)
+        return (yield node.expr, st)
+
+    def declare_members(self, node, st):
+        """
+        Declare the fields and the method signatures of the class 'node' in
+        its symbol table 'st', without looking at any method body
+        """
+        for stmt in node.stmt_list or []:
+            if isinstance(stmt, ast.DeclMethodStmt):
+                param_types = []
+                for param_list in stmt.params:
+                    if isinstance(param_list, ast.ParamList):
+                        for param in param_list.params or []:
+                            param_types.append(type_of(param.type))
+                signature = MethodSignature(stmt.name, tuple(param_types), type_of(stmt.method_type), stmt)
+                st.declare_method(stmt.name, signature, stmt.coord)
+            elif isinstance(stmt, FIELD_NODES):
+                st.declare_variable(stmt.name, self.field_type(stmt), stmt.coord)
+
+    def field_type(self, node):
+        """
+        Return the declared type of the field declaration 'node'
+        """
+        if isinstance(node, ast.DeclArrayList):
+            return array_list_type(type_of(node.var_type))
+        if isinstance(node, ast.DeclHashMap):
+            return hash_map_type(type_of(node.key_type), type_of(node.value_type))
+        return type_of(node.var_type)
 
     def check_DeclClassStmt(self, node, st):
         if node.stmt_list:
             for stmt in node.stmt_list:
-                if isinstance(stmt, list):
-                    for s in stmt:
-                        self.typecheck(s, st)
+                if not isinstance(stmt, ast.DeclMethodStmt):
+                    yield from self.check_member(stmt, st)
+                elif self.body_results is not None and stmt in self.body_results:
+                    # Checked by a worker, report its error and types in
+                    # source order
+                    error, types = self.body_results[stmt]
+                    apply_types(stmt, types)
+                    if error is not None:
+                        raise error
+                elif self.method_results is not None:
+                    yield from self.check_method_incremental(stmt, st)
                 else:
-                    self.typecheck(stmt, st)
+                    yield stmt, st
         if node.extend:
-            self.typecheck(node.extend, st)
+            yield node.extend, st
         
         return None
 
+    def check_member(self, stmt, st):
+        """
+        Check the class level statement 'stmt', other than a method. The
+        variables that statements such as for loops declare at class level
+        stay in the class scope, for the methods after them.
+        """
+        if isinstance(stmt, list):
+            for s in stmt:
+                yield s, st
+        elif isinstance(stmt, FIELD_NODES):
+            # declare_members declared the field already, check its
+            # initializer in a scope of its own
+            st.push_scope()
+            yield stmt, st
+            st.pop_scope()
+        else:
+            yield stmt, st
+
+    def check_method_incremental(self, node, st):
+        """
+        Reuse the outcome of the last check of the method 'node' if neither
+        the method nor anything it looked up in the class table changed
+        since, otherwise check it and record the class members it depends
+        on
+        """
+        class_table = st.class_table
+        key = (st.class_name, node.name)
+        digest = node.source_digest or structural_hash(node)
+        result = self.method_results.get(key)
+        if result is not None and result.digest == digest and \
+                all(class_table.fingerprint(dependency) == fingerprint
+                    for dependency, fingerprint in result.dependencies):
+            self.reused += 1
+            if result.node is not node:
+                apply_types(node, result.types)
+                result.node = node
+        else:
+            self.checked += 1
+            class_table.dependencies = dependencies = set()
+            error = None
+            try:
+                yield node, st
+            except ParseError as e:
+                error = e
+            finally:
+                class_table.dependencies = None
+            result = MethodResult(digest, [(dependency, class_table.fingerprint(dependency))
+                                           for dependency in dependencies], error,
+                                  method_types(node), node)
+            self.method_results[key] = result
+        if result.error is not None:
+            raise result.error
+
     def check_StmtList(self, node, st):
         """
         Iterate through all the statements and perform typecheck on them.
@@ -261,15 +496,15 @@ class TypeChecker(object):
         for stmt in node.stmt_lst:
             if isinstance(stmt, list):
                 for s in stmt:
-                    self.typecheck(s, st)
+                    yield s, st
             else:
-                self.typecheck(stmt, st)
+                yield stmt, st
 
         # List itself does not have any type
         return None
 
     def check_DeclType(self, node, st):
-        return node
+        return type_of(node)
 
     def check_DeclAccessType(self, node, st):
         return node
@@ -278,58 +513,85 @@ class TypeChecker(object):
         return node
 
     def check_DeclFuncCall(self, node, st):
-        method = st.lookup_method(node.func_name, node.coord)
-        if len(method.params[0].params or []) != len(node.func_param.func_params or []):
+        """
+        Either 'Type name = method(...)', calling a method of the current
+        class, or 'Class name = new Class(...)', calling the constructor of
+        the class if it declares one
+        """
+        if node.access_type is None:
+            method = st.class_table.lookup_constructor(node.func_name, node.coord)
+            if method is None:
+                if node.func_param.func_params:
+                    raise ParseError("Argument length mismatch with method", node.coord)
+            else:
+                yield from self.check_call(node, method, st)
+            result_type = type_of(node.var_type)
+            if result_type.name != node.func_name:
+                raise ParseError("Mismatch of declaration type", node.coord)
+        else:
+            method = st.lookup_method(node.func_name, node.coord)
+            yield from self.check_call(node, method, st)
+            result_type = method.return_type
+        st.declare_variable(node.name, type_of(node.var_type), node.coord)
+        node.resolved_type = result_type
+        return result_type
+
+    def check_call(self, node, method, st):
+        """
+        Check the arguments of the call 'node' against the parameters of
+        the MethodSignature 'method'
+        """
+        if len(method.param_types) != len(node.func_param.func_params or []):
             raise ParseError("Argument length mismatch with method", node.coord)
         for i, param in enumerate(node.func_param.func_params or []):
-            param_type = self.typecheck(param)
-            if not self.eq_type(param_type, method.params[0].params[i].type):
+            param_type = (yield param, st)
+            if not self.eq_type(param_type, method.param_types[i]):
                 raise ParseError("Argument type mismatch with method parameter", node.coord)
 
-        return method.method_type
-
     def check_FuncCallParam(self, node, st):
-        return self.typecheck(node.expr, st)
+        return (yield node.expr, st)
     
     def check_DeclTryStmt(self, node, st):
         if node.try_stmt_list:
             for stmt in node.try_stmt_list.stmt_lst:
-                self.typecheck(stmt, st)
+                yield stmt, st
         if node.catch_stmt_list:
             for stmt in node.catch_stmt_list.stmt_lst:
-                self.typecheck(stmt, st)
+                yield stmt, st
         if node.finally_stmt_list:
             for stmt in node.finally_stmt_list.stmt_lst:
-                self.typecheck(stmt, st)
+                yield stmt, st
         return node
     
     def check_Comments(self, node, st):
         return node
     
     def check_DeclPrintStmt(self, node, st):
-        return self.typecheck(node.expr, st)
+        return (yield node.expr, st)
 
     
     def check_Word(self, node, st):
         return node
 
     def check_DeclObjCall(self, node, st):
-        method = st.lookup_method(node.obj_func, node.coord)
-        if len(method.params[0].params or []) != len(node.func_param.func_params or []):
-            raise ParseError("Argument length mismatch with method", node.coord)
-        for i, param in enumerate(node.func_param.func_params or []):
-            param_type = self.typecheck(param)
-            if not self.eq_type(param_type, method.params[0].params[i].type):
-                raise ParseError("Argument type mismatch with method parameter", node.coord)
+        """
+        'obj.method(...)' calls the method resolved from the class of 'obj'
+        """
+        var_type = st.lookup_variable(node.obj_name, node.coord)
+        if var_type.args or not st.class_table.is_class(var_type.name):
+            raise ParseError("Variable \"" + node.obj_name + "\" is not an object", node.coord)
+        method = st.class_table.lookup_method(var_type.name, node.obj_func, node.coord)
+        yield from self.check_call(node, method, st)
 
-        return method.method_type
+        node.resolved_type = method.return_type
+        return method.return_type
 
     def check_DeclObjAddCall(self, node, st):
         var_type = st.lookup_variable(node.name, node.coord)
-        if len(var_type) !=2:
+        if var_type.name != 'ArrayList':
             raise ParseError("Variable \"" + node.name + "\" is not array")
-        exprtype = var_type[1]
-        expr_type = self.typecheck(node.expr, st)
+        exprtype = var_type.args[0]
+        expr_type = (yield node.expr, st)
         if not self.eq_type(exprtype, expr_type):
             raise ParseError("ARRAY Variable \"" + node.name + "\" has the type",
                              exprtype.name, "but is being assigned the type",
@@ -339,10 +601,10 @@ class TypeChecker(object):
 
     def check_DeclObjRemoveCall(self, node, st):
         var_type = st.lookup_variable(node.name, node.coord)
-        if len(var_type) !=3:
+        if var_type.name != 'HashMap':
             raise ParseError("Variable \"" + node.name + "\" is not map")
-        exprtype = var_type[1]
-        expr_type = self.typecheck(node.expr, st)
+        exprtype = var_type.args[0]
+        expr_type = (yield node.expr, st)
         if not self.eq_type(exprtype, expr_type):
             raise ParseError("Map Variable " + node.name + " has the key type",
                              exprtype.name, "but is being assigned the type",
@@ -352,18 +614,17 @@ class TypeChecker(object):
 
     def check_DeclObjClearCall(self, node, st):
         var_type = st.lookup_variable(node.name, node.coord)
-        if len(var_type) !=3:
+        if var_type.name != 'HashMap':
             raise ParseError("Variable \"" + node.name + "\" is not map")
 
         return var_type
     def check_DeclObjPutCall(self, node, st):
         var_type = st.lookup_variable(node.name, node.coord)
-        if len(var_type) !=3:
+        if var_type.name != 'HashMap':
             raise ParseError("Variable \"" + node.name + "\" is not MAP")
-        exprtype = var_type[1]
-        exprtype2 = var_type[2]
-        expr_type = self.typecheck(node.expr1, st)
-        expr_type2 = self.typecheck(node.expr2, st)
+        exprtype, exprtype2 = var_type.args
+        expr_type = (yield node.expr1, st)
+        expr_type2 = (yield node.expr2, st)
         if not self.eq_type(exprtype, expr_type) :
             raise ParseError("ARRAY Variable \"" + node.name + "\" has the key type",
                              exprtype.name, "but is being added by the value of type",
@@ -373,11 +634,149 @@ class TypeChecker(object):
                              exprtype2.name, "but is being added by the value of type",
                              expr_type2.name)
 
-        return [expr_type,expr_type2]
+        return var_type
     def check_DeclHashMap(self,node,st):
         if node.type!=node.create_type or node.key_type.name!=node.create_keytype.name or node.value_type.name!=node.create_valuetype.name :
             raise ParseError("Mismatch of declaration type", node.coord)
         else:
-            st.declare_hashmap_variable(node.name, node.type,node.key_type,node.value_type,node.coord)
-            return [node.type, node.key_type, node.value_type]
-
+            key_type = type_of(node.key_type)
+            value_type = type_of(node.value_type)
+            st.declare_hashmap_variable(node.name, node.type, key_type, value_type, node.coord)
+            node.resolved_type = hash_map_type(key_type, value_type)
+            return node.resolved_type
+
+
+
+################################
+## Parallel body checking
+################################
+
+# Tree of a worker process, from init_body_worker, and the checker, walk
+# and position of the method the worker is at (see check_body_range)
+_worker_root = None
+_worker_checker = None
+_worker_walk = None
+_worker_position = 0
+
+
+def init_body_worker(root):
+    """
+    Keep the tree 'root' in a worker process. Every worker has its own copy
+    of the class scopes, which it builds up as the serial walk does.
+    """
+    global _worker_root, _worker_walk
+    _worker_root = root
+    _worker_walk = None
+
+
+def member_walk(checker, root):
+    """
+    Run the declaration phase over 'root', then check the class level
+    statements in source order as check_Program does, yielding the (method
+    node, class symbol table) pair of each method when its turn comes
+    instead of checking its body. The class scopes then hold what the
+    statements before the method bound in them.
+    """
+    class_table, classes = checker.declare_program(root)
+    for c in classes:
+        if isinstance(c, ast.DeclClassStmt):
+            st = class_table.classes[c.name]
+            for stmt in c.stmt_list or []:
+                if isinstance(stmt, ast.DeclMethodStmt):
+                    yield stmt, st
+                else:
+                    checker.run(checker.check_member(stmt, st))
+
+
+def check_body_range(start, stop):
+    """
+    Check the bodies of methods 'start' to 'stop' (excluded) in the current
+    worker. Returns the (error or None, method_types) pair of each of them.
+
+    The worker walks the class level statements up to each method. Chunks
+    come in source order, so the walk goes on from the last chunk, unless
+    it is already past 'start'. If a class level statement raises, the
+    serial walk raises first, and the methods after it get that error.
+    """
+    global _worker_checker, _worker_walk, _worker_position
+    if _worker_walk is None or _worker_position > start:
+        _worker_checker = TypeChecker()
+        _worker_walk = member_walk(_worker_checker, _worker_root)
+        _worker_position = 0
+    results = []
+    while _worker_position < stop:
+        try:
+            method, st = next(_worker_walk)
+        except Exception as e:
+            _worker_walk = None
+            results.extend((e, []) for _ in range(max(start, _worker_position), stop))
+            return results
+        if _worker_position >= start:
+            error = None
+            depth = len(st.scope_marks)
+            try:
+                _worker_checker.typecheck(method, st)
+            except Exception as e:
+                error = e
+                # Leave the class scopes as the method found them
+                while len(st.scope_marks) > depth:
+                    st.pop_scope()
+            results.append((error, method_types(method)))
+        _worker_position += 1
+    return results
+
+
+def check_bodies(root, methods, jobs):
+    """
+    Check the bodies of 'methods', those of 'root' listed in source order,
+    in a pool of 'jobs' worker processes. Returns a dictionary mapping each
+    method node to its error, or None, and the types it resolved (see
+    method_types), which check_DeclClassStmt stores on the nodes of 'root'
+    when it gets to the method, as the serial check would.
+    """
+    chunk = max(1, len(methods) // (jobs * 4))
+    starts = range(0, len(methods), chunk)
+    stops = [min(start + chunk, len(methods)) for start in starts]
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_body_worker, initargs=(root,)) as executor:
+        for chunk_results in executor.map(check_body_range, starts, stops):
+            results.extend(chunk_results)
+    return {method: result for (method, st), result in zip(methods, results)}
+
+
+def annotated_nodes(method):
+    """
+    Return the nodes under 'method' that have a 'resolved_type', in preorder
+    """
+    nodes = []
+    stack = [method]
+    while stack:
+        item = stack.pop()
+        cls = item.__class__
+        if cls is list:
+            stack.extend(reversed(item))
+            continue
+        if item is None:
+            continue
+        if cls in ANNOTATED_NODES:
+            nodes.append(item)
+        for name in reversed(cls.child_fields):
+            stack.append(getattr(item, name))
+    return nodes
+
+
+def method_types(method):
+    """
+    Return the resolved types of the nodes under 'method' that have one, in
+    preorder
+    """
+    return [node.resolved_type for node in annotated_nodes(method)]
+
+
+def apply_types(method, types):
+    """
+    Store 'types', as returned by method_types for the same method, on the
+    nodes under 'method'
+    """
+    for node, resolved_type in zip(annotated_nodes(method), types):
+        node.resolved_type = resolved_type
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+class Type(object):
+    """
+    A miniJava type: a named type such as 'int' or 'Employee', or a
+    parameterized type such as 'ArrayList<int>' or 'HashMap<String, int>',
+    whose type arguments are Types themselves.
+
+    Types are interned: there is exactly one Type object for each distinct
+    type, so that types are equal exactly when they are the same object.
+    Never call Type directly; use get_type, array_list_type, hash_map_type
+    or parameterized_type.
+    """
+    __slots__ = ('name', 'args')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __reduce__(self):
+        # Unpickling goes through the table, so that loaded types stay
+        # canonical
+        return (parameterized_type, (self.name, self.args))
+
+    def __str__(self):
+        if not self.args:
+            return self.name
+        return "{}<{}>".format(self.name, ", ".join(str(arg) for arg in self.args))
+
+    def __repr__(self):
+        return "Type({})".format(self)
+
+
+# Canonical types, keyed by name for named types and by (name, args) for
+# parameterized types
+_types = {}
+
+
+def get_type(name):
+    """
+    Return the named type 'name'
+    """
+    t = _types.get(name)
+    if t is None:
+        t = _types[name] = Type(name, ())
+    return t
+
+
+def parameterized_type(name, args):
+    """
+    Return the type 'name' applied to the tuple of Types 'args'
+    """
+    if not args:
+        return get_type(name)
+    key = (name, args)
+    t = _types.get(key)
+    if t is None:
+        t = _types[key] = Type(name, args)
+    return t
+
+
+def array_list_type(element_type):
+    return parameterized_type('ArrayList', (element_type,))
+
+
+def hash_map_type(key_type, value_type):
+    return parameterized_type('HashMap', (key_type, value_type))
+
+
+def type_of(decl_type):
+    """
+    Return the type named by the DeclType node 'decl_type'
+    """
+    return get_type(decl_type.name)
+
+
+INT = get_type('int')
+FLOAT = get_type('float')
+BOOLEAN = get_type('boolean')
+STRING = get_type('String')
+VOID = get_type('void')
+NULL = get_type('null')
+
+# Value of a variable declared without an initializer
+DEFAULT_VALUES = {INT: 0, FLOAT: 0.0, BOOLEAN: False}
+
+
+def default_value(t):
+    """
+    Return the Python value a variable of type 't' starts with, None for
+    strings and objects
+    """
+    return DEFAULT_VALUES.get(t)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+from types import GeneratorType
+
+class DispatchTable(dict):
+    """
+    Maps node classes to the handler functions of a visitor class. Handlers
+    are resolved by name the first time a node class is seen.
+    """
+
+    def __init__(self, visitor_class):
+        super().__init__()
+        self.visitor_class = visitor_class
+
+    def __missing__(self, node_class):
+        handler = self.visitor_class.resolve(node_class)
+        self[node_class] = handler
+        return handler
+
+
+class Visitor(object):
+    """
+    Base class of the tree visitors (TypeChecker, IRGen and PYGen).
+
+    The handler of a node is the method named 'prefix' followed by the name
+    of the node class (for example 'check_BinOp'), or the method named
+    'fallback' if there is none. Instead of building that name and looking
+    it up on every visit, handlers are looked up once per node class and
+    kept in the type-keyed 'dispatch_table' of the visitor class:
+
+        return self.dispatch_table[node.__class__](self, node, ...)
+
+    Handlers for new node types can be added with 'register'.
+
+    Handlers never call back into the visitor to visit a child. A handler
+    that needs the result of a child is a generator that yields the
+    arguments of the child visit, '(child, ...)', and is sent the result:
+
+        def check_BinOp(self, node, st):
+            left_type = yield node.left, st
+            right_type = yield node.right, st
+            ...
+            return result_type
+
+    'visit' runs such handlers on an explicit stack of suspended
+    generators, so the depth of the tree is bounded by memory rather than by
+    the Python recursion limit.
+    """
+    prefix = ''
+    fallback = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.dispatch_table = DispatchTable(cls)
+        cls.registered = {}
+
+    def visit(self, node, *args):
+        """
+        Visit 'node' and return the result of its handler
+        """
+        result = self.dispatch_table[node.__class__](self, node, *args)
+        if result.__class__ is GeneratorType:
+            result = self.run(result)
+        return result
+
+    def run(self, gen):
+        """
+        Drive the generator handler 'gen' and every child visit it requests,
+        and return its result. An exception raised by a child visit is
+        raised inside the handler that requested it, as if the visit had
+        been a plain call.
+        """
+        table = self.dispatch_table
+        stack = []
+        value = None
+        error = None
+        while True:
+            try:
+                if error is None:
+                    request = gen.send(value)
+                else:
+                    request = gen.throw(error)
+                    error = None
+            except StopIteration as stop:
+                if not stack:
+                    return stop.value
+                value = stop.value
+                error = None
+                gen = stack.pop()
+                continue
+            except Exception as e:
+                if not stack:
+                    raise
+                error = e
+                gen = stack.pop()
+                continue
+            try:
+                value = table[request[0].__class__](self, *request)
+            except Exception as e:
+                error = e
+                continue
+            if value.__class__ is GeneratorType:
+                stack.append(gen)
+                gen = value
+                value = None
+
+    @classmethod
+    def resolve(cls, node_class):
+        """
+        Return the handler function of 'node_class'
+        """
+        for klass in cls.__mro__:
+            registered = klass.__dict__.get('registered')
+            if registered and node_class in registered:
+                return registered[node_class]
+        handler = getattr(cls, cls.prefix + node_class.__name__, None)
+        if handler is None:
+            if cls.fallback is None:
+                raise AttributeError("'%s' object has no attribute '%s'"
+                                     % (cls.__name__, cls.prefix + node_class.__name__))
+            handler = getattr(cls, cls.fallback)
+        return handler
+
+    @classmethod
+    def register(cls, node_class, handler):
+        """
+        Use 'handler(visitor, node, ...)' to visit nodes of 'node_class'
+        """
+        cls.registered[node_class] = handler
+        # Forget what this class and its subclasses resolved so far
+        stack = [cls]
+        while stack:
+            klass = stack.pop()
+            klass.dispatch_table.clear()
+            stack.extend(klass.__subclasses__())